@@ -0,0 +1,22 @@
+from functools import cache
+from typing import Optional
+
+from fastapi import Header
+
+from ....core.config.settings import settings
+from ....core.security.auth import check_admin_token
+from ....services.profiling_service import ProfilingService
+
+
+# Check the admin token of the admin endpoints
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    check_admin_token(x_admin_token, settings.ADMIN_TOKEN)
+
+# Instantiate the Profiling Service shared by the admin endpoints and the profiled requests, and return it as a dependency function
+@cache
+def get_profiling_service() -> ProfilingService:
+    return ProfilingService(
+        interval=settings.PROFILER_INTERVAL_MS / 1000,
+        max_seconds=settings.PROFILER_MAX_SECONDS,
+        max_stored_profiles=settings.PROFILER_STORED_PROFILES,
+    )
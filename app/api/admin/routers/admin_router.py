@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from ....core.config.setup import setup
+from ....core.exceptions.custom_http_exception import CustomHTTPException
+from ....docs.logic.docs_response import create_docs_response
+from ....docs.logic.error_response_example import \
+    generate_error_response_example
+from ..dependencies.get_profiling_service_factory import verify_admin_token
+from ..routes.get_request_profile import get_request_profile
+from ..routes.profile_worker import profile_worker
+
+admin_router = APIRouter(tags=["Admin"], dependencies=[Depends(verify_admin_token)])
+
+
+# Profiles are exempt from the rate limits, as they are requested by operators and may wait for analyses
+admin_router.add_api_route(
+    "/profile",
+    setup.limiter.exempt(profile_worker),
+    methods=["POST"],
+    response_class=PlainTextResponse,
+    responses={
+        403: create_docs_response("Forbidden", generate_error_response_example(CustomHTTPException(403, "Invalid admin token.", title="Forbidden"))),
+        409: create_docs_response("Conflict", generate_error_response_example(CustomHTTPException(409, "A profile of this worker is already running.", title="HTTP Error 409", error_type="http_error")))
+    }
+)
+
+admin_router.add_api_route(
+    "/profile/{profile_id}",
+    setup.limiter.exempt(get_request_profile),
+    methods=["GET"],
+    response_class=PlainTextResponse,
+    responses={
+        403: create_docs_response("Forbidden", generate_error_response_example(CustomHTTPException(403, "Invalid admin token.", title="Forbidden"))),
+        404: create_docs_response("Not Found", generate_error_response_example(CustomHTTPException(404, "No profile 4cf83ba5-e0fc-48b1-aa72-3d375241cbb0 is stored on this worker.", title="HTTP Error 404", error_type="http_error")))
+    }
+)
@@ -0,0 +1,34 @@
+from fastapi import Depends
+from fastapi.responses import PlainTextResponse
+
+from ....services.profiling_service import ProfilingService
+from ..dependencies.get_profiling_service_factory import get_profiling_service
+
+
+async def get_request_profile(profile_id: str, service: ProfilingService = Depends(get_profiling_service)) -> PlainTextResponse:
+
+    """
+
+    Downloads the profile of a request sent with the `X-Profile` header.
+
+
+    Parameters
+    ----------
+    profile_id : str
+        The ID returned in the `X-Profile-Id` header of the profiled request.
+
+    service : ProfilingService
+        The profiling service.
+
+
+    Returns
+    -------
+    response : PlainTextResponse
+        The collapsed stacks, as an attachment named after the profile.
+
+    """
+
+    collapsed_stacks = service.get_profile(profile_id)
+
+
+    return PlainTextResponse(collapsed_stacks, headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'})
@@ -0,0 +1,48 @@
+import os
+from typing import Optional
+
+from fastapi import Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from ....services.profiling_service import ProfilingService
+from ..dependencies.get_profiling_service_factory import get_profiling_service
+
+
+async def profile_worker(
+    seconds: Optional[float] = Query(None, gt=0, description="How long to profile."),
+    analyses: Optional[int] = Query(None, ge=1, description="Number of analyses after which the profile stops."),
+    service: ProfilingService = Depends(get_profiling_service),
+) -> PlainTextResponse:
+
+    """
+
+    Profiles the worker serving the request with a sampling profiler.
+
+    Every thread of the worker is sampled until `seconds` elapsed or `analyses` analyses completed,
+    whichever comes first. The response is a file of collapsed stacks, which `flamegraph.pl` or
+    speedscope turn into a flame graph.
+
+
+    Parameters
+    ----------
+    seconds : float, optional
+        How long to profile.
+
+    analyses : int, optional
+        Number of analyses after which the profile stops.
+
+    service : ProfilingService
+        The profiling service.
+
+
+    Returns
+    -------
+    response : PlainTextResponse
+        The collapsed stacks, as an attachment named after the worker.
+
+    """
+
+    collapsed_stacks = await service.profile_worker(seconds=seconds, analyses=analyses)
+
+
+    return PlainTextResponse(collapsed_stacks, headers={"Content-Disposition": f'attachment; filename="profile-{os.getpid()}.folded"'})
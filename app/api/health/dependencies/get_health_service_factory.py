@@ -0,0 +1,19 @@
+from functools import cache
+
+from ....core.config.settings import settings
+from ....core.config.setup import setup
+from ....services.health_service import HealthService
+
+
+# Instantiate the Health Service over the shared health metrics and return it as a dependency function
+## Redis is pinged through the storage of the rate limits, the only component that uses it
+@cache
+def get_health_service() -> HealthService:
+    return HealthService(
+        event_loop_monitor=setup.event_loop_monitor,
+        llm_calls_in_flight=setup.llm_calls_in_flight,
+        check_redis=setup.rate_limit_storage.check if settings.USE_REDIS else None,
+        max_event_loop_lag_ms=settings.READINESS_MAX_EVENT_LOOP_LAG_MS,
+        max_executor_queue_depth=settings.READINESS_MAX_EXECUTOR_QUEUE_DEPTH,
+        max_in_flight_llm_calls=settings.READINESS_MAX_IN_FLIGHT_LLM_CALLS,
+    )
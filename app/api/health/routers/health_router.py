@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+
+from ....core.config.setup import setup
+from ....docs.logic.docs_response import create_docs_response
+from ....schemas.health_report import HealthReport
+from ..routes.check_liveness import check_liveness
+from ..routes.check_readiness import check_readiness
+
+health_router = APIRouter(tags=["Health"])
+
+
+# Probes are exempt from the rate limits, as a throttled probe would take a healthy worker out of rotation
+health_router.add_api_route(
+    "/live",
+    setup.limiter.exempt(check_liveness),
+    response_model=HealthReport,
+    methods=["GET"],
+    responses={
+        503: create_docs_response("Not Alive", {"healthy": False, "checks": {"event_loop_lag_ms": {"healthy": False, "value": 0.0, "threshold": None, "detail": "The event loop monitor is not running."}}})
+    }
+)
+
+health_router.add_api_route(
+    "/ready",
+    setup.limiter.exempt(check_readiness),
+    response_model=HealthReport,
+    methods=["GET"],
+    responses={
+        503: create_docs_response("Not Ready", {"healthy": False, "checks": {"event_loop_lag_ms": {"healthy": False, "value": 812.4, "threshold": 500.0, "detail": "Highest lag within the last 5 seconds."}}})
+    }
+)
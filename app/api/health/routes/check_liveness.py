@@ -0,0 +1,34 @@
+from fastapi import Depends, status
+
+from ....services.health_service import HealthService
+from ....utils.pydantic_json_response import PydanticJSONResponse
+from ..dependencies.get_health_service_factory import get_health_service
+
+
+async def check_liveness(service: HealthService = Depends(get_health_service)) -> PydanticJSONResponse:
+
+    """
+
+    Liveness probe: whether the worker's event loop still runs.
+
+    It answers as long as the event loop is measured, even under load, so that an overloaded
+    worker is taken out of rotation by the readiness probe rather than restarted.
+
+
+    Parameters
+    ----------
+    service : HealthService
+        The health service.
+
+
+    Returns
+    -------
+    response : PydanticJSONResponse
+        The liveness report, with status `200` if alive and `503` otherwise.
+
+    """
+
+    report = service.check_liveness()
+
+
+    return PydanticJSONResponse(report, status_code=status.HTTP_200_OK if report.healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
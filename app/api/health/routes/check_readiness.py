@@ -0,0 +1,34 @@
+from fastapi import Depends, status
+
+from ....services.health_service import HealthService
+from ....utils.pydantic_json_response import PydanticJSONResponse
+from ..dependencies.get_health_service_factory import get_health_service
+
+
+async def check_readiness(service: HealthService = Depends(get_health_service)) -> PydanticJSONResponse:
+
+    """
+
+    Readiness probe: whether the worker should receive more traffic.
+
+    Reports the event-loop lag, the depth of the thread pool queue, the in-flight LLM calls, and
+    the reachability of Redis (if used), each with its threshold.
+
+
+    Parameters
+    ----------
+    service : HealthService
+        The health service.
+
+
+    Returns
+    -------
+    response : PydanticJSONResponse
+        The readiness report, with status `200` if ready and `503` otherwise.
+
+    """
+
+    report = await service.check_readiness()
+
+
+    return PydanticJSONResponse(report, status_code=status.HTTP_200_OK if report.healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,7 @@
+from ....core.config.setup import setup
+from ....core.metrics.metrics_exporter import MetricsExporter
+
+
+# Return the shared Metrics Exporter as a dependency function
+def get_metrics_exporter() -> MetricsExporter:
+    return setup.metrics_exporter
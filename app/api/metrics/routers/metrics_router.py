@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ....core.config.setup import setup
+from ..routes.get_metrics import get_metrics
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+# Scrapes are exempt from the rate limits, as a throttled scrape would leave gaps in the series
+metrics_router.add_api_route(
+    "/metrics",
+    setup.limiter.exempt(get_metrics),
+    methods=["GET"],
+    response_class=PlainTextResponse
+)
@@ -0,0 +1,33 @@
+from fastapi import Depends, Response
+
+from ....core.metrics.metrics_exporter import MetricsExporter
+from ..dependencies.get_metrics_exporter_factory import get_metrics_exporter
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def get_metrics(exporter: MetricsExporter = Depends(get_metrics_exporter)) -> Response:
+
+    """
+
+    Prometheus scrape endpoint.
+
+    Reports the request latency per route, the parse time and size per file extension, the LLM
+    latency and tokens per model, the cache hits and misses, the rate-limit rejections, and the
+    work in flight, of all the workers if `METRICS_MULTIPROCESS_DIR` is set.
+
+
+    Parameters
+    ----------
+    exporter : MetricsExporter
+        The metrics exporter.
+
+
+    Returns
+    -------
+    response : Response
+        The metrics in the Prometheus text exposition format.
+
+    """
+
+    return Response(await exporter.expose(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,8 +1,23 @@
+from typing import Optional
+
 from fastapi import Header
 
-from ....core.security.auth import extract_api_key
+from ....core.config.settings import settings
+from ....core.config.setup import setup
+from ....core.metrics.llm_usage_recorder import LLMUsageRecorder
+from ....core.security.auth import check_admin_token, extract_api_key
 
 
 # Get the API Key needed for analysis
 def get_api_key(authorization: str = Header(...)) -> str:
-    return extract_api_key(authorization)
\ No newline at end of file
+    return extract_api_key(authorization)
+
+# Get the shared LLM Usage Recorder
+def get_llm_usage_recorder() -> LLMUsageRecorder:
+    return setup.llm_usage_recorder
+
+# Whether the request asks to be profiled; only admins may, as profiling slows the request down
+def get_profile_requested(x_profile: bool = Header(False), x_admin_token: Optional[str] = Header(None)) -> bool:
+    if x_profile:
+        check_admin_token(x_admin_token, settings.ADMIN_TOKEN)
+    return x_profile
\ No newline at end of file
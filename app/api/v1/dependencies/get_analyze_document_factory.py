@@ -1,29 +1,164 @@
-from functools import cache
-from typing import Awaitable, Callable, Union
+from functools import cache, partial
+import io
+from typing import Awaitable, Callable, Optional, Union, get_args, get_origin
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
 from insight_extractor_ai_agent.logic.extract_insight import extract_insight
+from insight_extractor_ai_agent.logic.extract_insight_incremental import \
+    extract_insight_incremental
+from insight_extractor_ai_agent.logic.reduce_content import reduce_content
+from insight_extractor_ai_agent.models.stub_model_config import \
+    StubModelConfig
 from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
 
+from ....core.config.settings import settings
+from ....core.config.setup import setup
+from ....core.security.auth import hash_api_key
+from ....schemas.analyze_document_form import AnalyzeDocumentForm
+from ....schemas.routing_preference import RoutingPreference
 from ....services.analysis_service import AnalysisService
+from ....utils.content_index import ContentIndex
 from ....utils.file_parser import FileParser
+from ....utils.location_resolver import resolve_locations
+from ....utils.streamed_upload import StreamedUpload
+from ....utils.streaming_upload_parser import StreamingUploadParser
 
 
-# Define the Extract Insight function as a dependency function
-def get_extract_insight() -> Callable[[str, str, str, str, str], Awaitable[AnalysisReport]]:
-    return extract_insight
+# Build the Stub Model configuration from the settings, or None if the stub model is disabled
+@cache
+def get_stub_model_config() -> Optional[StubModelConfig]:
+    if not settings.ENABLE_STUB_MODEL:
+        return None
+    return StubModelConfig(
+        latency_distribution=settings.STUB_MODEL_LATENCY_DISTRIBUTION,
+        latency_mean_ms=settings.STUB_MODEL_LATENCY_MEAN_MS,
+        latency_stddev_ms=settings.STUB_MODEL_LATENCY_STDDEV_MS,
+        input_tokens=settings.STUB_MODEL_INPUT_TOKENS,
+        output_tokens=settings.STUB_MODEL_OUTPUT_TOKENS,
+        failure_rate=settings.STUB_MODEL_FAILURE_RATE,
+        retry_rate=settings.STUB_MODEL_RETRY_RATE,
+        insights_per_report=settings.STUB_MODEL_INSIGHTS_PER_REPORT,
+        seed=settings.STUB_MODEL_SEED,
+    )
+
+# Define the Extract Insight function, counted as an in-flight LLM call while it runs, as a dependency function
+## With the scheduler, each call first waits for the turn of its API key
+@cache
+def get_extract_insight(
+    stub_model_config: Optional[StubModelConfig] = Depends(get_stub_model_config),
+) -> Callable[[str, str, str, str, str], Awaitable[AnalysisReport]]:
+    extract = setup.llm_calls_in_flight.track(partial(extract_insight, stub_model_config=stub_model_config))
+    if setup.analysis_scheduler is None:
+        return extract
+    return setup.analysis_scheduler.schedule(extract, tenant=lambda kwargs: hash_api_key(kwargs["api_key"]))
+
+# Define the Incremental Extract Insight function, backed by the shared chunk cache, as a dependency function
+@cache
+def get_extract_insight_incremental(
+    extract_insight: Callable[[str, str, str, str, str], Awaitable[AnalysisReport]] = Depends(get_extract_insight),
+) -> Callable[..., Awaitable[AnalysisReport]]:
+    return partial(
+        extract_insight_incremental,
+        chunk_cache=setup.analysis_chunk_cache,
+        min_chunk_chars=settings.INCREMENTAL_MIN_CHUNK_CHARS,
+        avg_chunk_chars=settings.INCREMENTAL_AVG_CHUNK_CHARS,
+        max_chunk_chars=settings.INCREMENTAL_MAX_CHUNK_CHARS,
+        max_concurrency=settings.INCREMENTAL_MAX_CONCURRENCY,
+        extract=extract_insight,
+    )
+
+# Define the Reduce Content function, configured from the settings, as a dependency function
+@cache
+def get_reduce_content() -> Callable[[str, int], str]:
+    return partial(
+        reduce_content,
+        method=settings.CONTENT_REDUCTION_METHOD,
+        max_textrank_sentences=settings.CONTENT_REDUCTION_MAX_TEXTRANK_SENTENCES,
+    )
+
+# Define the Select Model function of the registry as a dependency function, or None if no model is registered
+@cache
+def get_select_model() -> Optional[Callable[[int, RoutingPreference, Optional[str]], str]]:
+    if not setup.model_registry.capabilities:
+        return None
+    return partial(
+        setup.model_registry.select,
+        output_token_reserve=settings.AUTO_MODEL_OUTPUT_TOKEN_RESERVE,
+        min_reliability=settings.AUTO_MODEL_MIN_RELIABILITY,
+    )
 
-# Instantiate the File Parser and return the get_content_from_file as a dependency function
+# Define the Resolve Locations function as a dependency function, or None if location resolution is disabled
 @cache
-def get_retrieve_content_from_file() -> Callable[[Union[str, bytes], str], tuple[str, str]]:
-    return FileParser().get_content_from_file
+def get_resolve_locations() -> Optional[Callable[[AnalysisReport, ContentIndex], AnalysisReport]]:
+    return resolve_locations if settings.RESOLVE_LOCATIONS else None
+
+# Instantiate the File Parser shared by the upload parser and the content retrieval, recording the parse metrics
+@cache
+def get_file_parser() -> FileParser:
+    return FileParser(parse_callback=setup.parse_metrics_recorder.record)
+
+# Return the get_indexed_content_from_file of the File Parser as a dependency function
+@cache
+def get_retrieve_content_from_file(
+    file_parser: FileParser = Depends(get_file_parser),
+) -> Callable[[Union[str, bytes, io.BytesIO], str], tuple[str, str, ContentIndex]]:
+    return file_parser.get_indexed_content_from_file
+
+# Instantiate the Streaming Upload Parser, which checks uploads against the formats of the File Parser, as a dependency function
+@cache
+def get_upload_parser(file_parser: FileParser = Depends(get_file_parser)) -> StreamingUploadParser:
+    return StreamingUploadParser(
+        file_field="file",
+        allowed_extensions=file_parser.parsers.keys(),
+        check_signature=file_parser.check_file_signature,
+        max_file_size=settings.MAX_UPLOAD_SIZE,
+        sniff_size=settings.UPLOAD_SNIFF_SIZE,
+    )
+
+# Parse the multipart body while it streams in; a missing file is reported like any missing form field
+async def get_streamed_upload(
+    request: Request,
+    upload_parser: StreamingUploadParser = Depends(get_upload_parser),
+) -> StreamedUpload:
+    upload = await upload_parser.parse(request)
+    if upload.filename is None:
+        raise RequestValidationError([{"type": "missing", "loc": ("body", upload_parser.file_field), "msg": "Field required", "input": None}])
+    return upload
+
+# Validate the other fields of the upload; repeated fields are kept as lists where the form expects a list
+ANALYZE_DOCUMENT_FORM_LIST_FIELDS = {
+    name for name, field in AnalyzeDocumentForm.model_fields.items()
+    if list in (get_origin(field.annotation), *map(get_origin, get_args(field.annotation)))
+}
+
+def get_analyze_document_form(upload: StreamedUpload = Depends(get_streamed_upload)) -> AnalyzeDocumentForm:
+    try:
+        return AnalyzeDocumentForm.model_validate({
+            name: values if name in ANALYZE_DOCUMENT_FORM_LIST_FIELDS else values[-1]
+            for name, values in upload.fields.items()
+        })
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)])
 
 
 # Instantiate the Analysis Service and return the get_analysis_service as a dependency function
 @cache
 def get_analysis_service(
     extract_insight: Callable[[str, str, str, str, str], Awaitable[AnalysisReport]] = Depends(get_extract_insight),
-    retrieve_content_from_file: Callable[[Union[str, bytes], str], tuple[str, str]] = Depends(get_retrieve_content_from_file),
+    retrieve_content_from_file: Callable[[Union[str, bytes, io.BytesIO], str], tuple[str, str, ContentIndex]] = Depends(get_retrieve_content_from_file),
+    extract_insight_incremental: Callable[..., Awaitable[AnalysisReport]] = Depends(get_extract_insight_incremental),
+    reduce_content: Callable[[str, int], str] = Depends(get_reduce_content),
+    resolve_locations: Optional[Callable[[AnalysisReport, ContentIndex], AnalysisReport]] = Depends(get_resolve_locations),
+    select_model: Optional[Callable[[int, RoutingPreference, Optional[str]], str]] = Depends(get_select_model),
 ) -> AnalysisService:
-    return AnalysisService(extract_insight=extract_insight, retrieve_content_from_file=retrieve_content_from_file)
\ No newline at end of file
+    return AnalysisService(
+        extract_insight=extract_insight, 
+        retrieve_content_from_file=retrieve_content_from_file,
+        extract_insight_incremental=extract_insight_incremental,
+        reduce_content=reduce_content,
+        resolve_locations=resolve_locations,
+        select_model=select_model,
+    )
@@ -1,8 +1,8 @@
-from typing import Callable
+from fastapi import Request
 
-from ....utils.available_models_list import fetch_model_list
+from ....utils.precomputed_json import PrecomputedJSON
 
 
-# Define the Fetch Model List function as a dependency function
-def get_fetch_model_list() -> Callable[[], dict[str, list[dict[str, str]]]]:
-    return fetch_model_list
\ No newline at end of file
+# Get the Model List serialised once at startup
+def get_model_list_payload(request: Request) -> PrecomputedJSON:
+    return request.app.state.model_list_payload
@@ -3,10 +3,16 @@ from fastapi.exceptions import RequestValidationError
 
 from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
 
+from ....core.config.settings import settings
+from ....core.config.setup import setup
 from ....core.exceptions.custom_http_exception import CustomHTTPException
+from ....core.rate_limit.upload_cost import upload_cost
 from ....docs.logic.docs_response import create_docs_response
 from ....docs.logic.error_response_example import \
     generate_error_response_example
+from ....docs.logic.multipart_request_body import \
+    create_multipart_request_body
+from ....schemas.analyze_document_form import AnalyzeDocumentForm
 from ....schemas.model_list import ModelList
 from ..routes.analyze_document import analyze_document
 from ..routes.get_available_models import get_available_models
@@ -26,11 +32,20 @@ v1_router.add_api_route(
 
 v1_router.add_api_route(
     "/analyze-document",
-    analyze_document,
+    # Larger uploads take more of the limits; the key is not validated before the analysis, so each address is limited too
+    setup.rate_limited(
+        ";".join(settings.ANALYZE_RATE_LIMITS or settings.RATE_LIMITS),
+        cost=upload_cost(settings.RATE_LIMIT_COST_UNIT_BYTES, settings.MAX_UPLOAD_SIZE),
+        ip_limit_str=";".join(settings.ANALYZE_IP_RATE_LIMITS or settings.RATE_LIMITS)
+    )(analyze_document),
     response_model=AnalysisReport,
     methods=["POST"],
     responses={
+        413: create_docs_response("Content Too Large", generate_error_response_example(CustomHTTPException(413, "The upload exceeds the maximum file size.", title="HTTP Error 413", error_type="http_error"))),
+        415: create_docs_response("Unsupported Media Type", generate_error_response_example(CustomHTTPException(415, "The content of report.pdf is not a valid PDF file.", title="HTTP Error 415", error_type="http_error"))),
         422: create_docs_response("Validation Error", generate_error_response_example(RequestValidationError)),
         500: create_docs_response("Internal Server Error", generate_error_response_example(CustomHTTPException()))
-    }
+    },
+    # The body is parsed while streaming by the endpoint, so the form is documented explicitly
+    openapi_extra={"requestBody": create_multipart_request_body(AnalyzeDocumentForm, file_field="file")}
 )
\ No newline at end of file
@@ -1,19 +1,37 @@
-from fastapi import Depends, File, Form, Request, UploadFile
+from contextlib import nullcontext
+from functools import partial
 
-from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
+from fastapi import Depends, Request, Response
+from opentelemetry import trace
 
+from ....core.logging.log_context import request_id_var
+from ....core.metrics.llm_usage_recorder import LLMUsageRecorder
+from ....schemas.analyze_document_form import AnalyzeDocumentForm
 from ....services.analysis_service import AnalysisService
-from ..dependencies.common import get_api_key
-from ..dependencies.get_analyze_document_factory import get_analysis_service
+from ....services.profiling_service import ProfilingService
+from ....utils.pydantic_json_response import PydanticJSONResponse
+from ....utils.streamed_upload import StreamedUpload
+from ...admin.dependencies.get_profiling_service_factory import \
+    get_profiling_service
+from ..dependencies.common import (get_api_key, get_llm_usage_recorder,
+                                   get_profile_requested)
+from ..dependencies.get_analyze_document_factory import (
+    get_analysis_service, get_analyze_document_form, get_streamed_upload)
+
+tracer = trace.get_tracer(__name__)
 
 
 async def analyze_document(
     request: Request,
-    file: UploadFile = File(...),
-    model_name: str = Form(...),
+    response: Response,
     api_key: str = Depends(get_api_key),
+    upload: StreamedUpload = Depends(get_streamed_upload),
+    form: AnalyzeDocumentForm = Depends(get_analyze_document_form),
     service: AnalysisService = Depends(get_analysis_service),
-) -> AnalysisReport:
+    usage_recorder: LLMUsageRecorder = Depends(get_llm_usage_recorder),
+    profile_requested: bool = Depends(get_profile_requested),
+    profiling_service: ProfilingService = Depends(get_profiling_service),
+) -> PydanticJSONResponse:
     
     """
 
@@ -28,18 +46,65 @@ async def analyze_document(
     request : Request
         The FastAPI request object.
 
-    file : UploadFile
-        The uploaded document.
+    response : Response
+        The FastAPI response object, used to attach the LLM usage headers.
+
+    api_key : str
+        The API key to use for analysis. Resolved before the upload, so requests with an invalid Authorization header are rejected before their body is read.
+
+    upload : StreamedUpload
+        The uploaded document, parsed while streaming and checked for its size, extension, and leading bytes.
+
+    form : AnalyzeDocumentForm
+        The other form fields:
+
+        * `model_name`: The name of the AI model to use. `auto:<provider>` (e.g., `auto:openai`) picks a registered model of the provider of the key that fits the document.
+        * `incremental`: Whether to only analyse the parts that changed since a previously analysed revision of the document.
+        * `schema_profile`: The output schema handed to the model. `compact` drops verbose fields to reduce generated tokens.
+        * `insight_types`: The insight types to extract (e.g., `Quantitative Metric`, `Table Analysis`). All types if omitted.
+        * `max_content_tokens`: Token budget for the parsed content. Larger documents are extractively reduced to fit before the analysis.
+        * `routing_preference`: What the `auto` model optimises: `latency`, `cost`, or `balanced`.
+
+    usage_recorder : LLMUsageRecorder
+        The recorder of the LLM usage.
 
-    model_name : str
-        The name of the AI model to use.
+    profile_requested : bool
+        Whether the analysis is profiled, as requested by an admin with the `X-Profile` header. The profile is downloaded from `/admin/profile/{X-Profile-Id}`.
+
+    profiling_service : ProfilingService
+        The profiling service, which also counts the completed analyses for worker profiles.
 
         
     Returns
     -------
-    analysis_report : AnalysisReport
-        The AI-generated analysis report.
+    analysis_report : PydanticJSONResponse
+        The AI-generated analysis report, serialised once without re-validation.
         
     """
 
-    return await service.analyze_document(file, api_key, model_name)
\ No newline at end of file
+    profile_id = request_id_var.get()
+    async with profiling_service.profile_request(profile_id) if profile_requested else nullcontext():
+        report = await service.analyze_document(
+            upload.filename,
+            upload.file,
+            api_key, 
+            form.model_name, 
+            usage_callback=partial(usage_recorder.record, response=response),
+            incremental=form.incremental,
+            schema_profile=form.schema_profile,
+            insight_types=form.insight_types,
+            max_content_tokens=form.max_content_tokens,
+            routing_preference=form.routing_preference
+        )
+    profiling_service.analysis_completed()
+    if profile_requested:
+        response.headers["x-profile-id"] = profile_id
+
+
+    # Returning a response skips FastAPI's response handling, so the usage headers are carried over explicitly
+    with tracer.start_as_current_span("serialize report") as span:
+        report_response = PydanticJSONResponse(report, headers=response.headers)
+        span.set_attribute("http.response.body.size", len(report_response.body))
+
+
+    return report_response
\ No newline at end of file
@@ -1,20 +1,22 @@
-from typing import Callable
+from fastapi import Depends, Request, Response
 
-from fastapi import Depends, Request
-
-from ....schemas.model_list import ModelList
-from ..dependencies.get_available_models_factory import get_fetch_model_list
+from ....core.config.settings import settings
+from ....utils.precomputed_json import PrecomputedJSON
+from ..dependencies.get_available_models_factory import get_model_list_payload
 
 
 async def get_available_models(
     request: Request, 
-    get_model_list: Callable[[], dict[str, list[dict[str, str]]]] = Depends(get_fetch_model_list)
-) -> ModelList:
+    model_list_payload: PrecomputedJSON = Depends(get_model_list_payload)
+) -> Response:
 
     """
 
     Endpoint to fetch the list of available models, grouped by provider.
 
+    The list is serialised once at startup and served with a strong ETag, so clients and
+    caches can revalidate it with `If-None-Match` and receive `304 Not Modified`.
+
 
     Parameters
     ----------
@@ -28,4 +30,13 @@ async def get_available_models(
         
     """
 
-    return ModelList(providers=get_model_list())
\ No newline at end of file
+    headers = {
+        "ETag": model_list_payload.etag,
+        "Cache-Control": f"public, max-age={settings.MODEL_LIST_CACHE_MAX_AGE}",
+    }
+
+    if model_list_payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+
+    return Response(content=model_list_payload.body, media_type="application/json", headers=headers)
@@ -27,10 +27,37 @@ class Settings(BaseSettings):
     HANDLER_LOG_LEVEL: str = "DEBUG"
     ROOT_LOG_LEVEL: str = "INFO"
     UVICORN_LOG_LEVEL: str = "INFO"
+    ## `text` or `json` (one object per line, with the request ID and the extra fields as keys)
+    LOG_FORMAT: str = "text"
+
+    # Access Log Sampling
+    ## Errors and slow requests are always logged; the others at the sample rate, lowered to log at most the target per second
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_THRESHOLD_MS: float = 1000.0
+    ACCESS_LOG_TARGET_RPS: Optional[float] = None
+    ## Seconds covered by each summary of the requests, logged when sampling
+    ACCESS_LOG_SUMMARY_INTERVAL: float = 60.0
+
+    # Server
+    ## Used by `server.py`; workers are forked after the application is loaded and drained on shutdown
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT: float = 120.0
+
+    # Tracing
+    ## OpenTelemetry spans of the analysis stages, tagged with the request ID (`none`, `console`, `file`, `otlp`)
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
 
     # API
     API_V1_PREFIX: str = "/api/v1"
 
+    # LLM Usage
+    ## Adds the token usage and provider latency of each analysis to its response headers
+    EXPOSE_LLM_USAGE_HEADERS: bool = False
+
     # Docs
     DOCS_URL: str = "/docs"
     REDOC_URL: str = "/redoc"
@@ -41,17 +68,121 @@ class Settings(BaseSettings):
     CORS_HEADERS: list[str] = ["*"]
     CORS_ALLOW_CREDENTIALS: bool = True
 
+    # Health checks
+    ## Readiness fails above any of these limits, so the orchestrator stops routing to overloaded workers
+    EVENT_LOOP_MONITOR_INTERVAL_MS: int = 100
+    READINESS_MAX_EVENT_LOOP_LAG_MS: float = 500.0
+    READINESS_MAX_EXECUTOR_QUEUE_DEPTH: int = 16
+    READINESS_MAX_IN_FLIGHT_LLM_CALLS: Optional[int] = None
+
+    # Blocking call detection
+    ## Opt-in debugging aid that logs the stack of any event-loop step blocking for longer than the threshold
+    BLOCKING_CALL_DETECTOR: bool = False
+    BLOCKING_CALL_THRESHOLD_MS: float = 100.0
+
+    # Admin
+    ## Token expected in the X-Admin-Token header of the admin endpoints and of profiled requests; they are disabled if unset
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Profiling
+    ## Sampling profiler of the admin endpoints and of requests sent with the X-Profile header
+    PROFILER_INTERVAL_MS: float = 10.0
+    PROFILER_MAX_SECONDS: float = 300.0
+    PROFILER_STORED_PROFILES: int = 32
+
+    # Metrics
+    ## Prometheus metrics served at /metrics; with several workers, each writes its metrics to the directory every flush interval so that any of them can report all
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROCESS_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
+    # Uploads
+    ## Uploads are parsed while streaming; oversize or mislabelled files are rejected before they are received in full
+    MAX_UPLOAD_SIZE: int = 20971520
+    UPLOAD_SNIFF_SIZE: int = 4096
+
+    # Model list
+    ## Cache lifetime of the model list, revalidated with its ETag afterwards
+    MODEL_LIST_CACHE_MAX_AGE: int = 3600
+
+    # Static files
+    ## Serve static assets ahead of the middleware stack, cached for STATIC_CACHE_MAX_AGE seconds
+    STATIC_FAST_LANE: bool = True
+    STATIC_CACHE_MAX_AGE: int = 604800
+
+    # Compression
+    ## Static files are precompressed at startup; API responses of at least the minimum size are compressed on the fly
+    STATIC_PRECOMPRESSION: bool = True
+    RESPONSE_COMPRESSION: bool = True
+    RESPONSE_COMPRESSION_MINIMUM_SIZE: int = 1024
+    RESPONSE_COMPRESSION_GZIP_LEVEL: int = 6
+    RESPONSE_COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Model routing
+    ## Capability registry used by the `auto` model; the bundled registry is used if no path is set
+    MODEL_CAPABILITIES_PATH: Optional[str] = None
+    AUTO_MODEL_OUTPUT_TOKEN_RESERVE: int = 8192
+    AUTO_MODEL_MIN_RELIABILITY: float = 0.9
+
     # Rate Limits
     ## Global
     RATE_LIMITS: list[str] = ["1/minute", "60/hour", "100/day"]
+    ## Analysis, in tokens; each request takes one token per started unit of upload, at most a full bucket (`RATE_LIMITS` if not set)
+    ANALYZE_RATE_LIMITS: Optional[list[str]] = None
+    RATE_LIMIT_COST_UNIT_BYTES: int = 1048576
+    ## Analysis, per client address whatever the API key, so that rotating keys does not escape the limits (`RATE_LIMITS` if not set)
+    ANALYZE_IP_RATE_LIMITS: Optional[list[str]] = None
+    ## Clients tracked in memory without Redis; past it, the least recently seen ones are forgotten
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # Analysis Scheduling
+    ## Model calls of each worker wait in a queue per API key beyond the limit, and are started in turns weighted per API key hash (no limit if not set)
+    ANALYSIS_MAX_CONCURRENCY: Optional[int] = None
+    ANALYSIS_MAX_CONCURRENCY_PER_TENANT: Optional[int] = None
+    ## Keyed by API key hash; others weigh 1, and share the `other` tenant label of the metrics
+    ANALYSIS_TENANT_WEIGHTS: dict[str, float] = {}
 
     # Redis settings
     USE_REDIS: bool = False
     REDIS_URL: Optional[str] = None
+    ## Connections of each worker
+    REDIS_MAX_CONNECTIONS: int = 16
+    ## Tokens taken are sent to Redis in batches every interval, letting clients exceed the limits by what the other workers admit meanwhile (`0` sends every check)
+    RATE_LIMIT_BATCH_INTERVAL_MS: float = 0.0
 
     # Storage settings
     STORAGE_TYPE: str = "local" 
 
+    # Incremental analysis
+    ## Content-defined chunking of revised documents, with a cache of per-chunk reports
+    INCREMENTAL_MIN_CHUNK_CHARS: int = 4000
+    INCREMENTAL_AVG_CHUNK_CHARS: int = 16000
+    INCREMENTAL_MAX_CHUNK_CHARS: int = 64000
+    INCREMENTAL_MAX_CONCURRENCY: int = 4
+    INCREMENTAL_CACHE_MAX_CHUNKS: int = 10000
+
+    # Content reduction
+    ## Opt-in extractive compression of the parsed content to a token budget
+    CONTENT_REDUCTION_METHOD: str = "textrank"
+    CONTENT_REDUCTION_MAX_TEXTRANK_SENTENCES: int = 2000
+
+    # Location resolution
+    ## Compute and verify insight locations locally from the representative snippets
+    RESOLVE_LOCATIONS: bool = True
+
+    # Stub model
+    ## Offline `local:stub` model for load testing and benchmarks
+    ENABLE_STUB_MODEL: bool = False
+    STUB_MODEL_LATENCY_DISTRIBUTION: str = "lognormal"
+    STUB_MODEL_LATENCY_MEAN_MS: float = 1500.0
+    STUB_MODEL_LATENCY_STDDEV_MS: float = 500.0
+    STUB_MODEL_INPUT_TOKENS: Optional[int] = None
+    STUB_MODEL_OUTPUT_TOKENS: int = 1200
+    STUB_MODEL_FAILURE_RATE: float = 0.0
+    STUB_MODEL_RETRY_RATE: float = 0.0
+    STUB_MODEL_INSIGHTS_PER_REPORT: int = 5
+    STUB_MODEL_SEED: Optional[int] = None
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
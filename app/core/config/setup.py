@@ -1,5 +1,23 @@
+import os
+
+from insight_extractor_ai_agent.logic.build_output_type import \
+    build_output_type
+
+from ...core.diagnostics.blocking_call_detector import BlockingCallDetector
+from ...core.metrics.event_loop_monitor import EventLoopMonitor
+from ...core.metrics.in_flight_gauge import InFlightGauge
+from ...core.metrics.llm_usage_recorder import LLMUsageRecorder
+from ...core.metrics.metrics_exporter import MetricsExporter
+from ...core.metrics.metrics_registry import MetricsRegistry
+from ...core.metrics.parse_metrics_recorder import ParseMetricsRecorder
+from ...core.metrics.register_runtime_metrics import register_runtime_metrics
+from ...core.rate_limit.get_rate_limit_key import get_rate_limit_key
 from ...core.rate_limit.rate_limit_config import get_limiter
 from ...core.rate_limit.rate_limiter_decorator import RateLimiterDecorator
+from ...core.scheduling.fair_scheduler import FairScheduler
+from ...utils.available_models_list import fetch_model_list
+from ...utils.lru_cache import LRUCache
+from ...utils.model_registry import ModelRegistry
 from .settings import settings
 
 
@@ -19,7 +37,65 @@ class Setup:
     # Configure Limiter
     ## Global
     limiter = get_limiter(default_limits=settings.RATE_LIMITS)
-    rate_limited = RateLimiterDecorator(limiter=limiter)
+    rate_limited = RateLimiterDecorator(limiter=limiter, key_func=get_rate_limit_key)
+    ## With Redis, the batches of the storage are started by the lifespan, as they need a running event loop; in memory, its size is reported in the metrics
+    rate_limit_storage = limiter._limiter.storage
+
+    # Configure Metrics
+    ## Each worker records its own metrics; the exporter combines those of all the workers if a directory is set
+    metrics = MetricsRegistry()
+    metrics_exporter = MetricsExporter(metrics, directory=settings.METRICS_MULTIPROCESS_DIR, flush_interval=settings.METRICS_FLUSH_INTERVAL)
+    parse_metrics_recorder = ParseMetricsRecorder(metrics)
+
+    # Configure Available Models
+    ## The models this server can run, as "provider:model" names
+    available_models = [
+        model["value"]
+        for models in fetch_model_list(include_stub_model=settings.ENABLE_STUB_MODEL).values()
+        for model in models
+    ]
+
+    # Configure LLM Usage Recorder
+    ## Only the available models are labelled by name, as the model name comes from the request
+    llm_usage_recorder = LLMUsageRecorder(expose_headers=settings.EXPOSE_LLM_USAGE_HEADERS, metrics=metrics, known_models=available_models)
+
+    # Configure Health Metrics
+    ## The monitor is started by the lifespan, as it needs a running event loop
+    event_loop_monitor = EventLoopMonitor(interval=settings.EVENT_LOOP_MONITOR_INTERVAL_MS / 1000)
+    llm_calls_in_flight = InFlightGauge()
+
+    # Configure Blocking Call Detector
+    ## Opt-in, as the watchdog thread competes with the event loop for the GIL
+    blocking_call_detector = BlockingCallDetector(threshold_ms=settings.BLOCKING_CALL_THRESHOLD_MS, metrics=metrics) if settings.BLOCKING_CALL_DETECTOR else None
+
+    # Configure Analysis Scheduler
+    ## Opt-in, as calls beyond the limit wait in the worker rather than at the provider
+    analysis_scheduler = FairScheduler(
+        max_concurrency=settings.ANALYSIS_MAX_CONCURRENCY,
+        max_concurrency_per_tenant=settings.ANALYSIS_MAX_CONCURRENCY_PER_TENANT,
+        weights=settings.ANALYSIS_TENANT_WEIGHTS,
+        metrics=metrics
+    ) if settings.ANALYSIS_MAX_CONCURRENCY else None
+
+    # Configure Incremental Analysis Cache
+    analysis_chunk_cache = LRUCache(max_entries=settings.INCREMENTAL_CACHE_MAX_CHUNKS)
+
+    # Configure Runtime Metrics
+    ## Read from the health metrics and the caches when the metrics are collected
+    register_runtime_metrics(
+        metrics,
+        event_loop_monitor=event_loop_monitor,
+        llm_calls_in_flight=llm_calls_in_flight,
+        caches={"analysis_chunks": analysis_chunk_cache.cache_info, "output_types": build_output_type.cache_info},
+        rate_limit_storage=None if settings.USE_REDIS else rate_limit_storage
+    )
+
+    # Configure Model Registry
+    ## Only the models this server can run are routable
+    model_registry = ModelRegistry.from_file(
+        settings.MODEL_CAPABILITIES_PATH or os.path.join(os.path.dirname(__file__), "model_capabilities.json"),
+        available_models=available_models
+    )
 
 
 setup = Setup()
\ No newline at end of file
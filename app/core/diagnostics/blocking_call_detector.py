@@ -0,0 +1,235 @@
+import asyncio
+from logging import getLogger
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..logging.log_context import request_id_var
+from ..metrics.metrics_registry import MetricsRegistry
+
+# Logger whose records carry the request ID of the blocking task (see logging_config)
+blocking_logger = getLogger("IEAIA.blocking")
+
+BLOCK_DURATION_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Innermost frames of the stack that are logged; the outer ones are the server and the middlewares
+STACK_DEPTH = 20
+LIBRARY_PATHS = tuple({sysconfig.get_paths()[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")})
+
+
+class BlockingCallDetector:
+
+    """
+
+    Debugging aid that finds the synchronous code blocking the event loop.
+
+    A watchdog thread pings the event loop every `interval` seconds. If the loop does not answer
+    within `threshold_ms`, the code running on it is blocking: the watchdog captures the stack of
+    the event-loop thread, the task being run, and its request ID. Once the loop answers again, it
+    logs the stack with the time blocked since the ping, and records that time in the
+    `event_loop_block_duration_seconds` histogram, labelled with the innermost application frame
+    of the stack (e.g., `app/utils/file_parser.py:120 _extract_text_from_pdf`).
+
+    The stack is taken while the loop is blocked, so it shows the offending call itself, unlike
+    the lag measured by the `EventLoopMonitor`, which only shows that the loop was late.
+
+
+    Usage
+    -----
+    ```python
+    detector = BlockingCallDetector(threshold_ms=100.0, metrics=metrics)
+    detector.start()  # From a running event loop, e.g., the lifespan
+    await detector.stop()
+    ```
+
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, interval: float = 0.05, metrics: Optional[MetricsRegistry] = None) -> None:
+
+        """
+
+        Constructor for the Blocking Call Detector.
+
+
+        Parameters
+        ----------
+        threshold_ms : float, optional
+            Time, in milliseconds, after which a step of the event loop is reported. The default value is `100.0`.
+
+        interval : float, optional
+            Seconds between two pings of the event loop. The default value is `0.05`.
+
+        metrics : MetricsRegistry, optional
+            The registry of the blocked-time histogram. The default value is `None`.
+            If `None`, blocking calls are only logged.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(threshold_ms, (int, float)) or threshold_ms <= 0:
+            raise ValueError(f"threshold_ms must be a positive number. Received: {threshold_ms} with type {type(threshold_ms)}")
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError(f"interval must be a positive number. Received: {interval} with type {type(interval)}")
+        if metrics is not None and not isinstance(metrics, MetricsRegistry):
+            raise TypeError(f"metrics must be a MetricsRegistry instance. Received: {metrics} with type {type(metrics)}")
+
+
+        self.threshold_ms = threshold_ms
+        self.interval = interval
+        self.block_duration = metrics.histogram(
+            "event_loop_block_duration_seconds",
+            "Time the event loop was blocked by a single step, per innermost application frame.",
+            BLOCK_DURATION_BUCKETS_SECONDS,
+            labelnames=("site",)
+        ) if metrics is not None else None
+        self.project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts the watchdog thread on the running event loop.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.thread is not None:
+            return
+
+
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._watch, name="blocking-call-detector", daemon=True)
+        self.thread.start()
+
+
+    async def stop(self) -> None:
+
+        """
+
+        Stops the watchdog thread.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.thread is None:
+            return
+
+
+        self.stopping.set()
+        await run_in_threadpool(self.thread.join)
+        self.thread = None
+
+
+    def _watch(self) -> None:
+
+        """
+
+        Pings the event loop until stopped, and reports the steps that keep it from answering.
+
+        """
+
+        while not self.stopping.wait(self.interval):
+            answered = threading.Event()
+            sent_at = time.perf_counter()
+            try:
+                self.loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # The event loop is closed
+                return
+
+            if answered.wait(self.threshold_ms / 1000):
+                continue
+
+
+            # Captured while the loop is still blocked, so that the stack shows the blocking call
+            frame = sys._current_frames().get(self.loop_thread_id)
+            task = asyncio.current_task(self.loop)
+            stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH)) if frame is not None else ""
+            site = self._find_site(frame)
+            task_name = task.get_coro().__qualname__ if task is not None else "a callback"
+            request_id = task.get_context().get(request_id_var, "unknown") if task is not None else "unknown"
+            frame = task = None
+
+            while not answered.wait(self.interval):
+                if self.stopping.is_set():
+                    return
+            blocked_seconds = time.perf_counter() - sent_at
+
+            blocking_logger.warning(
+                "Event loop blocked for at least %.0f ms in %s at %s:\n%s",
+                blocked_seconds * 1000,
+                task_name,
+                site,
+                stack,
+                extra={"request_id": request_id, "blocked_ms": round(blocked_seconds * 1000, 2), "site": site}
+            )
+            if self.block_duration is not None:
+                # Metrics are only updated from the event loop
+                self.loop.call_soon_threadsafe(self._record, site, blocked_seconds)
+
+
+    def _record(self, site: str, blocked_seconds: float) -> None:
+
+        """
+
+        Records a blocked time in the histogram, from the event loop.
+
+        """
+
+        self.block_duration.labels(site).observe(blocked_seconds)
+
+
+    def _find_site(self, frame: Optional[FrameType]) -> str:
+
+        """
+
+        Returns the innermost frame of the application code, outside the standard library and the installed packages.
+
+        """
+
+        innermost = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if innermost is None:
+                innermost = frame
+            if filename.startswith(self.project_root) and not filename.startswith(LIBRARY_PATHS):
+                return f"{os.path.relpath(filename, self.project_root)}:{frame.f_lineno} {frame.f_code.co_name}"
+            frame = frame.f_back
+
+
+        return f"{innermost.f_code.co_filename}:{innermost.f_lineno} {innermost.f_code.co_name}" if innermost is not None else "unknown"
@@ -0,0 +1,198 @@
+import asyncio
+from collections import Counter
+import sys
+import threading
+from types import FrameType
+from typing import Optional
+
+# Innermost frames of threads waiting for work: idle thread-pool threads and an idle event loop
+IDLE_FRAMES = {
+    "threading:Condition.wait",
+    "threading:Event.wait",
+    "selectors:EpollSelector.select",
+    "selectors:KqueueSelector.select",
+    "selectors:PollSelector.select",
+    "selectors:SelectSelector.select",
+}
+
+class StackSampler:
+
+    """
+
+    Statistical profiler that samples the stacks of the threads of the worker at a fixed interval.
+
+    A background thread reads the current frame of every other thread (the event loop and the
+    `run_in_threadpool` threads) every `interval` seconds and counts the stacks it sees. Nothing
+    is hooked into the profiled code, so the overhead is that of the sampling thread alone. Threads
+    waiting for work are skipped. If a task is given, only the event-loop samples taken while that
+    task runs are kept.
+
+    The result is rendered as collapsed stacks (`thread;outer;...;inner count`), which flame graph
+    tools (e.g., `flamegraph.pl`, speedscope) read directly.
+
+
+    Usage
+    -----
+    ```python
+    sampler = StackSampler(interval=0.01)
+    sampler.start()
+    ...
+    sampler.stop()
+    collapsed_stacks = sampler.render_collapsed()
+    ```
+
+    """
+
+    def __init__(self, interval: float = 0.01, task: Optional[asyncio.Task] = None) -> None:
+
+        """
+
+        Constructor for the Stack Sampler.
+
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two samples. The default value is `0.01`.
+
+        task : asyncio.Task, optional
+            The task to profile; the sampler must then be created on the event loop of the task. The default value is `None`.
+            If `None`, every thread is profiled.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError(f"interval must be a positive number. Received: {interval} with type {type(interval)}")
+        if task is not None and not isinstance(task, asyncio.Task):
+            raise TypeError(f"task must be an asyncio.Task instance. Received: {task} with type {type(task)}")
+
+
+        self.interval = interval
+        self.task = task
+        self.loop = task.get_loop() if task is not None else None
+        self.loop_thread_id = threading.get_ident() if task is not None else None
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts sampling.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.thread is not None:
+            return
+
+
+        self.thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+
+    def stop(self) -> None:
+
+        """
+
+        Stops sampling; the stacks counted so far are kept.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.thread is None:
+            return
+
+
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+
+    def render_collapsed(self) -> str:
+
+        """
+
+        Renders the counted stacks in the collapsed format, most frequent first.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        collapsed_stacks : str
+            One `frame;frame;...;frame count` line per distinct stack.
+
+        """
+
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+    def _sample(self) -> None:
+
+        """
+
+        Counts the stacks of the other threads every interval until stopped.
+
+        """
+
+        sampler_thread_id = threading.get_ident()
+        while not self.stopping.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_thread_id:
+                    continue
+                if self.task is not None and (thread_id != self.loop_thread_id or asyncio.current_task(self.loop) is not self.task):
+                    continue
+                if f"{frame.f_globals.get('__name__')}:{frame.f_code.co_qualname}" in IDLE_FRAMES:
+                    continue
+                self.stacks[self._collapse(thread_names.get(thread_id, str(thread_id)), frame)] += 1
+            self.samples += 1
+
+
+    @staticmethod
+    def _collapse(thread_name: str, frame: Optional[FrameType]) -> str:
+
+        """
+
+        Joins the frames of a stack from the outermost to the innermost, under the name of the thread.
+
+        """
+
+        frames = []
+        while frame is not None:
+            frames.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        frames.append(thread_name)
+
+
+        return ";".join(reversed(frames))
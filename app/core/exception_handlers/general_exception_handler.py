@@ -1,14 +1,14 @@
 from logging import getLogger
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
 
 from ...docs.logic.error_response import create_error_response
+from ...utils.pydantic_json_response import PydanticJSONResponse
 
 logger = getLogger(__name__)
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> PydanticJSONResponse:
 
     """
 
@@ -26,15 +26,15 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         
     Returns
     -------
-    JSONResponse
+    PydanticJSONResponse
         A JSON response detailing the internal server error.
 
     """
 
-    logger.exception(f"Unhandled exception: {exc}") # exception() results in a full traceback
+    logger.exception("Unhandled exception: %s", exc) # exception() results in a full traceback
 
 
-    return JSONResponse(
+    return PydanticJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=create_error_response(
             title="Internal Server Error",
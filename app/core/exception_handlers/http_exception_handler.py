@@ -1,14 +1,14 @@
 from logging import getLogger
 
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
 
 from ...docs.logic.error_response import create_error_response
+from ...utils.pydantic_json_response import PydanticJSONResponse
 
 logger = getLogger(__name__)
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> PydanticJSONResponse:
 
     """
 
@@ -26,15 +26,15 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         
     Returns
     -------
-    JSONResponse
+    PydanticJSONResponse
         A JSON response detailing the HTTP error.
 
     """
 
-    logger.error(f"HTTP Exception: {exc.status_code}: {exc.detail}")
+    logger.error("HTTP Exception: %s: %s", exc.status_code, exc.detail)
 
 
-    return JSONResponse(
+    return PydanticJSONResponse(
         status_code=exc.status_code,
         content=create_error_response(
             title=f"HTTP Error {exc.status_code}",
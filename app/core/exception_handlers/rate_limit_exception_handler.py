@@ -1,15 +1,17 @@
 from logging import getLogger
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 
+from ..config.setup import setup
 from ...docs.logic.error_response import create_error_response
+from ...utils.pydantic_json_response import PydanticJSONResponse
 
 logger = getLogger(__name__)
+rate_limit_rejections = setup.metrics.counter("rate_limit_rejections_total", "Requests rejected by the rate limits.", labelnames=("route",))
 
 
-async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded) -> PydanticJSONResponse:
     
     """
 
@@ -28,16 +30,18 @@ async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded)
         
     Returns
     -------
-    JSONResponse
+    PydanticJSONResponse
         A JSON response with a custom error format and appropriate rate limit headers.
 
     """
 
-    logger.warning(f"Rate limit exceeded for request: {request.url}")
+    logger.warning("Rate limit exceeded for request: %s", request.url)
+    # Limits only apply to routes, so the path is bounded even before the router matched the request
+    rate_limit_rejections.labels(request.scope["route"].path if "route" in request.scope else request.url.path).inc()
     
     
     # Create the base JSON response
-    response = JSONResponse(
+    response = PydanticJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content=create_error_response(
             title="Rate limit exceeded",
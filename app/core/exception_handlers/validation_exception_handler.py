@@ -2,14 +2,14 @@ from logging import getLogger
 
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
 from ...docs.logic.error_response import create_error_response
+from ...utils.pydantic_json_response import PydanticJSONResponse
 
 logger = getLogger(__name__)
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> PydanticJSONResponse:
 
     """
 
@@ -27,15 +27,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         
     Returns
     -------
-    JSONResponse
+    PydanticJSONResponse
         A JSON response detailing the validation error.
 
     """
 
-    logger.error(f"Validation error: {exc.errors()}")
+    logger.error("Validation error: %s", exc.errors())
 
 
-    return JSONResponse(
+    return PydanticJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=create_error_response(
             title="Validation Error",
@@ -0,0 +1,224 @@
+import random
+import time
+from typing import Any, Optional
+
+
+class AccessLogSampler:
+
+    """
+
+    Decides which access records are logged, and aggregates the requests of each interval into a summary.
+
+    Errors (status 400 and above) and requests slower than `slow_threshold_ms` are always logged.
+    Other requests are logged with probability `sample_rate`, lowered further when a
+    `target_rps` is set so that about `target_rps` of them are logged per second, whatever the
+    current rate of such requests, which is measured over the last full second. No more than
+    `target_rps` of them are logged within a second, even on a sudden burst.
+
+    Every request, logged or not, is counted in the summary of the current interval, which
+    `pop_summary` returns once `summary_interval` seconds have passed. Meant to be used from the
+    event loop only.
+
+
+    Usage
+    -----
+    ```python
+    sampler = AccessLogSampler(sample_rate=0.1, slow_threshold_ms=1000.0, target_rps=50.0)
+    logged, rate = sampler.sample(status=200, process_time_ms=12.3)
+    summary = sampler.pop_summary()
+    ```
+
+    """
+
+    def __init__(self,
+                 sample_rate: float = 1.0,
+                 slow_threshold_ms: float = 1000.0,
+                 target_rps: Optional[float] = None,
+                 summary_interval: float = 60.0) -> None:
+
+        """
+
+        Constructor for the Access Log Sampler.
+
+
+        Parameters
+        ----------
+        sample_rate : float, optional
+            Share of the successful, fast requests that are logged, between `0` and `1`. The default value is `1.0`.
+
+        slow_threshold_ms : float, optional
+            Processing time, in milliseconds, above which a request is always logged. The default value is `1000.0`.
+
+        target_rps : float, optional
+            Successful, fast requests logged per second at most. The default value is `None`.
+            If `None`, only `sample_rate` applies.
+
+        summary_interval : float, optional
+            Seconds covered by each summary. The default value is `60.0`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(sample_rate, (int, float)) or not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be a number between 0 and 1. Received: {sample_rate} with type {type(sample_rate)}")
+        if not isinstance(slow_threshold_ms, (int, float)) or slow_threshold_ms < 0:
+            raise ValueError(f"slow_threshold_ms must be a non-negative number. Received: {slow_threshold_ms} with type {type(slow_threshold_ms)}")
+        if target_rps is not None and (not isinstance(target_rps, (int, float)) or target_rps <= 0):
+            raise ValueError(f"target_rps must be a positive number. Received: {target_rps} with type {type(target_rps)}")
+        if not isinstance(summary_interval, (int, float)) or summary_interval <= 0:
+            raise ValueError(f"summary_interval must be a positive number. Received: {summary_interval} with type {type(summary_interval)}")
+
+
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.target_rps = target_rps
+        self.summary_interval = summary_interval
+
+        now = time.monotonic()
+        self.rps = 0.0
+        self.second_start = now
+        self.second_requests = 0
+        self.second_logged = 0
+        self.summary_start = now
+        self.summary = self._empty_summary()
+
+
+    def current_rate(self) -> float:
+
+        """
+
+        Returns the probability with which a successful, fast request is currently logged.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        rate : float
+            The sample rate, lowered to meet the target rate of logged requests, if any.
+
+        """
+
+        if self.target_rps is None or self.rps <= self.target_rps:
+            return self.sample_rate
+
+
+        return min(self.sample_rate, self.target_rps / self.rps)
+
+
+    def sample(self, status: int, process_time_ms: float) -> tuple[bool, float]:
+
+        """
+
+        Counts a request, and decides whether it is logged.
+
+
+        Parameters
+        ----------
+        status : int
+            The status code of the response.
+
+        process_time_ms : float
+            The time to the start of the response, in milliseconds.
+
+
+        Returns
+        -------
+        logged : bool
+            Whether the request is logged.
+
+        rate : float
+            The probability with which it was logged, `1.0` for errors and slow requests.
+
+        """
+
+        now = time.monotonic()
+        if now - self.second_start >= 1:
+            self.rps = self.second_requests / (now - self.second_start)
+            self.second_start = now
+            self.second_requests = 0
+            self.second_logged = 0
+
+        if status >= 400 or process_time_ms >= self.slow_threshold_ms:
+            logged, rate = True, 1.0
+        else:
+            self.second_requests += 1
+            rate = self.current_rate()
+            # The cap holds the target while the rate of the previous second is not representative, e.g., on a burst
+            logged = random.random() < rate and (self.target_rps is None or self.second_logged < self.target_rps)
+            self.second_logged += logged
+
+        summary = self.summary
+        summary["requests"] += 1
+        summary["logged"] += logged
+        status_class = f"{status // 100}xx"
+        summary["status"][status_class] = summary["status"].get(status_class, 0) + 1
+        summary["process_time_ms_sum"] += process_time_ms
+        summary["process_time_ms_max"] = max(summary["process_time_ms_max"], process_time_ms)
+
+
+        return logged, rate
+
+
+    def pop_summary(self) -> Optional[dict[str, Any]]:
+
+        """
+
+        Returns the summary of the current interval and starts the next one, once the interval is over.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        summary : dict or None
+            The requests, logged records, status classes, and mean and highest processing time of the interval.
+            `None` while the interval is not over, or if it had no request.
+
+        """
+
+        now = time.monotonic()
+        if now - self.summary_start < self.summary_interval:
+            return None
+
+
+        summary, self.summary = self.summary, self._empty_summary()
+        summary["interval_s"] = round(now - self.summary_start, 2)
+        self.summary_start = now
+        if summary["requests"] == 0:
+            return None
+
+        summary["rps"] = round(summary["requests"] / summary["interval_s"], 2)
+        summary["process_time_ms_mean"] = round(summary.pop("process_time_ms_sum") / summary["requests"], 2)
+        summary["process_time_ms_max"] = round(summary["process_time_ms_max"], 2)
+
+
+        return summary
+
+
+    @staticmethod
+    def _empty_summary() -> dict[str, Any]:
+
+        """
+
+        Returns the counters of a new summary interval.
+
+        """
+
+        return {
+            "requests": 0,
+            "logged": 0,
+            "status": {},
+            "process_time_ms_sum": 0.0,
+            "process_time_ms_max": 0.0,
+        }
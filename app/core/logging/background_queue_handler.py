@@ -0,0 +1,200 @@
+import copy
+from logging import LogRecord
+from logging.handlers import QueueHandler, QueueListener
+import os
+from queue import Queue
+from typing import Optional
+from weakref import WeakSet
+
+
+class BackgroundQueueHandler(QueueHandler):
+
+    """
+
+    Handler that hands the records over to a background thread, which formats and writes them.
+
+    The calling thread (e.g., the event loop) only puts the record in an in-process queue; the
+    `QueueListener` thread then passes it to the target handlers, so the formatting of the
+    message, its arguments, and its exception, as well as the write to the stream, happen off
+    the calling thread. The arguments of a record are thus formatted after the call returned,
+    and must not be mutated once logged.
+
+    The listener is stopped, so that its queue is drained and its lock released, before the
+    process forks, and started again in both the parent and the child.
+
+
+    Usage
+    -----
+    ```
+    "default_queue": {
+        "class": BackgroundQueueHandler,
+        "handlers": ["default"],
+        "respect_handler_level": True,
+    },
+    ```
+    ```python
+    logging.getHandlerByName("default_queue").start()
+    ```
+
+    """
+
+    # Every handler of the process, for the fork hooks
+    instances: "WeakSet[BackgroundQueueHandler]" = WeakSet()
+
+    def __init__(self, queue: Queue) -> None:
+
+        """
+
+        Constructor for the Background Queue Handler.
+
+
+        Parameters
+        ----------
+        queue : Queue
+            The in-process queue shared with the listener.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(queue, Queue):
+            raise TypeError(f"queue must be a queue.Queue instance. Received: {queue} with type {type(queue)}")
+
+
+        super().__init__(queue)
+        # Set by `dictConfig` from the `handlers` of the configuration
+        self.listener: Optional[QueueListener] = None
+        self.running = False
+        self.restart_after_fork = False
+        BackgroundQueueHandler.instances.add(self)
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts the listener thread.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.running or self.listener is None:
+            return
+
+
+        self.listener.start()
+        self.running = True
+
+
+    def stop(self) -> None:
+
+        """
+
+        Writes the queued records, and stops the listener thread.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not self.running:
+            return
+
+
+        self.listener.stop()
+        self.running = False
+
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+
+        """
+
+        Returns a copy of the record, left unformatted for the listener thread.
+
+
+        Parameters
+        ----------
+        record : LogRecord
+            The record being logged.
+
+
+        Returns
+        -------
+        record : LogRecord
+            The record to enqueue.
+
+        """
+
+        # Unlike `QueueHandler.prepare`, neither formats the message nor drops the exception, which the queue does not need to pickle
+        return copy.copy(record)
+
+
+    def close(self) -> None:
+
+        """
+
+        Stops the listener, which `dictConfig` and `logging.shutdown` do not, before closing the handler.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.stop()
+        super().close()
+
+
+def _stop_before_fork() -> None:
+
+    """
+
+    Stops the running listeners, and marks them to be started again after the fork.
+
+    """
+
+    for handler in list(BackgroundQueueHandler.instances):
+        handler.restart_after_fork = handler.running
+        handler.stop()
+
+
+def _start_after_fork() -> None:
+
+    """
+
+    Starts the listeners stopped before the fork.
+
+    """
+
+    for handler in list(BackgroundQueueHandler.instances):
+        if handler.restart_after_fork:
+            handler.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_stop_before_fork, after_in_parent=_start_after_fork, after_in_child=_start_after_fork)
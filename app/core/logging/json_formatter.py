@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+import json
+from logging import Formatter, LogRecord
+
+# Attributes every log record has; any other attribute was passed with `extra` or set by a filter
+RECORD_ATTRIBUTES = frozenset(vars(LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(Formatter):
+
+    """
+
+    A formatter that renders each log record as a single-line JSON object.
+
+    The object holds the time, level, logger, message, and request ID of the record, its
+    exception if any, and the fields passed with `extra` (e.g., `process_time_ms` of the access
+    log), so that log collectors can index them without parsing the message.
+
+
+    Usage
+    -----
+    ```
+    "json": {
+        "()": JSONFormatter,
+    },
+    ```
+
+    """
+
+    def format(self, record: LogRecord) -> str:
+
+        """
+
+        Renders the log record as JSON.
+
+
+        Parameters
+        ----------
+        record : LogRecord
+            The log record to be formatted.
+
+
+        Returns
+        -------
+        formatted_log : str
+            The JSON object, without a trailing newline.
+
+        """
+
+        if not isinstance(record, LogRecord):
+            raise TypeError(f"record must be an instance of the logging.LogRecord. Received: {record} with type {type(record)}")
+
+
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES and key not in entry})
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
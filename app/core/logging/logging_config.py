@@ -1,10 +1,13 @@
+from logging import getHandlerByName
 from logging.config import dictConfig
 
+from .background_queue_handler import BackgroundQueueHandler
+from .json_formatter import JSONFormatter
 from .logging_formatter import SafeRequestIDFormatter
 from .request_id_filter import RequestIDFilter
 
 
-def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO", uvicorn_log_level: str = "INFO") -> None:
+def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO", uvicorn_log_level: str = "INFO", log_format: str = "text") -> None:
 
     """
 
@@ -12,6 +15,8 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
     
     This function sets up a centralized logger configuration using Python's built-in logging module. 
     It configures all loggers to write to stdout and uses a consistent format across the app.
+    The loggers only enqueue their records; a background thread per handler formats and writes
+    them, so that logging never blocks the event loop on stdout.
 
     
     Parameters
@@ -58,6 +63,14 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
                 `"CRITICAL"`
                     Severe errors indicating the program may be unable to continue running.
 
+    log_format : str
+        Format of the log lines as a string. The default value is `text`.
+            The options are:
+                `"text"`
+                    Human-readable lines.
+                `"json"`
+                    One JSON object per line, with the request ID and the `extra` fields (e.g., `process_time_ms`) as keys.
+
         
     Returns
     -------
@@ -71,6 +84,8 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
         raise TypeError(f"root_log_level must be a string. Received: {root_log_level} with type {type(root_log_level)}")
     if not isinstance(uvicorn_log_level, str):
         raise TypeError(f"uvicorn_log_level must be a string. Received: {uvicorn_log_level} with type {type(uvicorn_log_level)}")
+    if not isinstance(log_format, str):
+        raise TypeError(f"log_format must be a string. Received: {log_format} with type {type(log_format)}")
 
     valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
     if handler_log_level not in valid_levels:
@@ -79,6 +94,8 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
         raise ValueError(f"Invalid root_log_level: {root_log_level}. Must be one of: {', '.join(valid_levels)}")
     if uvicorn_log_level not in valid_levels:
         raise ValueError(f"Invalid uvicorn_log_level: {uvicorn_log_level}. Must be one of: {', '.join(valid_levels)}")
+    if log_format not in {"text", "json"}:
+        raise ValueError(f"Invalid log_format: {log_format}. Must be one of: text, json")
 
 
     logging_config = {
@@ -92,20 +109,36 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
                 "()": SafeRequestIDFormatter,
                 "format": "%(asctime)s - %(levelname)s - %(name)s - [request-id=%(request_id)s] - %(message)s",
             },
+            "json": {
+                "()": JSONFormatter,
+            },
         },
         "handlers": {
             "default": {
                 "class": "logging.StreamHandler",
-                "formatter": "default",
+                "formatter": "default" if log_format == "text" else "json",
                 "level": handler_log_level,
                 "stream": "ext://sys.stdout",
             },
             "access": {
                 "class": "logging.StreamHandler",
-                "formatter": "access",
+                "formatter": "access" if log_format == "text" else "json",
                 "level": uvicorn_log_level,
                 "stream": "ext://sys.stdout",
             },
+            # The loggers write to these; their listener threads pass the records to the handlers above
+            "default_queue": {
+                "class": BackgroundQueueHandler,
+                "handlers": ["default"],
+                "level": handler_log_level,
+                "respect_handler_level": True,
+            },
+            "access_queue": {
+                "class": BackgroundQueueHandler,
+                "handlers": ["access"],
+                "level": uvicorn_log_level,
+                "respect_handler_level": True,
+            },
         },
         "filters": {
             "request_id_filter": {
@@ -113,7 +146,7 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
             }
         },
         "root": {
-            "handlers": ["default"],
+            "handlers": ["default_queue"],
             "level": root_log_level,
         },
         "loggers": {
@@ -123,20 +156,36 @@ def setup_logging(handler_log_level: str = "DEBUG", root_log_level: str = "INFO"
                 "propagate": False,
             },
             "uvicorn.error": {
-                "handlers": ["default"],
+                "handlers": ["default_queue"],
                 "level": uvicorn_log_level,
                 "propagate": False,
             },
             # This new logger is for custom AccessLogMiddleware.
             # It will print the correct request ID.
             "IEAIA.access": {
-                "handlers": ["access"],
+                "handlers": ["access_queue"],
+                "level": uvicorn_log_level,
+                "propagate": False,
+                "filters": ["request_id_filter"],
+            },
+            # Per-analysis LLM usage, correlated with the request ID.
+            "IEAIA.usage": {
+                "handlers": ["access_queue"],
                 "level": uvicorn_log_level,
                 "propagate": False,
                 "filters": ["request_id_filter"],
             },
+            # Blocking calls, logged from a watchdog thread with the request ID of the blocking task.
+            "IEAIA.blocking": {
+                "handlers": ["access_queue"],
+                "level": "WARNING",
+                "propagate": False,
+            },
         },
     }
 
 
-    dictConfig(logging_config)
\ No newline at end of file
+    # Closes the handlers of a previous configuration, which writes their queued records
+    dictConfig(logging_config)
+    getHandlerByName("default_queue").start()
+    getHandlerByName("access_queue").start()
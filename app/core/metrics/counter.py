@@ -0,0 +1,67 @@
+from typing import Union
+
+
+class Counter:
+
+    """
+
+    Monotonically increasing value, in the style of Prometheus counters.
+
+    Counters are only updated from the event loop, so they need no lock.
+
+
+    Usage
+    -----
+    ```python
+    counter = Counter()
+    counter.inc()
+    counter.value
+    ```
+
+    """
+
+    def __init__(self) -> None:
+
+        """
+
+        Constructor for the Counter class.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value = 0
+
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+
+        """
+
+        Increments the counter.
+
+
+        Parameters
+        ----------
+        amount : int or float, optional
+            The non-negative increment. The default value is `1`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if amount < 0:
+            raise ValueError(f"Counters can only increase. Received: {amount}")
+
+
+        self.value += amount
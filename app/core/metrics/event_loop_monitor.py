@@ -0,0 +1,171 @@
+import asyncio
+from collections import deque
+from contextlib import suppress
+from logging import getLogger
+from typing import Optional
+
+logger = getLogger(__name__)
+
+
+class EventLoopMonitor:
+
+    """
+
+    Measures event-loop lag: how late a background task wakes up from a sleep of `interval` seconds.
+
+    A loop that is free wakes the task up on time; a loop saturated by synchronous work (e.g.,
+    parsing a large document on the loop) wakes it up late by roughly the time the loop was busy.
+    The lag of the latest wake-up and the highest lag within the last `window` seconds are kept.
+
+
+    Usage
+    -----
+    ```python
+    monitor = EventLoopMonitor(interval=0.1)
+    monitor.start()  # From a running event loop, e.g., the lifespan
+    monitor.max_lag_ms()
+    await monitor.stop()
+    ```
+
+    """
+
+    def __init__(self, interval: float = 0.1, window: float = 5.0) -> None:
+
+        """
+
+        Constructor for the Event Loop Monitor.
+
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two measurements. The default value is `0.1`.
+
+        window : float, optional
+            Seconds over which the highest lag is kept. The default value is `5.0`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError(f"interval must be a positive number. Received: {interval} with type {type(interval)}")
+        if not isinstance(window, (int, float)) or window < interval:
+            raise ValueError(f"window must be a number no smaller than interval. Received: {window} with type {type(window)}")
+
+
+        self.interval = interval
+        self.window = window
+        self.lag_ms = 0.0
+        self.samples: deque[tuple[float, float]] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+    @property
+    def running(self) -> bool:
+
+        """
+
+        Whether the measuring task is running.
+
+        """
+
+        return self.task is not None and not self.task.done()
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts the measuring task on the running event loop.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.running:
+            return
+
+
+        self.task = asyncio.get_running_loop().create_task(self._measure())
+
+
+    async def stop(self) -> None:
+
+        """
+
+        Stops the measuring task.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.task is None:
+            return
+
+
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self.task = None
+
+
+    def max_lag_ms(self) -> float:
+
+        """
+
+        Returns the highest lag measured within the window, in milliseconds.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        max_lag_ms : float
+            The highest lag, or `0.0` if nothing was measured yet.
+
+        """
+
+        return max((lag_ms for _, lag_ms in self.samples), default=0.0)
+
+
+    async def _measure(self) -> None:
+
+        """
+
+        Sleeps for the interval in a loop and records how late each wake-up is.
+
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+
+            self.lag_ms = max(0.0, (now - start - self.interval) * 1000)
+            self.samples.append((now, self.lag_ms))
+            while self.samples[0][0] < now - self.window:
+                self.samples.popleft()
@@ -0,0 +1,108 @@
+from typing import Union
+
+
+class Gauge:
+
+    """
+
+    Value that can go up and down, in the style of Prometheus gauges (e.g., requests in flight).
+
+    Gauges are only updated from the event loop, so they need no lock.
+
+
+    Usage
+    -----
+    ```python
+    gauge = Gauge()
+    gauge.inc()
+    gauge.dec()
+    gauge.value
+    ```
+
+    """
+
+    def __init__(self) -> None:
+
+        """
+
+        Constructor for the Gauge class.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value = 0
+
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+
+        """
+
+        Increments the gauge.
+
+
+        Parameters
+        ----------
+        amount : int or float, optional
+            The increment. The default value is `1`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value += amount
+
+
+    def dec(self, amount: Union[int, float] = 1) -> None:
+
+        """
+
+        Decrements the gauge.
+
+
+        Parameters
+        ----------
+        amount : int or float, optional
+            The decrement. The default value is `1`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value -= amount
+
+
+    def set(self, value: Union[int, float]) -> None:
+
+        """
+
+        Sets the gauge.
+
+
+        Parameters
+        ----------
+        value : int or float
+            The new value.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value = value
@@ -0,0 +1,109 @@
+from bisect import bisect_left
+from typing import Union
+
+
+class Histogram:
+
+    """
+
+    Fixed-bucket cumulative histogram, in the style of Prometheus histograms.
+
+    Each observation is counted in the first bucket whose upper bound is greater than or equal
+    to the observed value. Observations above the last bound are only reflected in the total count.
+
+
+    Usage
+    -----
+    ```python
+    histogram = Histogram(buckets=(100, 500, 1000))
+    histogram.observe(420)
+    histogram.snapshot()
+    ```
+
+    """
+
+    def __init__(self, buckets: tuple[Union[int, float], ...]) -> None:
+
+        """
+
+        Constructor for the Histogram class.
+
+
+        Parameters
+        ----------
+        buckets : tuple
+            Strictly increasing upper bounds of the buckets.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(buckets, tuple) or not buckets or not all(isinstance(bound, (int, float)) for bound in buckets):
+            raise TypeError(f"buckets must be a non-empty tuple of numbers. Received: {buckets} with type {type(buckets)}")
+        if any(lower >= upper for lower, upper in zip(buckets, buckets[1:])):
+            raise ValueError(f"buckets must be strictly increasing. Received: {buckets}")
+
+
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+
+    def observe(self, value: Union[int, float]) -> None:
+
+        """
+
+        Records a single observation.
+
+
+        Parameters
+        ----------
+        value : int or float
+            The observed value.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        index = bisect_left(self.buckets, value)
+        if index < len(self.bucket_counts):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+    def snapshot(self) -> dict[str, Union[int, float, dict[str, int]]]:
+
+        """
+
+        Returns the cumulative bucket counts, the total count, and the sum of observations.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        snapshot : dict
+            The histogram state, with cumulative counts keyed by bucket upper bound and `+Inf`.
+
+        """
+
+        cumulative_counts = {}
+        running_total = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            running_total += bucket_count
+            cumulative_counts[str(bound)] = running_total
+        cumulative_counts["+Inf"] = self.count
+
+
+        return {"buckets": cumulative_counts, "count": self.count, "sum": self.sum}
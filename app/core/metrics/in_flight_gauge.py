@@ -0,0 +1,78 @@
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+
+class InFlightGauge:
+
+    """
+
+    Gauge of the calls of coroutine functions that are currently running (e.g., LLM calls).
+
+    The count is only updated from the event loop, so it needs no lock.
+
+
+    Usage
+    -----
+    ```python
+    llm_calls_in_flight = InFlightGauge()
+    extract = llm_calls_in_flight.track(extract_insight)
+    llm_calls_in_flight.value
+    ```
+
+    """
+
+    def __init__(self) -> None:
+
+        """
+
+        Constructor for the In-Flight Gauge.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.value = 0
+
+
+    def track(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+
+        """
+
+        Wraps a coroutine function so that its running calls are counted.
+
+
+        Parameters
+        ----------
+        func : Callable
+            The coroutine function to track.
+
+
+        Returns
+        -------
+        tracked : Callable
+            The wrapped coroutine function.
+
+        """
+
+        if not isinstance(func, Callable):
+            raise TypeError(f"func must be a callable. Received: {func} with type {type(func)}")
+
+
+        @wraps(func)
+        async def tracked(*args: Any, **kwargs: Any) -> Any:
+            self.value += 1
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.value -= 1
+
+
+        return tracked
@@ -0,0 +1,174 @@
+from logging import getLogger
+from typing import Any, Iterable, Optional
+
+from starlette.responses import Response
+
+from insight_extractor_ai_agent.schemas.analysis_usage import AnalysisUsage
+
+from .metrics_registry import MetricsRegistry
+
+# Logger whose records carry the request ID (see logging_config)
+usage_logger = getLogger("IEAIA.usage")
+
+LATENCY_BUCKETS_SECONDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072, 262144, 524288, 1048576)
+RETRY_BUCKETS = (0, 1, 2, 3)
+# Metrics label of the models that are not known to the server
+OTHER_MODELS_LABEL = "other"
+
+
+class LLMUsageRecorder:
+
+    """
+
+    Records per-analysis LLM usage: logs it with the current request ID, optionally adds it to
+    the response headers, and aggregates it into per-model histograms for capacity planning,
+    exposed with the other metrics of the registry. The model name comes from the request, so
+    only known models get a label of their own; the others share one label.
+
+
+    Usage
+    -----
+    ```python
+    recorder = LLMUsageRecorder(expose_headers=True, known_models=["openai:gpt-4o"])
+    await extract_insight(..., usage_callback=partial(recorder.record, response=response))
+    recorder.snapshot()
+    ```
+
+    """
+
+    def __init__(self, expose_headers: bool = False, metrics: Optional[MetricsRegistry] = None, known_models: Optional[Iterable[str]] = None) -> None:
+
+        """
+
+        Constructor for the LLM Usage Recorder.
+
+
+        Parameters
+        ----------
+        expose_headers : bool, optional
+            Whether to add the usage to the response headers. The default value is `False`.
+
+        metrics : MetricsRegistry, optional
+            The registry of the histograms. The default value is `None`.
+            If `None`, the histograms are kept in a registry of their own.
+
+        known_models : Iterable[str], optional
+            The "provider:model" names labelled as themselves; the others are labelled `"other"`. The default value is `None`.
+            If `None`, every model is labelled as itself.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(expose_headers, bool):
+            raise TypeError(f"expose_headers must be a boolean. Received: {expose_headers} with type {type(expose_headers)}")
+        if metrics is not None and not isinstance(metrics, MetricsRegistry):
+            raise TypeError(f"metrics must be a MetricsRegistry instance. Received: {metrics} with type {type(metrics)}")
+        if known_models is not None and (isinstance(known_models, str) or not isinstance(known_models, Iterable)):
+            raise TypeError(f"known_models must be an iterable of strings. Received: {known_models} with type {type(known_models)}")
+
+
+        self.expose_headers = expose_headers
+        # Label series are never removed, so names sent by clients must not create them
+        self.known_models = frozenset(known_models) if known_models is not None else None
+        metrics = metrics if metrics is not None else MetricsRegistry()
+        self.histograms = {
+            "input_tokens": metrics.histogram("llm_input_tokens", "Input tokens of an analysis.", TOKEN_BUCKETS, labelnames=("model",)),
+            "output_tokens": metrics.histogram("llm_output_tokens", "Output tokens of an analysis.", TOKEN_BUCKETS, labelnames=("model",)),
+            "retries": metrics.histogram("llm_retries", "Retried model requests of an analysis.", RETRY_BUCKETS, labelnames=("model",)),
+            "provider_latency_seconds": metrics.histogram("llm_provider_latency_seconds", "Time spent in model requests during an analysis.", LATENCY_BUCKETS_SECONDS, labelnames=("model",)),
+            "time_to_first_token_seconds": metrics.histogram("llm_time_to_first_token_seconds", "Time to the first streamed token of an analysis.", LATENCY_BUCKETS_SECONDS, labelnames=("model",)),
+        }
+        # Failed analyses are also in the histograms, with the usage spent before they failed
+        self.failures = metrics.counter("llm_failed_analyses_total", "Analyses that failed (e.g., out of output retries, or a provider error).", labelnames=("model",))
+
+
+    def record(self, usage: AnalysisUsage, response: Optional[Response] = None) -> None:
+
+        """
+
+        Records the usage of a single analysis.
+
+
+        Parameters
+        ----------
+        usage : AnalysisUsage
+            The usage reported by `extract_insight`.
+
+        response : Response, optional
+            The response to add the usage headers to. The default value is `None`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(usage, AnalysisUsage):
+            raise TypeError(f"usage must be an AnalysisUsage instance. Received: {usage} with type {type(usage)}")
+
+
+        usage_logger.info(
+            "LLM usage: model=%s input_tokens=%d output_tokens=%d requests=%d retries=%d provider_latency_ms=%.2f time_to_first_token_ms=%s failed=%s",
+            usage.model_name,
+            usage.input_tokens,
+            usage.output_tokens,
+            usage.requests,
+            usage.retries,
+            usage.provider_latency_ms,
+            f"{usage.time_to_first_token_ms:.2f}" if usage.time_to_first_token_ms is not None else "n/a",
+            usage.failed,
+            extra={"llm_usage": usage.model_dump()}
+        )
+
+        label = usage.model_name if self.known_models is None or usage.model_name in self.known_models else OTHER_MODELS_LABEL
+        self.histograms["input_tokens"].labels(label).observe(usage.input_tokens)
+        self.histograms["output_tokens"].labels(label).observe(usage.output_tokens)
+        self.histograms["retries"].labels(label).observe(usage.retries)
+        self.histograms["provider_latency_seconds"].labels(label).observe(usage.provider_latency_ms / 1000)
+        if usage.time_to_first_token_ms is not None:
+            self.histograms["time_to_first_token_seconds"].labels(label).observe(usage.time_to_first_token_ms / 1000)
+        if usage.failed:
+            self.failures.labels(label).inc()
+
+        if self.expose_headers and response is not None:
+            response.headers["x-llm-input-tokens"] = str(usage.input_tokens)
+            response.headers["x-llm-output-tokens"] = str(usage.output_tokens)
+            response.headers["x-llm-requests"] = str(usage.requests)
+            response.headers["x-llm-retries"] = str(usage.retries)
+            response.headers["x-llm-latency-ms"] = f"{usage.provider_latency_ms:.2f}"
+            if usage.time_to_first_token_ms is not None:
+                response.headers["x-llm-ttft-ms"] = f"{usage.time_to_first_token_ms:.2f}"
+
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+
+        """
+
+        Returns the aggregated histograms, keyed by model label (the model name, or `"other"`) and metric.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        snapshot : dict
+            The histogram snapshots per model and metric.
+
+        """
+
+        snapshot: dict[str, dict[str, dict[str, Any]]] = {}
+        for metric, family in self.histograms.items():
+            for (model_name,), histogram in family.children.items():
+                snapshot.setdefault(model_name, {})[metric] = histogram.snapshot()
+
+
+        return snapshot
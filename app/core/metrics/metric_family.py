@@ -0,0 +1,171 @@
+import re
+from typing import Any, Callable, Optional, Union
+
+METRIC_NAME_PATTERN = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+LABEL_NAME_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+class MetricFamily:
+
+    """
+
+    A named metric and its children, one per combination of label values.
+
+    Children are created on first use by `factory` (e.g., `Counter`, `Gauge`, or a `Histogram`).
+    Alternatively, `function` reads the values of metrics that are kept elsewhere (e.g., the size
+    of a cache) when the family is collected.
+
+
+    Usage
+    -----
+    ```python
+    requests = MetricFamily("requests_total", "Requests served.", "counter", labelnames=("route",), factory=Counter)
+    requests.labels("/api/v1/analyze-document").inc()
+    requests.collect()
+    ```
+
+    """
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 metric_type: str,
+                 labelnames: tuple[str, ...] = (),
+                 factory: Optional[Callable[[], Any]] = None,
+                 function: Optional[Callable[[], dict[tuple[str, ...], Union[int, float]]]] = None,
+                 aggregation: str = "sum") -> None:
+
+        """
+
+        Constructor for the Metric Family.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name, e.g., `http_request_duration_seconds`.
+
+        documentation : str
+            The help text of the metric.
+
+        metric_type : str
+            The metric type.
+                The options are:
+                    `"counter"`
+                    `"gauge"`
+                    `"histogram"`
+
+        labelnames : tuple, optional
+            The names of the labels. The default value is `()`.
+
+        factory : Callable, optional
+            Creates the child of a new combination of label values. The default value is `None`.
+
+        function : Callable, optional
+            Returns the current values keyed by their label values. The default value is `None`.
+            Exactly one of `factory` and `function` must be given.
+
+        aggregation : str, optional
+            How the gauge values of several workers are combined. The default value is `"sum"`.
+                The options are:
+                    `"sum"`
+                    `"max"`
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(name, str) or not METRIC_NAME_PATTERN.match(name):
+            raise ValueError(f"name must be a valid metric name. Received: {name} with type {type(name)}")
+        if not isinstance(documentation, str):
+            raise TypeError(f"documentation must be a string. Received: {documentation} with type {type(documentation)}")
+        if metric_type not in {"counter", "gauge", "histogram"}:
+            raise ValueError(f"Invalid metric_type: {metric_type}. Must be one of: counter, gauge, histogram")
+        if not isinstance(labelnames, tuple) or not all(isinstance(label, str) and LABEL_NAME_PATTERN.match(label) and label != "le" for label in labelnames):
+            raise ValueError(f"labelnames must be a tuple of valid label names. Received: {labelnames} with type {type(labelnames)}")
+        if (factory is None) == (function is None):
+            raise ValueError("Exactly one of factory and function must be given.")
+        if aggregation not in {"sum", "max"}:
+            raise ValueError(f"Invalid aggregation: {aggregation}. Must be one of: sum, max")
+
+
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = labelnames
+        self.factory = factory
+        self.function = function
+        self.aggregation = aggregation
+        self.children: dict[tuple[str, ...], Any] = {}
+
+
+    def labels(self, *labelvalues: str) -> Any:
+
+        """
+
+        Returns the child of the given label values, creating it on first use.
+
+
+        Parameters
+        ----------
+        *labelvalues : str
+            The label values, in the order of `labelnames`.
+
+
+        Returns
+        -------
+        child : Any
+            The counter, gauge, or histogram of the label values.
+
+        """
+
+        child = self.children.get(labelvalues)
+        if child is None:
+            if self.factory is None:
+                raise ValueError(f"The values of {self.name} are read from its function.")
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects the labels {self.labelnames}. Received: {labelvalues}")
+            child = self.children[labelvalues] = self.factory()
+
+
+        return child
+
+
+    def collect(self) -> dict[str, Any]:
+
+        """
+
+        Returns the current state of the family, in a JSON-serialisable form.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        collected : dict
+            The type, help text, label names, aggregation, and the `[label values, value]` samples.
+            Histogram values are their snapshots.
+
+        """
+
+        if self.function is not None:
+            samples = [[list(labelvalues), value] for labelvalues, value in self.function().items()]
+        elif self.metric_type == "histogram":
+            samples = [[list(labelvalues), child.snapshot()] for labelvalues, child in self.children.items()]
+        else:
+            samples = [[list(labelvalues), child.value] for labelvalues, child in self.children.items()]
+
+
+        return {
+            "type": self.metric_type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "aggregation": self.aggregation,
+            "samples": samples,
+        }
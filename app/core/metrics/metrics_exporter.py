@@ -0,0 +1,303 @@
+import asyncio
+from contextlib import suppress
+import glob
+import json
+from logging import getLogger
+import os
+from typing import Any, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .metrics_registry import MetricsRegistry
+
+logger = getLogger(__name__)
+
+
+class MetricsExporter:
+
+    """
+
+    Exposes the metrics of a registry, combined across the workers of the pre-forking server.
+
+    Without a directory, the exposition only covers the current worker. With one, every worker
+    periodically writes its own metrics to `<directory>/<pid>.json` (a single writer per file, so
+    no lock is needed), and the exposition adds up the files of all the workers: counters and
+    histograms of every worker that ever ran, and the gauges of the workers still alive, summed or
+    maximised as their family declares. The files of a worker may be up to `flush_interval`
+    seconds old; the worker serving the scrape reports its current values.
+
+    The directory must be emptied before the server starts (see `server.py`).
+
+
+    Usage
+    -----
+    ```python
+    exporter = MetricsExporter(metrics, directory="/tmp/metrics")
+    exporter.start()  # From a running event loop, e.g., the lifespan
+    text = await exporter.expose()
+    await exporter.stop()
+    ```
+
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: Optional[str] = None, flush_interval: float = 5.0) -> None:
+
+        """
+
+        Constructor for the Metrics Exporter.
+
+
+        Parameters
+        ----------
+        registry : MetricsRegistry
+            The metrics of the current worker.
+
+        directory : str, optional
+            The directory shared by the workers. The default value is `None`.
+            If `None`, only the current worker is exposed.
+
+        flush_interval : float, optional
+            Seconds between two writes of the metrics of the worker. The default value is `5.0`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(registry, MetricsRegistry):
+            raise TypeError(f"registry must be a MetricsRegistry instance. Received: {registry} with type {type(registry)}")
+        if directory is not None and not isinstance(directory, str):
+            raise TypeError(f"directory must be a string. Received: {directory} with type {type(directory)}")
+        if not isinstance(flush_interval, (int, float)) or flush_interval <= 0:
+            raise ValueError(f"flush_interval must be a positive number. Received: {flush_interval} with type {type(flush_interval)}")
+
+
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.task: Optional[asyncio.Task] = None
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts writing the metrics of the worker to the directory, if any.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.directory is None or self.task is not None:
+            return
+
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+
+    async def stop(self) -> None:
+
+        """
+
+        Stops the periodic writes, and writes the final metrics of the worker.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.task is None:
+            return
+
+
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self.task = None
+        await self.flush()
+
+
+    async def flush(self) -> None:
+
+        """
+
+        Writes the metrics of the worker to the directory, off the event loop.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.directory is None:
+            return
+
+
+        # Collected on the event loop, which is the only thread updating the metrics
+        collected = self.registry.collect()
+        await run_in_threadpool(self._write, collected)
+
+
+    async def expose(self) -> str:
+
+        """
+
+        Returns the metrics in the Prometheus text exposition format.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        text : str
+            The metrics of the current worker, or of all the workers if a directory is set.
+
+        """
+
+        collected = self.registry.collect()
+        if self.directory is None:
+            return self.registry.render(collected)
+
+
+        return await run_in_threadpool(self._merge_and_render, collected)
+
+
+    async def _flush_periodically(self) -> None:
+
+        """
+
+        Writes the metrics of the worker every flush interval.
+
+        """
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.warning("Could not write the metrics of worker %d: %s", os.getpid(), e)
+
+
+    def _write(self, collected: dict[str, dict[str, Any]]) -> None:
+
+        """
+
+        Atomically replaces the file of the worker with its collected metrics.
+
+        """
+
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(collected, f, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+
+    def _merge_and_render(self, collected: dict[str, dict[str, Any]]) -> str:
+
+        """
+
+        Writes the metrics of the worker, then adds up the files of all the workers and renders them.
+
+        """
+
+        self._write(collected)
+
+        merged: dict[str, dict[str, Any]] = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            pid = int(os.path.splitext(os.path.basename(path))[0])
+            if pid == os.getpid():
+                worker_metrics = collected
+            else:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        worker_metrics = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning("Skipping the metrics of worker %d: %s", pid, e)
+                    continue
+            alive = pid == os.getpid() or _is_alive(pid)
+
+            for name, family in worker_metrics.items():
+                merged_family = merged.setdefault(name, {**family, "samples": {}})
+                # The gauges of stopped workers no longer describe anything
+                if family["type"] == "gauge" and not alive:
+                    continue
+                for labelvalues, value in family["samples"]:
+                    key = tuple(labelvalues)
+                    merged_family["samples"][key] = _merge_value(family, merged_family["samples"].get(key), value)
+
+        for family in merged.values():
+            family["samples"] = [[list(labelvalues), value] for labelvalues, value in family["samples"].items()]
+
+
+        return self.registry.render(merged)
+
+
+def _is_alive(pid: int) -> bool:
+
+    """
+
+    Whether a process with the given PID is running.
+
+    """
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+    return True
+
+
+def _merge_value(family: dict[str, Any], merged: Any, value: Any) -> Any:
+
+    """
+
+    Combines the value of a sample with the value merged so far, according to the type of the family.
+
+    """
+
+    if merged is None:
+        return value
+
+    if family["type"] == "histogram":
+        return {
+            "buckets": {bound: merged["buckets"].get(bound, 0) + count for bound, count in value["buckets"].items()},
+            "count": merged["count"] + value["count"],
+            "sum": merged["sum"] + value["sum"],
+        }
+
+    if family["type"] == "gauge" and family["aggregation"] == "max":
+        return max(merged, value)
+
+
+    return merged + value
@@ -0,0 +1,317 @@
+from functools import partial
+from typing import Any, Callable, Union
+
+from .counter import Counter
+from .gauge import Gauge
+from .histogram import Histogram
+from .metric_family import MetricFamily
+
+
+class MetricsRegistry:
+
+    """
+
+    Registry of the metrics of the process, rendered in the Prometheus text exposition format.
+
+    Metrics are plain counters, gauges, and fixed-bucket histograms that are only updated from the
+    event loop, so recording a value takes no lock. Each worker keeps its own registry; the
+    `MetricsExporter` combines the registries of the workers of the pre-forking server.
+
+    Registering a metric that already exists returns the existing family, so that components
+    built more than once (e.g., middlewares) share their metrics.
+
+
+    Usage
+    -----
+    ```python
+    metrics = MetricsRegistry()
+    requests = metrics.counter("requests_total", "Requests served.", labelnames=("route",))
+    requests.labels("/api/v1/analyze-document").inc()
+    MetricsRegistry.render(metrics.collect())
+    ```
+
+    """
+
+    def __init__(self) -> None:
+
+        """
+
+        Constructor for the Metrics Registry.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.families: dict[str, MetricFamily] = {}
+
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+
+        """
+
+        Registers a counter.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name, ending in `_total` by convention.
+
+        documentation : str
+            The help text of the metric.
+
+        labelnames : tuple, optional
+            The names of the labels. The default value is `()`.
+
+
+        Returns
+        -------
+        family : MetricFamily
+            The family of counters.
+
+        """
+
+        return self._register(MetricFamily(name, documentation, "counter", labelnames, factory=Counter))
+
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), aggregation: str = "sum") -> MetricFamily:
+
+        """
+
+        Registers a gauge.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name.
+
+        documentation : str
+            The help text of the metric.
+
+        labelnames : tuple, optional
+            The names of the labels. The default value is `()`.
+
+        aggregation : str, optional
+            How the values of several workers are combined (`"sum"` or `"max"`). The default value is `"sum"`.
+
+
+        Returns
+        -------
+        family : MetricFamily
+            The family of gauges.
+
+        """
+
+        return self._register(MetricFamily(name, documentation, "gauge", labelnames, factory=Gauge, aggregation=aggregation))
+
+
+    def histogram(self, name: str, documentation: str, buckets: tuple[Union[int, float], ...], labelnames: tuple[str, ...] = ()) -> MetricFamily:
+
+        """
+
+        Registers a histogram.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name, ending in its unit by convention (e.g., `_seconds`, `_bytes`).
+
+        documentation : str
+            The help text of the metric.
+
+        buckets : tuple
+            Strictly increasing upper bounds of the buckets.
+
+        labelnames : tuple, optional
+            The names of the labels. The default value is `()`.
+
+
+        Returns
+        -------
+        family : MetricFamily
+            The family of histograms.
+
+        """
+
+        # Validates the buckets once, rather than on the first observation
+        Histogram(buckets)
+
+
+        return self._register(MetricFamily(name, documentation, "histogram", labelnames, factory=partial(Histogram, buckets)))
+
+
+    def function(self,
+                 name: str,
+                 documentation: str,
+                 metric_type: str,
+                 function: Callable[[], dict[tuple[str, ...], Union[int, float]]],
+                 labelnames: tuple[str, ...] = (),
+                 aggregation: str = "sum") -> MetricFamily:
+
+        """
+
+        Registers a counter or gauge whose values are read from `function` when collected.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name.
+
+        documentation : str
+            The help text of the metric.
+
+        metric_type : str
+            The metric type (`"counter"` or `"gauge"`).
+
+        function : Callable
+            Returns the current values keyed by their label values, e.g., `{(): 3}` without labels.
+
+        labelnames : tuple, optional
+            The names of the labels. The default value is `()`.
+
+        aggregation : str, optional
+            How the gauge values of several workers are combined (`"sum"` or `"max"`). The default value is `"sum"`.
+
+
+        Returns
+        -------
+        family : MetricFamily
+            The family.
+
+        """
+
+        if metric_type == "histogram":
+            raise ValueError("Histograms cannot be read from a function.")
+
+
+        return self._register(MetricFamily(name, documentation, metric_type, labelnames, function=function, aggregation=aggregation))
+
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+
+        """
+
+        Adds a family, or returns the registered family of the same name.
+
+        """
+
+        registered = self.families.get(family.name)
+        if registered is None:
+            self.families[family.name] = family
+            return family
+
+        if (registered.metric_type, registered.labelnames) != (family.metric_type, family.labelnames):
+            raise ValueError(f"{family.name} is already registered as a {registered.metric_type} with the labels {registered.labelnames}.")
+
+
+        return registered
+
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+
+        """
+
+        Returns the current state of every metric, in a JSON-serialisable form.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        collected : dict
+            The state of each family, keyed by metric name.
+
+        """
+
+        return {name: family.collect() for name, family in self.families.items()}
+
+
+    @staticmethod
+    def render(collected: dict[str, dict[str, Any]]) -> str:
+
+        """
+
+        Renders collected metrics in the Prometheus text exposition format (version 0.0.4).
+
+
+        Parameters
+        ----------
+        collected : dict
+            The metrics, as returned by `collect`.
+
+
+        Returns
+        -------
+        text : str
+            The exposition.
+
+        """
+
+        lines = []
+        for name, family in collected.items():
+            lines.append(f"# HELP {name} {_escape(family['help'], quote=False)}")
+            lines.append(f"# TYPE {name} {family['type']}")
+
+            for labelvalues, value in family["samples"]:
+                labels = [f'{label}="{_escape(labelvalue)}"' for label, labelvalue in zip(family["labelnames"], labelvalues)]
+                if family["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+
+                for bound, count in value["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels(labels + [f'le="{bound}"'])} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(text: str, quote: bool = True) -> str:
+
+    """
+
+    Escapes a help text, or a label value if `quote` is set.
+
+    """
+
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+    return text.replace('"', '\\"') if quote else text
+
+
+def _format_labels(labels: list[str]) -> str:
+
+    """
+
+    Formats `name="value"` pairs as the label set of a sample.
+
+    """
+
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _format_value(value: Union[int, float]) -> str:
+
+    """
+
+    Formats a sample value, keeping integers as such.
+
+    """
+
+    return str(value) if isinstance(value, int) else repr(float(value))
@@ -0,0 +1,76 @@
+from .metrics_registry import MetricsRegistry
+
+PARSE_DURATION_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+FILE_SIZE_BUCKETS_BYTES = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+class ParseMetricsRecorder:
+
+    """
+
+    Records the parse time and the size of the uploaded files, per file extension.
+
+
+    Usage
+    -----
+    ```python
+    recorder = ParseMetricsRecorder(metrics)
+    file_parser = FileParser(parse_callback=recorder.record)
+    ```
+
+    """
+
+    def __init__(self, metrics: MetricsRegistry) -> None:
+
+        """
+
+        Constructor for the Parse Metrics Recorder.
+
+
+        Parameters
+        ----------
+        metrics : MetricsRegistry
+            The registry of the histograms.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(metrics, MetricsRegistry):
+            raise TypeError(f"metrics must be a MetricsRegistry instance. Received: {metrics} with type {type(metrics)}")
+
+
+        self.duration = metrics.histogram("document_parse_duration_seconds", "Time to extract the text of an uploaded file.", PARSE_DURATION_BUCKETS_SECONDS, labelnames=("extension",))
+        self.size = metrics.histogram("document_parse_bytes", "Size of the parsed files.", FILE_SIZE_BUCKETS_BYTES, labelnames=("extension",))
+
+
+    def record(self, extension: str, size: int, duration: float) -> None:
+
+        """
+
+        Records the parsing of a single file.
+
+
+        Parameters
+        ----------
+        extension : str
+            The extension of the file, e.g., `.pdf`.
+
+        size : int
+            The size of the file in bytes.
+
+        duration : float
+            The parse time in seconds.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.duration.labels(extension).observe(duration)
+        self.size.labels(extension).observe(size)
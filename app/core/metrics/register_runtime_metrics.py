@@ -0,0 +1,128 @@
+from typing import Any, Callable, Optional
+
+from anyio.to_thread import current_default_thread_limiter
+
+from ..rate_limit.memory_token_bucket_storage import MemoryTokenBucketStorage
+from .event_loop_monitor import EventLoopMonitor
+from .in_flight_gauge import InFlightGauge
+from .metrics_registry import MetricsRegistry
+
+
+def register_runtime_metrics(registry: MetricsRegistry,
+                             event_loop_monitor: EventLoopMonitor,
+                             llm_calls_in_flight: InFlightGauge,
+                             caches: dict[str, Callable[[], Any]],
+                             rate_limit_storage: Optional[MemoryTokenBucketStorage] = None) -> None:
+
+    """
+
+    Registers the metrics read from the state the worker already keeps: the event-loop lag, the
+    thread pool, the LLM calls in flight, the hits and misses of the caches, and the memory of the
+    in-process rate limits.
+
+    Hit ratios are left to the queries (e.g., `rate(cache_hits_total[5m]) / (rate(cache_hits_total[5m]) + rate(cache_misses_total[5m]))`),
+    as ratios cannot be added up across workers.
+
+
+    Parameters
+    ----------
+    registry : MetricsRegistry
+        The registry of the worker.
+
+    event_loop_monitor : EventLoopMonitor
+        The monitor measuring the event-loop lag.
+
+    llm_calls_in_flight : InFlightGauge
+        The gauge of the running LLM calls.
+
+    caches : dict
+        The `cache_info` function of each cache, keyed by cache name. Cache infos have `hits`, `misses`, and `currsize` attributes, as those of `functools.cache`.
+
+
+    rate_limit_storage : MemoryTokenBucketStorage, optional
+        The in-process storage of the rate limits. The default value is `None`.
+        If `None` (e.g., with Redis), its metrics are not registered.
+
+
+    Returns
+    -------
+    None.
+
+    """
+
+    if not isinstance(registry, MetricsRegistry):
+        raise TypeError(f"registry must be a MetricsRegistry instance. Received: {registry} with type {type(registry)}")
+    if not isinstance(caches, dict) or not all(isinstance(cache_info, Callable) for cache_info in caches.values()):
+        raise TypeError(f"caches must be a dictionary of callables. Received: {caches} with type {type(caches)}")
+    if rate_limit_storage is not None and not isinstance(rate_limit_storage, MemoryTokenBucketStorage):
+        raise TypeError(f"rate_limit_storage must be a MemoryTokenBucketStorage instance. Received: {rate_limit_storage} with type {type(rate_limit_storage)}")
+
+
+    registry.function(
+        "event_loop_lag_seconds",
+        "Highest event-loop lag within the window of the event loop monitor.",
+        "gauge",
+        lambda: {(): event_loop_monitor.max_lag_ms() / 1000},
+        aggregation="max"
+    )
+    registry.function(
+        "executor_threads_busy",
+        "Threads of the run_in_threadpool pool running a call.",
+        "gauge",
+        lambda: {(): current_default_thread_limiter().statistics().borrowed_tokens}
+    )
+    registry.function(
+        "executor_queue_depth",
+        "Calls waiting for a thread of the run_in_threadpool pool.",
+        "gauge",
+        lambda: {(): current_default_thread_limiter().statistics().tasks_waiting}
+    )
+    registry.function(
+        "llm_calls_in_flight",
+        "LLM calls currently running.",
+        "gauge",
+        lambda: {(): llm_calls_in_flight.value}
+    )
+
+    registry.function(
+        "cache_hits_total",
+        "Lookups answered by the cache.",
+        "counter",
+        lambda: {(name,): cache_info().hits for name, cache_info in caches.items()},
+        labelnames=("cache",)
+    )
+    registry.function(
+        "cache_misses_total",
+        "Lookups not answered by the cache.",
+        "counter",
+        lambda: {(name,): cache_info().misses for name, cache_info in caches.items()},
+        labelnames=("cache",)
+    )
+    registry.function(
+        "cache_entries",
+        "Entries held by the cache.",
+        "gauge",
+        lambda: {(name,): cache_info().currsize for name, cache_info in caches.items()},
+        labelnames=("cache",)
+    )
+
+    if rate_limit_storage is not None:
+        registry.function(
+            "rate_limit_buckets",
+            "Rate limit buckets held in memory.",
+            "gauge",
+            lambda: {(): rate_limit_storage.cache_info().currsize}
+        )
+        registry.function(
+            "rate_limit_buckets_memory_bytes",
+            "Estimated memory held by the rate limit buckets.",
+            "gauge",
+            lambda: {(): rate_limit_storage.memory_usage()}
+        )
+        registry.function(
+            "rate_limit_buckets_evicted_total",
+            "Rate limit buckets dropped, once full again (expired) or over the maximum number of keys (capacity).",
+            "counter",
+            lambda: {("expired",): rate_limit_storage.expired, ("capacity",): rate_limit_storage.evicted},
+            labelnames=("reason",)
+        )
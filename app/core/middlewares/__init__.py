@@ -13,4 +13,8 @@ from .x_frame_options_middleware import XFrameOptionsMiddleware
 from .x_xss_protection_middleware import XXSSProtectionMiddleware
 from .origin_agent_cluster_middleware import OriginAgentClusterMiddleware
 from .no_cache_middleware import NoCacheMiddleware
-from .x_dns_prefetch_control_middleware import XDNSPrefetchControlMiddleware
\ No newline at end of file
+from .x_dns_prefetch_control_middleware import XDNSPrefetchControlMiddleware
+from .security_headers_middleware import SecurityHeadersMiddleware
+from .static_fast_lane_middleware import StaticFastLaneMiddleware
+from .compression_middleware import CompressionMiddleware
+from .metrics_middleware import MetricsMiddleware
\ No newline at end of file
@@ -1,8 +1,11 @@
 from logging import getLogger
 import time
+from typing import Optional
 
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from ..logging.access_log_sampler import AccessLogSampler
+
 # Custom access logger for the application
 app_access_logger = getLogger("IEAIA.access")
 
@@ -19,16 +22,26 @@ class AccessLogMiddleware:
     
     Note that the Logging for the WebSocket requests are implemented but not critically tested.
 
+    Under high load, the HTTP requests can be sampled: errors and slow requests are always
+    logged, the others at `sample_rate`, lowered to log about `target_rps` per second, and a
+    summary of all the requests is logged every `summary_interval` seconds (see `AccessLogSampler`).
+
     
     Usage
     -----
     ```python
     app.add_middleware(AccessLogMiddleware)
+    app.add_middleware(AccessLogMiddleware, sample_rate=0.1, target_rps=50.0)
     ```
 
     """
 
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(self,
+                 app: ASGIApp,
+                 sample_rate: float = 1.0,
+                 slow_threshold_ms: float = 1000.0,
+                 target_rps: Optional[float] = None,
+                 summary_interval: float = 60.0) -> None:
 
         """
 
@@ -40,6 +53,19 @@ class AccessLogMiddleware:
         app : ASGIApp
             The ASGI application to wrap.
 
+        sample_rate : float, optional
+            Share of the successful, fast requests that are logged. The default value is `1.0`.
+
+        slow_threshold_ms : float, optional
+            Processing time, in milliseconds, above which a request is logged even when sampling. The default value is `1000.0`.
+
+        target_rps : float, optional
+            Successful, fast requests logged per second at most. The default value is `None`.
+            If `None`, and `sample_rate` is `1.0`, every request is logged and no summary is logged.
+
+        summary_interval : float, optional
+            Seconds covered by each summary of the requests, when sampling. The default value is `60.0`.
+
 
         Returns
         -------
@@ -48,6 +74,12 @@ class AccessLogMiddleware:
         """
 
         self.app = app
+        self.sampler = AccessLogSampler(
+            sample_rate=sample_rate,
+            slow_threshold_ms=slow_threshold_ms,
+            target_rps=target_rps,
+            summary_interval=summary_interval
+        ) if sample_rate < 1 or target_rps is not None else None
 
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -89,10 +121,7 @@ class AccessLogMiddleware:
 
         if scope["type"] == "websocket":
             # Log WebSocket connection handshake
-            app_access_logger.info(
-                f"{client[0]}:{client[1]} - "
-                f"'WebSocket CONNECT {path_with_query}'"
-            )
+            app_access_logger.info("%s:%s - 'WebSocket CONNECT %s'", client[0], client[1], path_with_query)
             await self.app(scope, receive, send)
             return
 
@@ -100,14 +129,36 @@ class AccessLogMiddleware:
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
                 process_time = (time.time() - start_time) * 1000
+                logged, sample_rate = self.sampler.sample(message["status"], process_time) if self.sampler is not None else (True, 1.0)
 
                 # Log the HTTP access entry
-                app_access_logger.info(
-                    f"{client[0]}:{client[1]} - "
-                    f"'{scope["method"]} {path_with_query} HTTP/{scope["http_version"]}' "
-                    f"{message["status"]}",
-                    extra={"process_time_ms": f"{process_time:.2f}"}
-                )
+                ## Formatted by the log handler thread from the arguments
+                if logged:
+                    app_access_logger.info(
+                        "%s:%s - '%s %s HTTP/%s' %d",
+                        client[0],
+                        client[1],
+                        scope["method"],
+                        path_with_query,
+                        scope["http_version"],
+                        message["status"],
+                        extra={"process_time_ms": round(process_time, 2), "sample_rate": round(sample_rate, 4)}
+                    )
+
+                # Log the summary of the sampled requests
+                summary = self.sampler.pop_summary() if self.sampler is not None else None
+                if summary is not None:
+                    app_access_logger.info(
+                        "Access summary: %d requests in %.0f s (%.2f/s), %d logged, status %s, mean %.2f ms, max %.2f ms",
+                        summary["requests"],
+                        summary["interval_s"],
+                        summary["rps"],
+                        summary["logged"],
+                        summary["status"],
+                        summary["process_time_ms_mean"],
+                        summary["process_time_ms_max"],
+                        extra={"access_summary": summary}
+                    )
 
             await send(message)
 
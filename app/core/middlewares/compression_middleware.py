@@ -0,0 +1,161 @@
+from typing import Optional
+
+from opentelemetry import trace
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...utils.content_encoding import (compress, encoded_etag,
+                                       is_compressible, negotiate_encoding)
+
+tracer = trace.get_tracer(__name__)
+
+
+class CompressionMiddleware:
+
+    """
+
+    ASGI middleware that compresses response bodies with Brotli or gzip, negotiated from the Accept-Encoding header.
+
+    Only single-message bodies of a compressible media type (e.g., JSON analysis reports) that are at
+    least `minimum_size` bytes are compressed; small bodies are not worth the CPU time, and streamed
+    responses and responses that are already encoded are passed through unchanged. A strong ETag
+    of a compressed body gets the encoding as a suffix (e.g., `"3f2b-br"`), so that it stays strong;
+    a `304 Not Modified` answering the ETag of the negotiated encoding is given that ETag back.
+
+    Note that this middleware only handles HTTP requests and is implemented in ASGI manner for consistency and to avoid silent failures.
+
+
+    Usage
+    -----
+    ```python
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    ```
+
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+
+        """
+
+        Initialize the middleware with the given ASGI application.
+
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application to wrap.
+
+        minimum_size : int, optional
+            Bodies smaller than this many bytes are not compressed. The default value is `1024`.
+
+        gzip_level : int, optional
+            The gzip compression level, from 1 to 9. The default value is `6`.
+
+        brotli_quality : int, optional
+            The Brotli quality, from 0 to 11. The default value is `4`, which compresses about as fast as gzip level 6 and smaller.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(minimum_size, int) or minimum_size < 0:
+            raise ValueError(f"minimum_size must be a non-negative integer. Received: {minimum_size} with type {type(minimum_size)}")
+
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        """
+
+        Processes the HTTP request and compresses the response body when worthwhile.
+
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope.
+
+        receive : Receive
+            Awaitable callable to receive ASGI messages.
+
+        send : Send
+            Awaitable callable to send ASGI messages.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+
+        start_message: Optional[Message] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+
+            # Hold the response start until the first body message shows whether to compress
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+
+            response_start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(response_start.get("headers", [])))
+
+            # The client revalidated the compressed representation, so the 304 describes that one
+            if response_start["status"] == 304 and "etag" in headers:
+                etag = encoded_etag(headers["etag"], encoding)
+                if etag in {candidate.strip().removeprefix("W/") for candidate in request_headers.get("if-none-match", "").split(",")}:
+                    headers["etag"] = etag
+                    headers.add_vary_header("Accept-Encoding")
+                    response_start["headers"] = headers.raw
+                await send(response_start)
+                await send(message)
+                return
+
+            if message.get("more_body", False) or len(body) < self.minimum_size or "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                await send(response_start)
+                await send(message)
+                return
+
+
+            with tracer.start_as_current_span("compress response", attributes={"http.response.content_encoding": encoding, "http.response.body.size": len(body)}) as span:
+                compressed_body = compress(body, encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality)
+                span.set_attribute("http.response.compressed_body.size", len(compressed_body))
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed_body))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["etag"] = encoded_etag(headers["etag"], encoding)
+            response_start["headers"] = headers.raw
+
+            await send(response_start)
+            await send({**message, "body": compressed_body})
+
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,112 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics.metrics_registry import MetricsRegistry
+
+REQUEST_DURATION_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class MetricsMiddleware:
+
+    """
+
+    ASGI middleware that records the latency of HTTP requests per route, and the requests in flight.
+
+    Requests are labelled with the route template (e.g., `/api/v1/analyze-document`) rather than
+    the path, so that the number of series stays bounded; requests matching no route are labelled
+    `unmatched`.
+
+
+    Usage
+    -----
+    ```python
+    app.add_middleware(MetricsMiddleware, metrics=setup.metrics)
+    ```
+
+    """
+
+    def __init__(self, app: ASGIApp, metrics: MetricsRegistry) -> None:
+
+        """
+
+        Initialize the middleware with the given ASGI application.
+
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application to wrap.
+
+        metrics : MetricsRegistry
+            The registry of the request metrics.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(metrics, MetricsRegistry):
+            raise TypeError(f"metrics must be a MetricsRegistry instance. Received: {metrics} with type {type(metrics)}")
+
+
+        self.app = app
+        self.request_duration = metrics.histogram(
+            "http_request_duration_seconds",
+            "Time from the request to the end of the response.",
+            REQUEST_DURATION_BUCKETS_SECONDS,
+            labelnames=("method", "route", "status")
+        )
+        self.requests_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests being served.").labels()
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        """
+
+        Handles the incoming request and records its latency once the response is sent.
+
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope.
+
+        receive : Receive
+            Awaitable callable to receive ASGI messages.
+
+        send : Send
+            Awaitable callable to send ASGI messages.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+
+        self.requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.requests_in_flight.dec()
+            # The route is only known once the router has matched it
+            route = (scope["route"].path or "/") if "route" in scope else "unmatched"
+            self.request_duration.labels(scope["method"], route, str(status_code)).observe(time.perf_counter() - start_time)
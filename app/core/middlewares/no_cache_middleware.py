@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 
@@ -19,12 +21,12 @@ class NoCacheMiddleware:
     Usage
     -----
     ```python
-    app.add_middleware(NoCacheMiddleware)
+    app.add_middleware(NoCacheMiddleware, exempt_paths=["/api/v1/get-available-models"])
     ```
 
     """
 
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = ()) -> None:
 
         """
 
@@ -36,6 +38,9 @@ class NoCacheMiddleware:
         app : ASGIApp
             The ASGI application to wrap.
 
+        exempt_paths : Iterable[str], optional
+            Paths of public, cacheable responses that set their own caching headers. The default value is `()`.
+
 
         Returns
         -------
@@ -44,6 +49,7 @@ class NoCacheMiddleware:
         """
 
         self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
 
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -71,7 +77,7 @@ class NoCacheMiddleware:
 
         """
 
-        if scope["type"] != "http":
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
             await self.app(scope, receive, send)
             return
         
@@ -1,10 +1,14 @@
 from uuid import uuid4
 
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
 from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from ..logging.log_context import request_id_var
 
+tracer = trace.get_tracer(__name__)
+
 
 class RequestIDMiddleware:
 
@@ -15,6 +19,7 @@ class RequestIDMiddleware:
     For HTTP requests, it sets the ID in a context variable and returns it in the response header.
     For WebSocket requests, it only sets the ID for internal tracing (no response header).
     This enables consistent tracing and correlation across logs regardless of protocol.
+    It also opens the server span of the request, under which the spans of the analysis stages are nested.
 
     Note that the Request ID for the WebSocket requests are implemented but not critically tested.
 
@@ -84,15 +89,30 @@ class RequestIDMiddleware:
         request_id = request.headers.get("x-request-id", str(uuid4()))
         token = request_id_var.set(request_id)
 
+        span = tracer.start_span(
+            f"{scope.get('method', 'WEBSOCKET')} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope.get("method", "WEBSOCKET"), "url.path": scope["path"], "request.id": request_id}
+        )
+
         async def send_wrapper(message):
             if scope["type"] == "http" and message["type"] == "http.response.start":
                 headers = dict(message.get("headers", []))
                 headers[b"x-request-id"] = request_id.encode()
                 message["headers"] = list(headers.items())
+                span.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
             await send(message)
 
 
         try:
-            await self.app(scope, receive, send_wrapper)
+            with trace.use_span(span, end_on_exit=False):
+                await self.app(scope, receive, send_wrapper)
         finally:
+            # The route is only known once the router has matched it
+            if "route" in scope:
+                span.update_name(f"{scope.get('method', 'WEBSOCKET')} {scope['route'].path}")
+                span.set_attribute("http.route", scope["route"].path)
+            span.end()
             request_id_var.reset(token)
\ No newline at end of file
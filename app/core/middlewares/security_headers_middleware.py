@@ -0,0 +1,190 @@
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers set by the no-cache option, left out for exempt paths
+_NO_CACHE_HEADERS = [
+    (b"cache-control", b"no-store, no-cache, must-revalidate, max-age=0"),
+    (b"pragma", b"no-cache"),
+    (b"expires", b"0"),
+]
+
+
+class SecurityHeadersMiddleware:
+
+    """
+
+    ASGI middleware that adds the whole set of security headers to all HTTP responses in a single pass.
+
+    It replaces the stack of one-header middlewares (Strict-Transport-Security, Content-Security-Policy,
+    X-Frame-Options, etc.). The raw header list is built once from the configuration, and on each
+    response the headers it sets are appended after dropping any existing header with the same name,
+    so each response is walked once instead of once per header. Every header can be disabled by
+    passing `None`.
+
+    Note that this middleware only handles HTTP requests and is implemented in ASGI manner for consistency and to avoid silent failures.
+
+
+    Usage
+    -----
+    ```python
+    app.add_middleware(
+        SecurityHeadersMiddleware,
+        content_security_policy="default-src 'self'",
+        cross_origin_embedder_policy=None,
+        no_cache_exempt_paths=["/api/v1/get-available-models"]
+    )
+    ```
+
+    """
+
+    def __init__(self,
+                 app: ASGIApp,
+                 strict_transport_security: Optional[str] = "max-age=63072000; includeSubDomains",
+                 x_content_type_options: Optional[str] = "nosniff",
+                 content_security_policy: Optional[str] = "default-src 'self'",
+                 permissions_policy: Optional[str] = "camera=(), microphone=(), geolocation=()",
+                 cross_origin_opener_policy: Optional[str] = "same-origin",
+                 cross_origin_resource_policy: Optional[str] = "same-origin",
+                 cross_origin_embedder_policy: Optional[str] = "require-corp",
+                 referrer_policy: Optional[str] = "strict-origin-when-cross-origin",
+                 x_frame_options: Optional[str] = "DENY",
+                 x_xss_protection: Optional[str] = "0",
+                 x_download_options: Optional[str] = "noopen",
+                 origin_agent_cluster: Optional[str] = "?1",
+                 x_dns_prefetch_control: Optional[str] = "off",
+                 no_cache: bool = True,
+                 no_cache_exempt_paths: Iterable[str] = ()) -> None:
+
+        """
+
+        Initialize the middleware with the given ASGI application and header values.
+
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application to wrap.
+
+        strict_transport_security : str, optional
+            The Strict-Transport-Security policy. The default value is `"max-age=63072000; includeSubDomains"`.
+
+        x_content_type_options : str, optional
+            The X-Content-Type-Options policy. The default value is `"nosniff"`.
+
+        content_security_policy : str, optional
+            The Content-Security-Policy. The default value is `"default-src 'self'"`.
+
+        permissions_policy : str, optional
+            The Permissions-Policy. The default value is `"camera=(), microphone=(), geolocation=()"`.
+
+        cross_origin_opener_policy : str, optional
+            The Cross-Origin-Opener-Policy. The default value is `"same-origin"`.
+
+        cross_origin_resource_policy : str, optional
+            The Cross-Origin-Resource-Policy. The default value is `"same-origin"`.
+
+        cross_origin_embedder_policy : str, optional
+            The Cross-Origin-Embedder-Policy. The default value is `"require-corp"`.
+
+        referrer_policy : str, optional
+            The Referrer-Policy. The default value is `"strict-origin-when-cross-origin"`.
+
+        x_frame_options : str, optional
+            The X-Frame-Options policy. The default value is `"DENY"`.
+
+        x_xss_protection : str, optional
+            The X-XSS-Protection policy. The default value is `"0"`.
+
+        x_download_options : str, optional
+            The X-Download-Options policy. The default value is `"noopen"`.
+
+        origin_agent_cluster : str, optional
+            The Origin-Agent-Cluster policy. The default value is `"?1"`.
+
+        x_dns_prefetch_control : str, optional
+            The X-DNS-Prefetch-Control policy. The default value is `"off"`.
+
+        no_cache : bool, optional
+            Whether to add the Cache-Control, Pragma, and Expires headers that prevent caching. The default value is `True`.
+
+        no_cache_exempt_paths : Iterable[str], optional
+            Paths of public, cacheable responses that set their own caching headers. The default value is `()`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(no_cache, bool):
+            raise TypeError(f"no_cache must be a boolean. Received: {no_cache} with type {type(no_cache)}")
+
+
+        self.app = app
+
+        policies = {
+            b"strict-transport-security": strict_transport_security,
+            b"x-content-type-options": x_content_type_options,
+            b"content-security-policy": content_security_policy,
+            b"permissions-policy": permissions_policy,
+            b"cross-origin-opener-policy": cross_origin_opener_policy,
+            b"cross-origin-resource-policy": cross_origin_resource_policy,
+            b"cross-origin-embedder-policy": cross_origin_embedder_policy,
+            b"referrer-policy": referrer_policy,
+            b"x-frame-options": x_frame_options,
+            b"x-xss-protection": x_xss_protection,
+            b"x-download-options": x_download_options,
+            b"origin-agent-cluster": origin_agent_cluster,
+            b"x-dns-prefetch-control": x_dns_prefetch_control,
+        }
+        self.security_headers = [(name, value.encode("latin-1")) for name, value in policies.items() if value is not None]
+        self.headers = self.security_headers + (_NO_CACHE_HEADERS if no_cache else [])
+        self.security_header_names = frozenset(name for name, _ in self.security_headers)
+        self.header_names = frozenset(name for name, _ in self.headers)
+        self.no_cache_exempt_paths = frozenset(no_cache_exempt_paths)
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        """
+
+        Processes the HTTP request and appends the security headers to the response.
+
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope.
+
+        receive : Receive
+            Awaitable callable to receive ASGI messages.
+
+        send : Send
+            Awaitable callable to send ASGI messages.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+
+        if scope["path"] in self.no_cache_exempt_paths:
+            headers, header_names = self.security_headers, self.security_header_names
+        else:
+            headers, header_names = self.headers, self.header_names
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [header for header in message.get("headers", []) if header[0] not in header_names] + headers
+            await send(message)
+
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,124 @@
+from typing import Iterable
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class StaticFastLaneMiddleware:
+
+    """
+
+    ASGI middleware that routes static asset requests straight to the static files application.
+
+    Requests for the configured paths skip every middleware added before this one (rate limiting,
+    access logging, request IDs, etc.), so assets are served with minimal overhead and do not count
+    against the per-IP rate limits. Successful and `304 Not Modified` responses get the configured
+    Cache-Control; the static files application provides the ETag and Last-Modified validators.
+    Misses (e.g., a missing file) fall through to the wrapped application, so errors keep the regular
+    handling and logging.
+
+    It must be added last so that it is the outermost middleware.
+
+    Note that this middleware only handles HTTP requests and is implemented in ASGI manner for consistency and to avoid silent failures.
+
+
+    Usage
+    -----
+    ```python
+    app.add_middleware(
+        StaticFastLaneMiddleware,
+        static_app=Mount("/static", app=StaticFiles(directory="app/static")),
+        path_prefixes=["/static/"],
+        cache_control="public, max-age=604800"
+    )
+    ```
+
+    """
+
+    def __init__(self,
+                 app: ASGIApp,
+                 static_app: ASGIApp,
+                 paths: Iterable[str] = (),
+                 path_prefixes: Iterable[str] = (),
+                 cache_control: str = "public, max-age=604800") -> None:
+
+        """
+
+        Initialize the middleware with the given ASGI applications and fast lane paths.
+
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application to wrap.
+
+        static_app : ASGIApp
+            The application that serves the fast lane requests.
+
+        paths : Iterable[str], optional
+            Exact paths served by the fast lane. The default value is `()`.
+
+        path_prefixes : Iterable[str], optional
+            Path prefixes served by the fast lane. The default value is `()`.
+
+        cache_control : str, optional
+            The Cache-Control of fast lane responses. The default value is `"public, max-age=604800"` (7 days).
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(cache_control, str):
+            raise TypeError(f"cache_control must be a string. Received: {cache_control} with type {type(cache_control)}")
+
+
+        self.app = app
+        self.static_app = static_app
+        self.paths = frozenset(paths)
+        self.path_prefixes = tuple(path_prefixes)
+        self.cache_control = (b"cache-control", cache_control.encode("latin-1"))
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        """
+
+        Dispatches fast lane requests to the static files application and all others to the wrapped application.
+
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope.
+
+        receive : Receive
+            Awaitable callable to receive ASGI messages.
+
+        send : Send
+            Awaitable callable to send ASGI messages.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if scope["type"] != "http" or not (scope["path"] in self.paths or scope["path"].startswith(self.path_prefixes)):
+            await self.app(scope, receive, send)
+            return
+
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                message["headers"] = [header for header in message.get("headers", []) if header[0] != b"cache-control"] + [self.cache_control]
+            await send(message)
+
+
+        try:
+            await self.static_app(scope, receive, send_wrapper)
+        except HTTPException:
+            await self.app(scope, receive, send)
@@ -0,0 +1,39 @@
+from fastapi import Request
+from slowapi.util import get_remote_address
+
+from ..exceptions.custom_http_exception import CustomHTTPException
+from ..security.auth import extract_api_key, hash_api_key
+
+
+def get_rate_limit_key(request: Request) -> str:
+
+    """
+
+    Returns the client a request is counted against: its API key, or its address if it has none.
+
+    Clients behind the same NAT or proxy thus get their own limits as soon as they send their key.
+    The key is hashed, so that it is not kept in the rate limit storage.
+
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+
+
+    Returns
+    -------
+    rate_limit_key : str
+        `key:<hash of the API key>`, or `ip:<address>` without a valid `Authorization` header.
+
+    """
+
+    authorization = request.headers.get("authorization")
+    if authorization:
+        try:
+            return f"key:{hash_api_key(extract_api_key(authorization))}"
+        except CustomHTTPException:
+            pass
+
+
+    return f"ip:{get_remote_address(request)}"
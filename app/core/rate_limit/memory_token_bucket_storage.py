@@ -0,0 +1,272 @@
+from collections import OrderedDict
+import sys
+import threading
+import time
+
+from ...utils.cache_info import CacheInfo
+
+# Bytes of a stored bucket besides its key: the tuple of its tokens, last update, and refill time, and the three floats
+BUCKET_SIZE = sys.getsizeof((0.0, 0.0, 0.0)) + 3 * sys.getsizeof(0.0)
+
+
+class MemoryTokenBucketStorage:
+
+    """
+
+    In-process storage of token buckets, keyed by limit and client.
+
+    A bucket holds up to `capacity` tokens and is refilled continuously at `refill_rate` tokens
+    per second. Only the tokens left and the time of the last update are stored; the refill is
+    computed when the bucket is next read. A missing bucket is full.
+
+    Memory is bounded, so that scans or spikes of unique addresses cannot grow it indefinitely.
+    The buckets are spread over `shards`, each with its own lock and kept in least recently
+    updated order. A bucket that is full again is the same as a missing one, so the oldest
+    buckets of a shard are dropped as soon as they are full, on its next update. Past `max_keys`
+    buckets, the least recently updated one is evicted even if not full, which hands its client
+    a full bucket again: size `max_keys` above the clients active within the longest period.
+
+
+    Usage
+    -----
+    ```python
+    storage = MemoryTokenBucketStorage(max_keys=100000)
+    allowed, tokens = storage.consume("key", capacity=10, refill_rate=10 / 60, cost=3)
+    ```
+
+    """
+
+    def __init__(self, max_keys: int = 100000, shards: int = 16) -> None:
+
+        """
+
+        Constructor for the Memory Token Bucket Storage.
+
+
+        Parameters
+        ----------
+        max_keys : int, optional
+            The most buckets kept. The default value is `100000`.
+
+        shards : int, optional
+            The number of independently locked parts the buckets are spread over. The default value is `16`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(max_keys, int) or max_keys < 1:
+            raise ValueError(f"max_keys must be a positive integer. Received: {max_keys} with type {type(max_keys)}")
+        if not isinstance(shards, int) or not 1 <= shards <= max_keys:
+            raise ValueError(f"shards must be a positive integer, at most max_keys. Received: {shards} with type {type(shards)}")
+
+
+        self.max_keys = max_keys
+        self.max_keys_per_shard = max_keys // shards
+        # Buckets of each shard: key -> (tokens, updated_at, full_at), least recently updated first
+        self.shards: list[OrderedDict[str, tuple[float, float, float]]] = [OrderedDict() for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.key_bytes = [0] * shards
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+
+    def consume(self, key: str, capacity: float, refill_rate: float, cost: float) -> tuple[bool, float]:
+
+        """
+
+        Takes `cost` tokens from a bucket, if it holds that many.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+        capacity : float
+            The most tokens the bucket holds.
+
+        refill_rate : float
+            Tokens added to the bucket per second.
+
+        cost : float
+            Tokens to take.
+
+
+        Returns
+        -------
+        allowed : bool
+            Whether the tokens were taken.
+
+        tokens : float
+            The tokens left in the bucket.
+
+        """
+
+        now = time.monotonic()
+        index = hash(key) % len(self.shards)
+        buckets = self.shards[index]
+        with self.locks[index]:
+            # Taken out and put back, so that the bucket moves to the end of the shard
+            bucket = buckets.pop(key, None)
+            if bucket is None:
+                tokens = capacity
+                self.misses += 1
+                self.key_bytes[index] += sys.getsizeof(key)
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+                self.hits += 1
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+            self._evict(index, now)
+
+
+        return allowed, tokens
+
+
+    def peek(self, key: str, capacity: float, refill_rate: float) -> float:
+
+        """
+
+        Returns the tokens in a bucket, without taking any.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+        capacity : float
+            The most tokens the bucket holds.
+
+        refill_rate : float
+            Tokens added to the bucket per second.
+
+
+        Returns
+        -------
+        tokens : float
+            The tokens in the bucket.
+
+        """
+
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            return self._refill(self.shards[index], key, capacity, refill_rate, time.monotonic())
+
+
+    def clear(self, key: str) -> None:
+
+        """
+
+        Refills a bucket.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            if self.shards[index].pop(key, None) is not None:
+                self.key_bytes[index] -= sys.getsizeof(key)
+
+
+    def cache_info(self) -> CacheInfo:
+
+        """
+
+        Returns the updates of existing buckets (hits), the buckets created (misses), the most buckets kept, and the current number of buckets.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        cache_info : CacheInfo
+            The statistics of the storage.
+
+        """
+
+        return CacheInfo(self.hits, self.misses, self.max_keys, sum(len(buckets) for buckets in self.shards))
+
+
+    def memory_usage(self) -> int:
+
+        """
+
+        Returns an estimate of the memory held by the buckets, in bytes: the tables of the shards, the keys, and the stored values.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        memory_usage : int
+            The estimated bytes.
+
+        """
+
+        return sum(sys.getsizeof(buckets) + len(buckets) * BUCKET_SIZE for buckets in self.shards) + sum(self.key_bytes)
+
+
+    def _refill(self, buckets: OrderedDict[str, tuple[float, float, float]], key: str, capacity: float, refill_rate: float, now: float) -> float:
+
+        """
+
+        Returns the tokens of a bucket at `now`; the lock of its shard must be held.
+
+        """
+
+        if key not in buckets:
+            return capacity
+
+
+        tokens, updated_at, _ = buckets[key]
+        return min(capacity, tokens + (now - updated_at) * refill_rate)
+
+
+    def _evict(self, index: int, now: float) -> None:
+
+        """
+
+        Drops the least recently updated buckets of a shard that are full again, then those over its share of `max_keys`; the lock of the shard must be held.
+
+        """
+
+        buckets = self.shards[index]
+        # Checking a couple of buckets per update keeps up with those created
+        for _ in range(2):
+            key = next(iter(buckets), None)
+            if key is None or buckets[key][2] > now:
+                break
+            del buckets[key]
+            self.key_bytes[index] -= sys.getsizeof(key)
+            self.expired += 1
+
+        while len(buckets) > self.max_keys_per_shard:
+            key, _ = buckets.popitem(last=False)
+            self.key_bytes[index] -= sys.getsizeof(key)
+            self.evicted += 1
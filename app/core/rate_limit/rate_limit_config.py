@@ -1,10 +1,12 @@
-import os
 import re
 
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from ..config.settings import settings
+from .get_rate_limit_key import get_rate_limit_key
+from .memory_token_bucket_storage import MemoryTokenBucketStorage
+from .redis_token_bucket_storage import RedisTokenBucketStorage
+from .token_bucket_rate_limiter import TokenBucketRateLimiter
 
 
 def get_limiter(default_limits: list[str] = ["50/minute", "300/hour", "1000/day"]) -> Limiter:
@@ -14,7 +16,8 @@ def get_limiter(default_limits: list[str] = ["50/minute", "300/hour", "1000/day"
     Creates and returns a Limiter instance used for rate limiting in the application.
     
     Depending on the environment configuration, this function initializes the limiter with
-    an in-memory backend or Redis backend.
+    an in-memory backend or Redis backend. Requests are counted per API key, or per address
+    without one, against token buckets.
 
     
     Parameters
@@ -42,11 +45,14 @@ def get_limiter(default_limits: list[str] = ["50/minute", "300/hour", "1000/day"
     # @limiter.limit("5/minute")
     # async def myendpoint(request: Request, response: Response)
     # return {"key": "value"}
-    if os.getenv("USE_REDIS"):
-        return Limiter(
-            key_func=get_remote_address,
-            storage_uri=settings.REDIS_URL,
-            default_limits=default_limits,
-            headers_enabled=True,
-        )
-    return Limiter(key_func=get_remote_address, default_limits=default_limits, headers_enabled=True)
\ No newline at end of file
+    limiter = Limiter(key_func=get_rate_limit_key, default_limits=default_limits, headers_enabled=True)
+    # SlowAPI only takes the strategies of `limits` by name, so the token buckets replace its fixed windows afterwards
+    if settings.USE_REDIS:
+        # Only needed with Redis
+        from redis import BlockingConnectionPool, Redis
+        ## The pool of each worker is bounded; checks wait for a free connection rather than opening more
+        client = Redis(connection_pool=BlockingConnectionPool.from_url(settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS))
+        limiter._limiter = TokenBucketRateLimiter(RedisTokenBucketStorage(client, batch_interval=settings.RATE_LIMIT_BATCH_INTERVAL_MS / 1000))
+    else:
+        limiter._limiter = TokenBucketRateLimiter(MemoryTokenBucketStorage(max_keys=settings.RATE_LIMIT_MAX_KEYS))
+    return limiter
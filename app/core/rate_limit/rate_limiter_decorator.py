@@ -1,8 +1,14 @@
 from collections.abc import Awaitable
+import functools
+import inspect
 import re
-from typing import Callable
+from typing import Callable, Optional, Union
 
+from fastapi import Depends, Request, Response
+from slowapi.errors import RateLimitExceeded
 from slowapi.extension import Limiter
+from slowapi.util import get_remote_address
+from slowapi.wrappers import LimitGroup
 
 
 class RateLimiterDecorator:
@@ -12,55 +18,76 @@ class RateLimiterDecorator:
     Class-based custom decorator that applies rate limits to FastAPI endpoints and
     stores rate limit metadata for documentation.
 
-    
+    The limits of the route replace the default limits, and may charge each request a cost
+    computed from the request (e.g., from the size of its upload). Limits per client address may
+    be kept alongside, one token per request, for routes whose key can be chosen by the client
+    (e.g., an unvalidated API key). They are checked by a dependency resolved before the other
+    dependencies of the endpoint, so a rejected request is answered before its body is read.
+
+
     Usage:
     ------
     ```
-    rate_limiter = RateLimiterDecorator(limiter)
+    rate_limiter = RateLimiterDecorator(limiter, key_func=get_rate_limit_key)
     @rate_limiter("5/minute;1/hour;100/day")
+    @rate_limiter("20/minute;300/hour", cost=lambda request: 1 + int(request.headers["content-length"]) // 1048576)
+    @rate_limiter("20/minute;300/hour", ip_limit_str="50/minute;300/hour")
     ```
 
     """
 
-    def __init__(self, limiter: Limiter) -> None:
+    def __init__(self, limiter: Limiter, key_func: Callable[[Request], str] = get_remote_address) -> None:
 
         """
 
         Constructor for the Rate Limiter Decorator class.
-        
+
 
         Parameters
         ----------
         limiter : Limiter
             An instance of SlowAPI's Limiter used to enforce rate limits.
 
-            
+        key_func : Callable, optional
+            Function returning the client a request is counted against. The default value is `get_remote_address`.
+
+
         Returns
         -------
         None.
-        
+
         """
 
         if not isinstance(limiter, Limiter):
             raise TypeError(f"limiter must be a Limiter instance. Received: {limiter} with type {type(limiter)}")
+        if not isinstance(key_func, Callable):
+            raise TypeError(f"key_func must be a callable. Received: {key_func} with type {type(key_func)}")
 
 
         self.limiter = limiter
+        self.key_func = key_func
 
 
-    def __call__(self, limit_str: str) -> Callable[[Callable], Callable[..., Awaitable]]:
+    def __call__(self, limit_str: str, cost: Union[int, Callable[[Request], int]] = 1, ip_limit_str: Optional[str] = None) -> Callable[[Callable], Callable[..., Awaitable]]:
 
         """
 
         Decorator interface that applies the rate limit and stores metadata.
 
-        
+
         Parameters
         ----------
         limit_str : str
             Rate limit string. Use semicolon to seperate multiple limits for minute, hour, and day (e.g. "5/minute;1/hour;100/day")
 
-            
+        cost : int or Callable, optional
+            The tokens a request takes from each limit, or a function of the request returning them. The default value is `1`.
+
+        ip_limit_str : str, optional
+            Rate limit string of the limits also applied per client address, whatever the key of the request. The default value is `None`.
+            Checked first, so that clients rotating keys are rejected before a bucket is created for each key.
+
+
         Returns
         -------
         rate_limiter_decorator : Callable
@@ -70,35 +97,79 @@ class RateLimiterDecorator:
 
         if not isinstance(limit_str, str) or not all(re.match(r"^\d+/(minute|hour|day)$", seg) for seg in limit_str.split(';')):
             raise TypeError(f"limit_str must be a string in the format '5/minute;1/hour;100/day'. Received: {limit_str} with type {type(limit_str)}")
+        if not isinstance(cost, (int, Callable)) or isinstance(cost, int) and cost < 1:
+            raise TypeError(f"cost must be a positive integer or a callable. Received: {cost} with type {type(cost)}")
+        if ip_limit_str is not None and (not isinstance(ip_limit_str, str) or not all(re.match(r"^\d+/(minute|hour|day)$", seg) for seg in ip_limit_str.split(';'))):
+            raise TypeError(f"ip_limit_str must be a string in the format '5/minute;1/hour;100/day'. Received: {ip_limit_str} with type {type(ip_limit_str)}")
+
+
+        limits = list(LimitGroup(limit_str, self.key_func, None, False, None, None, None, cost, True))
+        ip_limits = list(LimitGroup(ip_limit_str, get_remote_address, None, False, None, None, None, 1, True)) if ip_limit_str else []
 
 
         def _decorator(func: Callable) -> Callable:
-            
+
             """
 
             Decorator function that applies the rate limit and stores metadata.
-            
-            
+
+
             Parameters
             ----------
             func : Callable
                 The route handler to be decorated.
 
-                
+
             Returns
             -------
             wrapped : Callable
                 The decorated route handler with rate limiting and metadata.
-            
+
             """
 
-            if not isinstance(func, Callable):
-                raise TypeError(f"func must be a callable. Received: {func} with type {type(func)}")
+            if not inspect.iscoroutinefunction(func):
+                raise TypeError(f"func must be a coroutine function. Received: {func} with type {type(func)}")
+
+
+            scope = f"{func.__module__}.{func.__name__}"
+            # Kept apart from the buckets of the route limits, which requests without a key also count against their address
+            ip_scope = f"{scope}:ip"
+
+            async def check_rate_limits(request: Request, response: Response) -> None:
+                if not self.limiter.enabled:
+                    return
+
+                key = self.key_func(request)
+                request_cost = cost(request) if callable(cost) else cost
+                # The most restrictive limit is reported in the headers, unless another one is exceeded
+                request.state.view_rate_limit = (min(limit.limit for limit in limits), [key, scope])
+                ip_key = f"ip:{get_remote_address(request)}"
+                for limit in ip_limits:
+                    if not self.limiter.limiter.hit(limit.limit, ip_key, ip_scope):
+                        request.state.view_rate_limit = (limit.limit, [ip_key, ip_scope])
+                        raise RateLimitExceeded(limit)
+                for limit in limits:
+                    if not self.limiter.limiter.hit(limit.limit, key, scope, cost=request_cost):
+                        request.state.view_rate_limit = (limit.limit, [key, scope])
+                        raise RateLimitExceeded(limit)
+
+                self.limiter._inject_headers(response, request.state.view_rate_limit)
+
+            @functools.wraps(func)
+            async def wrapped(*, rate_limit_check: None = None, **kwargs) -> Response:
+                return await func(**kwargs)
+
+            # FastAPI passes every parameter by keyword, so the dependency can come first, and be resolved before those of the endpoint
+            signature = inspect.signature(func)
+            wrapped.__signature__ = signature.replace(parameters=[
+                inspect.Parameter("rate_limit_check", inspect.Parameter.KEYWORD_ONLY, default=Depends(check_rate_limits), annotation=None),
+                *(parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY) for parameter in signature.parameters.values()),
+            ])
+            setattr(wrapped, "__rate_limit__", limit_str)
+            setattr(wrapped, "__ip_rate_limit__", ip_limit_str)
 
+            # The default limits of the middleware do not apply to the route
+            return self.limiter.exempt(wrapped)
 
-            wrapped = self.limiter.limit(limit_str)(func)
-            setattr(wrapped, "__rate_limit__", limit_str)
-            return wrapped
-        
 
-        return _decorator
\ No newline at end of file
+        return _decorator
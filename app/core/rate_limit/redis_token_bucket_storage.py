@@ -0,0 +1,391 @@
+import asyncio
+from contextlib import suppress
+from logging import getLogger
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = getLogger(__name__)
+
+# Refills a bucket up to the time of the Redis server, then takes the cost from it if it holds
+# enough tokens (or regardless, when forced), in a single atomic call. A cost of `0` only reads it.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = redis.call("TIME")
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+
+local tokens = capacity
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+if bucket[1] then
+    tokens = math.min(capacity, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * refill_rate)
+end
+
+local allowed = ARGV[4] == "1" or tokens >= cost
+if allowed and cost > 0 then
+    tokens = tokens - cost
+    redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+    redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / refill_rate * 1000) + 1000)
+end
+
+return {allowed and 1 or 0, tostring(tokens)}
+"""
+
+
+class RedisTokenBucketStorage:
+
+    """
+
+    Storage of token buckets in Redis, shared by the workers and the instances of the server.
+
+    Each check is a single call to a Lua script, which refills the bucket to the time of the Redis
+    server and takes the cost atomically, so concurrent checks never both take the last tokens.
+    Buckets expire once they would be full again.
+
+    With a `batch_interval`, checks are instead answered from a local copy of the buckets this
+    worker uses, and the tokens taken are sent to Redis every `batch_interval` seconds, for all the
+    buckets in a single pipeline, which also refreshes the copies. The first check of a bucket, or
+    of one left unused for an interval, still goes to Redis. In between, a worker does not see the
+    tokens the others take, so clients may exceed a limit by what the other workers admitted in
+    about one interval; that excess is then charged to their buckets, which may go below zero.
+
+
+    Usage
+    -----
+    ```python
+    storage = RedisTokenBucketStorage(Redis(connection_pool=BlockingConnectionPool.from_url(url)), batch_interval=0.005)
+    storage.start()  # From a running event loop, e.g., the lifespan
+    allowed, tokens = storage.consume("key", capacity=10, refill_rate=10 / 60, cost=3)
+    await storage.stop()
+    ```
+
+    """
+
+    def __init__(self, client: "Redis", batch_interval: float = 0.0) -> None:
+
+        """
+
+        Constructor for the Redis Token Bucket Storage.
+
+
+        Parameters
+        ----------
+        client : Redis
+            A Redis client (or a Redis-compatible one, e.g., from `fakeredis`), over a connection pool.
+
+        batch_interval : float, optional
+            Seconds between two batches of tokens sent to Redis. The default value is `0.0`.
+            If `0`, every check goes to Redis.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not hasattr(client, "register_script"):
+            raise TypeError(f"client must be a Redis client. Received: {client} with type {type(client)}")
+        if not isinstance(batch_interval, (int, float)) or batch_interval < 0:
+            raise ValueError(f"batch_interval must be a non-negative number. Received: {batch_interval} with type {type(batch_interval)}")
+
+
+        self.client = client
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.batch_interval = batch_interval
+        # Local copies of the buckets: key -> [tokens, updated_at, capacity, refill_rate, pending cost]
+        self.buckets: dict[str, list[float]] = {}
+        self.lock = threading.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+
+    def start(self) -> None:
+
+        """
+
+        Starts sending the tokens taken to Redis in batches, if a batch interval is set.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not self.batch_interval or self.task is not None:
+            return
+
+
+        self.task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+
+    async def stop(self) -> None:
+
+        """
+
+        Stops the batches, and sends the tokens taken since the last one.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.task is None:
+            return
+
+
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self.task = None
+        await run_in_threadpool(self.flush)
+
+
+    def consume(self, key: str, capacity: float, refill_rate: float, cost: float) -> tuple[bool, float]:
+
+        """
+
+        Takes `cost` tokens from a bucket, if it holds that many.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+        capacity : float
+            The most tokens the bucket holds.
+
+        refill_rate : float
+            Tokens added to the bucket per second.
+
+        cost : float
+            Tokens to take.
+
+
+        Returns
+        -------
+        allowed : bool
+            Whether the tokens were taken.
+
+        tokens : float
+            The tokens left in the bucket.
+
+        """
+
+        if self.task is not None:
+            with self.lock:
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    tokens = self._refill(bucket, time.monotonic())
+                    allowed = tokens >= cost
+                    if allowed:
+                        bucket[0] -= cost
+                        bucket[4] += cost
+                    return allowed, bucket[0]
+
+
+        allowed, tokens = self._call(key, capacity, refill_rate, cost)
+        if self.task is not None:
+            with self.lock:
+                self.buckets.setdefault(key, [tokens, time.monotonic(), capacity, refill_rate, 0.0])
+
+
+        return allowed, tokens
+
+
+    def peek(self, key: str, capacity: float, refill_rate: float) -> float:
+
+        """
+
+        Returns the tokens in a bucket, without taking any.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+        capacity : float
+            The most tokens the bucket holds.
+
+        refill_rate : float
+            Tokens added to the bucket per second.
+
+
+        Returns
+        -------
+        tokens : float
+            The tokens in the bucket.
+
+        """
+
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                return self._refill(bucket, time.monotonic())
+
+
+        return self._call(key, capacity, refill_rate, 0)[1]
+
+
+    def clear(self, key: str) -> None:
+
+        """
+
+        Refills a bucket.
+
+
+        Parameters
+        ----------
+        key : str
+            The key of the bucket.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.lock:
+            self.buckets.pop(key, None)
+        self.client.delete(key)
+
+
+    def check(self) -> bool:
+
+        """
+
+        Checks whether Redis answers.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        reachable : bool
+            Whether Redis answered the ping.
+
+        """
+
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+
+
+    def flush(self) -> None:
+
+        """
+
+        Sends the tokens taken from the local copies to Redis in a single pipeline, and refreshes the copies.
+        Copies left unused since the previous batch are dropped, so that their next check goes to Redis.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.lock:
+            pending = {key: bucket[4] for key, bucket in self.buckets.items() if bucket[4]}
+            for key in [key for key, bucket in self.buckets.items() if not bucket[4]]:
+                del self.buckets[key]
+            for key in pending:
+                self.buckets[key][4] = 0.0
+            args = {key: (self.buckets[key][2], self.buckets[key][3]) for key in pending}
+
+        if not pending:
+            return
+
+
+        try:
+            with self.client.pipeline(transaction=False) as pipeline:
+                for key, cost in pending.items():
+                    self.script(keys=[key], args=[*args[key], cost, 1], client=pipeline)
+                results = pipeline.execute()
+        except Exception:
+            # Sent again with the next batch
+            with self.lock:
+                for key, cost in pending.items():
+                    self.buckets.setdefault(key, [0.0, time.monotonic(), *args[key], 0.0])[4] += cost
+            raise
+
+
+        now = time.monotonic()
+        with self.lock:
+            for key, (_, tokens) in zip(pending, results):
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    # The tokens taken since the batch was sent are not in Redis yet
+                    bucket[0], bucket[1] = float(tokens) - bucket[4], now
+
+
+    async def _flush_periodically(self) -> None:
+
+        """
+
+        Sends the tokens taken to Redis every batch interval, off the event loop.
+
+        """
+
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception as e:
+                logger.warning("Could not send the rate limit tokens to Redis: %s", e)
+
+
+    def _call(self, key: str, capacity: float, refill_rate: float, cost: float) -> tuple[bool, float]:
+
+        """
+
+        Runs the token bucket script on a bucket in Redis.
+
+        """
+
+        allowed, tokens = self.script(keys=[key], args=[capacity, refill_rate, cost, 0])
+        return bool(allowed), float(tokens)
+
+
+    @staticmethod
+    def _refill(bucket: list[Any], now: float) -> float:
+
+        """
+
+        Refills a local copy of a bucket up to `now` and returns its tokens; the lock must be held.
+
+        """
+
+        tokens, updated_at, capacity, refill_rate, _ = bucket
+        bucket[0], bucket[1] = min(capacity, tokens + (now - updated_at) * refill_rate), now
+        return bucket[0]
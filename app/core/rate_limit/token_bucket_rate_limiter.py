@@ -0,0 +1,173 @@
+import time
+from typing import Union
+
+from limits import RateLimitItem
+from limits.util import WindowStats
+
+from .memory_token_bucket_storage import MemoryTokenBucketStorage
+from .redis_token_bucket_storage import RedisTokenBucketStorage
+
+
+class TokenBucketRateLimiter:
+
+    """
+
+    Token-bucket strategy for SlowAPI, in place of the fixed windows of `limits`.
+
+    A limit of `amount/period` is a bucket of `amount` tokens refilled at `amount` tokens per
+    period, so clients may burst up to `amount` requests and are then held to the average rate,
+    instead of being allowed up to twice the limit around the edge of a window. A request takes
+    as many tokens as its cost, capped at the size of the bucket, so that the most expensive
+    request needs a full bucket rather than being always rejected.
+
+    Implements the interface of the `limits` rate limiters that SlowAPI calls (`hit`, `test`,
+    `get_window_stats`, and `clear`).
+
+
+    Usage
+    -----
+    ```python
+    rate_limiter = TokenBucketRateLimiter(MemoryTokenBucketStorage())
+    rate_limiter.hit(parse("10/minute"), "key:3f2b...", "/api/v1/analyze-document", cost=3)
+    ```
+
+    """
+
+    def __init__(self, storage: Union[MemoryTokenBucketStorage, RedisTokenBucketStorage]) -> None:
+
+        """
+
+        Constructor for the Token Bucket Rate Limiter.
+
+
+        Parameters
+        ----------
+        storage : MemoryTokenBucketStorage or RedisTokenBucketStorage
+            The storage of the buckets, in the worker or shared in Redis.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(storage, (MemoryTokenBucketStorage, RedisTokenBucketStorage)):
+            raise TypeError(f"storage must be a MemoryTokenBucketStorage or RedisTokenBucketStorage instance. Received: {storage} with type {type(storage)}")
+
+
+        self.storage = storage
+
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+
+        """
+
+        Takes the cost of a request from the bucket of a limit.
+
+
+        Parameters
+        ----------
+        item : RateLimitItem
+            The limit.
+
+        *identifiers : str
+            The client and scope of the limit.
+
+        cost : int, optional
+            The tokens the request takes. The default value is `1`.
+
+
+        Returns
+        -------
+        allowed : bool
+            Whether the request is within the limit.
+
+        """
+
+        allowed, _ = self.storage.consume(item.key_for(*identifiers), item.amount, item.amount / item.get_expiry(), min(cost, item.amount))
+        return allowed
+
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+
+        """
+
+        Checks whether a request would be within a limit, without taking its cost.
+
+
+        Parameters
+        ----------
+        item : RateLimitItem
+            The limit.
+
+        *identifiers : str
+            The client and scope of the limit.
+
+        cost : int, optional
+            The tokens the request would take. The default value is `1`.
+
+
+        Returns
+        -------
+        allowed : bool
+            Whether the request would be within the limit.
+
+        """
+
+        return self.storage.peek(item.key_for(*identifiers), item.amount, item.amount / item.get_expiry()) >= min(cost, item.amount)
+
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+
+        """
+
+        Returns when the bucket of a limit is full again, and the whole tokens left, for the rate limit headers.
+
+
+        Parameters
+        ----------
+        item : RateLimitItem
+            The limit.
+
+        *identifiers : str
+            The client and scope of the limit.
+
+
+        Returns
+        -------
+        window_stats : WindowStats
+            The epoch time at which the bucket is full, and the remaining requests of cost `1`.
+
+        """
+
+        refill_rate = item.amount / item.get_expiry()
+        tokens = self.storage.peek(item.key_for(*identifiers), item.amount, refill_rate)
+
+
+        return WindowStats(time.time() + (item.amount - tokens) / refill_rate, int(tokens))
+
+
+    def clear(self, item: RateLimitItem, *identifiers: str) -> None:
+
+        """
+
+        Refills the bucket of a limit.
+
+
+        Parameters
+        ----------
+        item : RateLimitItem
+            The limit.
+
+        *identifiers : str
+            The client and scope of the limit.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.storage.clear(item.key_for(*identifiers))
@@ -0,0 +1,46 @@
+from math import ceil
+from typing import Callable
+
+from fastapi import Request
+
+
+def upload_cost(unit_bytes: int, max_request_size: int) -> Callable[[Request], int]:
+
+    """
+
+    Creates the rate limit cost function of an upload route: one token per started `unit_bytes` of the request body.
+
+    The cost is read from the `Content-Length` header, so it is charged before the body is
+    received. A request without the header (e.g., chunked) is charged as the largest request
+    the route accepts.
+
+
+    Parameters
+    ----------
+    unit_bytes : int
+        Bytes of request body per token.
+
+    max_request_size : int
+        The largest request body the route accepts, in bytes.
+
+
+    Returns
+    -------
+    cost_function : Callable
+        A function returning the cost of a request, at least `1`.
+
+    """
+
+    if not isinstance(unit_bytes, int) or unit_bytes <= 0:
+        raise ValueError(f"unit_bytes must be a positive integer. Received: {unit_bytes} with type {type(unit_bytes)}")
+    if not isinstance(max_request_size, int) or max_request_size <= 0:
+        raise ValueError(f"max_request_size must be a positive integer. Received: {max_request_size} with type {type(max_request_size)}")
+
+
+    def _cost(request: Request) -> int:
+        content_length = request.headers.get("content-length", "")
+        size = int(content_length) if content_length.isdigit() else max_request_size
+        return max(1, ceil(min(size, max_request_size) / unit_bytes))
+
+
+    return _cost
@@ -0,0 +1,336 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import wraps
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from ..metrics.metrics_registry import MetricsRegistry
+
+QUEUE_WAIT_BUCKETS_SECONDS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Metrics label of the tenants without a weight of their own
+OTHER_TENANTS_LABEL = "other"
+
+
+class FairScheduler:
+
+    """
+
+    Weighted fair scheduler of the calls of a coroutine function (e.g., analyses) across tenants.
+
+    At most `max_concurrency` calls run at once, and at most `max_concurrency_per_tenant` of a
+    single tenant. Calls that cannot start wait in a queue per tenant, and freed slots are handed
+    out by deficit round robin: the tenants with waiting calls take turns, each adding its weight
+    to its deficit on its turn and starting calls while the deficit covers their cost. Over time,
+    tenants get slots in proportion to their weights, whatever the length of their queues, so a
+    batch of 200 documents only delays the single analysis of another tenant by about one call.
+
+    Calls start in order within a tenant. The scheduler is only used from the event loop, so it
+    needs no lock, and each worker schedules its own calls. The queue metrics are labelled by
+    tenant only for the tenants with a weight; the others, unbounded in number, share one label.
+
+
+    Usage
+    -----
+    ```python
+    scheduler = FairScheduler(max_concurrency=16, max_concurrency_per_tenant=4, weights={"3f2b...": 2.0})
+    extract = scheduler.schedule(extract_insight, tenant=lambda kwargs: hash_api_key(kwargs["api_key"]))
+    async with scheduler.slot("3f2b..."):
+        ...
+    ```
+
+    """
+
+    def __init__(self,
+                 max_concurrency: int,
+                 max_concurrency_per_tenant: Optional[int] = None,
+                 weights: Optional[dict[str, float]] = None,
+                 metrics: Optional[MetricsRegistry] = None) -> None:
+
+        """
+
+        Constructor for the Fair Scheduler.
+
+
+        Parameters
+        ----------
+        max_concurrency : int
+            The most calls running at once.
+
+        max_concurrency_per_tenant : int, optional
+            The most calls of a tenant running at once. The default value is `None`.
+            If `None`, a tenant may use every slot while the others have nothing waiting.
+
+        weights : dict, optional
+            The weight of each tenant; tenants not listed weigh `1`. The default value is `None`.
+
+        metrics : MetricsRegistry, optional
+            The registry of the queue metrics. The default value is `None`.
+            If `None`, the metrics are kept in a registry of their own.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer. Received: {max_concurrency} with type {type(max_concurrency)}")
+        if max_concurrency_per_tenant is not None and (not isinstance(max_concurrency_per_tenant, int) or max_concurrency_per_tenant < 1):
+            raise ValueError(f"max_concurrency_per_tenant must be a positive integer. Received: {max_concurrency_per_tenant} with type {type(max_concurrency_per_tenant)}")
+        if weights is not None and (not isinstance(weights, dict) or not all(isinstance(weight, (int, float)) and weight > 0 for weight in weights.values())):
+            raise ValueError(f"weights must be a dictionary of positive numbers. Received: {weights} with type {type(weights)}")
+        if metrics is not None and not isinstance(metrics, MetricsRegistry):
+            raise TypeError(f"metrics must be a MetricsRegistry instance. Received: {metrics} with type {type(metrics)}")
+
+
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_tenant = max_concurrency_per_tenant
+        self.weights = weights or {}
+        # Waiting calls of each tenant: (future resolved when the call may start, cost)
+        self.queues: dict[str, deque[tuple[asyncio.Future, float]]] = {}
+        # Tenants with waiting calls, the one whose turn it is first
+        self.active: deque[str] = deque()
+        self.deficits: dict[str, float] = {}
+        self.turn_started = False
+        self.running: dict[str, int] = {}
+        self.running_total = 0
+
+        metrics = metrics or MetricsRegistry()
+        # Label series are never removed, so only the weighted tenants get their own
+        self.queue_wait = metrics.histogram("analysis_queue_wait_seconds", "Time an analysis waited for a slot of the scheduler.", QUEUE_WAIT_BUCKETS_SECONDS, labelnames=("tenant",))
+        self.queue_depth = metrics.gauge("analysis_queue_depth", "Analyses waiting for a slot of the scheduler.", labelnames=("tenant",))
+
+
+    @asynccontextmanager
+    async def slot(self, tenant: str, cost: float = 1) -> AsyncIterator[None]:
+
+        """
+
+        Waits for the turn of a call of a tenant, and holds its slot until the block exits.
+
+
+        Parameters
+        ----------
+        tenant : str
+            The tenant of the call.
+
+        cost : float, optional
+            The share of the turns of the tenant the call uses. The default value is `1`.
+
+
+        Returns
+        -------
+        slot : AsyncIterator
+            A context holding the slot.
+
+        """
+
+        if not isinstance(tenant, str):
+            raise TypeError(f"tenant must be a string. Received: {tenant} with type {type(tenant)}")
+        if not isinstance(cost, (int, float)) or cost <= 0:
+            raise ValueError(f"cost must be a positive number. Received: {cost} with type {type(cost)}")
+
+
+        await self._acquire(tenant, cost)
+        try:
+            yield
+        finally:
+            self._release(tenant)
+
+
+    def schedule(self, func: Callable[..., Awaitable[Any]], tenant: Callable[[dict[str, Any]], str]) -> Callable[..., Awaitable[Any]]:
+
+        """
+
+        Wraps a coroutine function so that each call waits for a slot of its tenant.
+
+
+        Parameters
+        ----------
+        func : Callable
+            The coroutine function to schedule.
+
+        tenant : Callable
+            Returns the tenant of a call from its keyword arguments.
+
+
+        Returns
+        -------
+        scheduled : Callable
+            The wrapped coroutine function.
+
+        """
+
+        if not isinstance(func, Callable):
+            raise TypeError(f"func must be a callable. Received: {func} with type {type(func)}")
+        if not isinstance(tenant, Callable):
+            raise TypeError(f"tenant must be a callable. Received: {tenant} with type {type(tenant)}")
+
+
+        @wraps(func)
+        async def scheduled(*args: Any, **kwargs: Any) -> Any:
+            async with self.slot(tenant(kwargs)):
+                return await func(*args, **kwargs)
+
+
+        return scheduled
+
+
+    async def _acquire(self, tenant: str, cost: float) -> None:
+
+        """
+
+        Returns once the call of a tenant may start, starting it at once if nothing waits and slots are free.
+
+        """
+
+        enqueued_at = time.perf_counter()
+        if not self.active and self.running_total < self.max_concurrency and not self._at_tenant_limit(tenant):
+            self._start(tenant)
+            self.queue_wait.labels(self._label(tenant)).observe(0)
+            return
+
+
+        entry = (asyncio.get_running_loop().create_future(), cost)
+        if tenant not in self.queues:
+            self.queues[tenant] = deque()
+            self.active.append(tenant)
+            self.deficits[tenant] = 0.0
+        self.queues[tenant].append(entry)
+        self.queue_depth.labels(self._label(tenant)).inc()
+
+        try:
+            self._dispatch()
+            await entry[0]
+        except asyncio.CancelledError:
+            # Started just before being cancelled: hand the slot over
+            if entry[0].done() and not entry[0].cancelled():
+                self._release(tenant)
+            elif entry in self.queues.get(tenant, ()):
+                self.queues[tenant].remove(entry)
+                self.queue_depth.labels(self._label(tenant)).dec()
+                if not self.queues[tenant]:
+                    self._remove_tenant(tenant)
+                self._dispatch()
+            raise
+
+
+        self.queue_wait.labels(self._label(tenant)).observe(time.perf_counter() - enqueued_at)
+
+
+    def _release(self, tenant: str) -> None:
+
+        """
+
+        Frees the slot of a finished call, and hands it to the next one.
+
+        """
+
+        self.running[tenant] -= 1
+        if not self.running[tenant]:
+            del self.running[tenant]
+        self.running_total -= 1
+        self._dispatch()
+
+
+    def _dispatch(self) -> None:
+
+        """
+
+        Starts waiting calls by deficit round robin while slots are free.
+
+        """
+
+        while self.running_total < self.max_concurrency and any(not self._at_tenant_limit(tenant) for tenant in self.active):
+            tenant = self.active[0]
+            if self._at_tenant_limit(tenant):
+                self._next_turn()
+                continue
+
+            if not self.turn_started:
+                self.deficits[tenant] += self.weights.get(tenant, 1.0)
+                self.turn_started = True
+
+            future, cost = self.queues[tenant][0]
+            # Cancelled, but its task has not dropped it yet
+            if future.done():
+                self.queues[tenant].popleft()
+                self.queue_depth.labels(self._label(tenant)).dec()
+                if not self.queues[tenant]:
+                    self._remove_tenant(tenant)
+                continue
+
+            if self.deficits[tenant] < cost:
+                self._next_turn()
+                continue
+
+            self.queues[tenant].popleft()
+            self.queue_depth.labels(self._label(tenant)).dec()
+            self.deficits[tenant] -= cost
+            self._start(tenant)
+            future.set_result(None)
+            if not self.queues[tenant]:
+                self._remove_tenant(tenant)
+
+
+    def _start(self, tenant: str) -> None:
+
+        """
+
+        Counts a call of a tenant as running.
+
+        """
+
+        self.running[tenant] = self.running.get(tenant, 0) + 1
+        self.running_total += 1
+
+
+    def _label(self, tenant: str) -> str:
+
+        """
+
+        The metrics label of a tenant: itself if it has a weight, `"other"` otherwise.
+
+        """
+
+        return tenant if tenant in self.weights else OTHER_TENANTS_LABEL
+
+
+    def _at_tenant_limit(self, tenant: str) -> bool:
+
+        """
+
+        Whether a tenant runs as many calls as it may.
+
+        """
+
+        return self.max_concurrency_per_tenant is not None and self.running.get(tenant, 0) >= self.max_concurrency_per_tenant
+
+
+    def _next_turn(self) -> None:
+
+        """
+
+        Ends the turn of the current tenant.
+
+        """
+
+        self.active.rotate(-1)
+        self.turn_started = False
+
+
+    def _remove_tenant(self, tenant: str) -> None:
+
+        """
+
+        Drops a tenant that has nothing waiting any more, with its deficit, as in deficit round robin.
+
+        """
+
+        if self.active[0] == tenant:
+            self.turn_started = False
+        self.active.remove(tenant)
+        del self.queues[tenant]
+        del self.deficits[tenant]
@@ -1,3 +1,7 @@
+import hashlib
+import hmac
+from typing import Optional
+
 from ..exceptions.custom_http_exception import CustomHTTPException
 
 
@@ -33,4 +37,60 @@ def extract_api_key(authorization: str) -> str:
         raise CustomHTTPException(status_code=401, detail="API key is missing.")
     
 
-    return api_key
\ No newline at end of file
+    return api_key
+
+
+def hash_api_key(api_key: str) -> str:
+
+    """
+
+    Derives a stable, non-reversible identifier of an API key, suitable for cache keys and logs.
+
+
+    Parameters
+    ----------
+    api_key : str
+        The API key.
+
+    Returns
+    -------
+    api_key_hash : str
+        The first 32 hex characters of the SHA-256 digest of the key.
+
+    """
+
+    if not isinstance(api_key, str):
+        raise TypeError(f"api_key must be a string. Received: {type(api_key)}")
+    
+
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:32]
+
+
+def check_admin_token(token: Optional[str], admin_token: Optional[str]) -> None:
+
+    """
+
+    Checks the token sent to an admin endpoint against the configured admin token.
+
+
+    Parameters
+    ----------
+    token : str or None
+        The value of the `X-Admin-Token` header.
+
+    admin_token : str or None
+        The configured admin token. If `None`, the admin endpoints are disabled.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    if admin_token is None:
+        raise CustomHTTPException(status_code=403, detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them.", title="Forbidden")
+    
+
+    # Compared in constant time, so that the token cannot be guessed from the response times
+    if token is None or not hmac.compare_digest(token.encode("utf-8"), admin_token.encode("utf-8")):
+        raise CustomHTTPException(status_code=403, detail="Invalid admin token.", title="Forbidden")
\ No newline at end of file
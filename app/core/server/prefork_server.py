@@ -0,0 +1,216 @@
+import gc
+import logging
+from logging import getLogger
+import os
+import signal
+import time
+from typing import Any, Optional
+
+import uvicorn
+from starlette.types import ASGIApp
+
+logger = getLogger(__name__)
+
+
+class PreforkServer:
+
+    """
+
+    Pre-forking server that runs an already imported ASGI application in several Uvicorn workers.
+
+    The application, and with it the heavy libraries it imports (pandas, PyMuPDF, pydantic-ai), is
+    loaded once in the supervisor, which then binds the socket and forks the workers. The workers
+    share the loaded modules copy-on-write instead of importing them each, and the objects created
+    at import time are frozen out of the garbage collector so that collections do not touch, and
+    thus copy, their pages. Workers that die are forked again.
+
+    On SIGTERM or SIGINT, the supervisor forwards SIGTERM to the workers, which stop accepting
+    connections and let in-flight requests (e.g., running analyses) finish for up to
+    `graceful_shutdown_timeout` seconds before they are killed.
+
+    Uvicorn picks uvloop and httptools when they are installed.
+
+
+    Usage
+    -----
+    ```python
+    from main import app
+
+    PreforkServer(app, host="0.0.0.0", port=8000, workers=4).run()
+    ```
+
+    """
+
+    def __init__(self,
+                 app: ASGIApp,
+                 host: str = "127.0.0.1",
+                 port: int = 8000,
+                 workers: int = 1,
+                 graceful_shutdown_timeout: float = 120.0,
+                 **uvicorn_options: Any) -> None:
+
+        """
+
+        Constructor for the Prefork Server.
+
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The imported ASGI application.
+
+        host : str, optional
+            The interface to bind. The default value is `"127.0.0.1"`.
+
+        port : int, optional
+            The port to bind. The default value is `8000`.
+
+        workers : int, optional
+            The number of worker processes. The default value is `1`.
+            With `1`, or on platforms without `fork`, the application is served from the current process.
+
+        graceful_shutdown_timeout : float, optional
+            Seconds in-flight requests may take to finish on shutdown. The default value is `120.0`.
+
+        **uvicorn_options
+            Other options of `uvicorn.Config` (e.g., `log_level`, `proxy_headers`).
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(f"workers must be a positive integer. Received: {workers} with type {type(workers)}")
+        if not isinstance(graceful_shutdown_timeout, (int, float)) or graceful_shutdown_timeout < 0:
+            raise ValueError(f"graceful_shutdown_timeout must be a non-negative number. Received: {graceful_shutdown_timeout} with type {type(graceful_shutdown_timeout)}")
+
+
+        self.workers = workers
+        self.graceful_shutdown_timeout = graceful_shutdown_timeout
+        self.config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            loop="auto",
+            http="auto",
+            timeout_graceful_shutdown=graceful_shutdown_timeout,
+            **uvicorn_options
+        )
+        self.worker_pids: set[int] = set()
+        self.stopping = False
+
+
+    def run(self) -> None:
+
+        """
+
+        Serves the application until SIGTERM or SIGINT, then drains the workers.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.workers == 1 or not hasattr(os, "fork"):
+            uvicorn.Server(self.config).run()
+            return
+
+
+        socket = self.config.bind_socket()
+        # Objects created so far live as long as the workers; untracking them keeps their pages shared
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        for _ in range(self.workers):
+            self._spawn_worker(socket)
+        logger.info("Supervisor %d started %d workers on %s:%d.", os.getpid(), self.workers, self.config.host, self.config.port)
+
+        deadline: Optional[float] = None
+        while self.worker_pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                if self.stopping and deadline is None:
+                    deadline = time.monotonic() + self.graceful_shutdown_timeout + 5
+                if deadline is not None and time.monotonic() > deadline:
+                    logger.warning("Killing %d workers that did not drain in time.", len(self.worker_pids))
+                    self._signal_workers(signal.SIGKILL)
+                    deadline = float("inf")
+                time.sleep(0.2)
+                continue
+
+            self.worker_pids.discard(pid)
+            if not self.stopping:
+                logger.warning("Worker %d exited with status %d; starting a new one.", pid, os.waitstatus_to_exitcode(status))
+                self._spawn_worker(socket)
+
+        socket.close()
+        logger.info("All workers stopped.")
+
+
+    def _spawn_worker(self, socket: Any) -> None:
+
+        """
+
+        Forks a worker that serves the application on the shared socket.
+
+        """
+
+        pid = os.fork()
+        if pid != 0:
+            self.worker_pids.add(pid)
+            return
+
+
+        # Uvicorn installs its own handlers for a graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            uvicorn.Server(self.config).run(sockets=[socket])
+        finally:
+            # `os._exit` skips the atexit hooks, which write the records still queued for the log handlers
+            logging.shutdown()
+            os._exit(0)
+
+
+    def _handle_exit(self, signum: int, frame: Any) -> None:
+
+        """
+
+        Starts the graceful shutdown of the workers.
+
+        """
+
+        if not self.stopping:
+            logger.info("Received %s; draining %d workers.", signal.Signals(signum).name, len(self.worker_pids))
+        self.stopping = True
+        self._signal_workers(signal.SIGTERM)
+
+
+    def _signal_workers(self, signum: int) -> None:
+
+        """
+
+        Sends a signal to every worker.
+
+        """
+
+        for pid in list(self.worker_pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self.worker_pids.discard(pid)
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import Span, SpanProcessor
+
+from ..logging.log_context import request_id_var
+
+
+class RequestIDSpanProcessor(SpanProcessor):
+
+    """
+
+    Span processor that tags every span with the ID of the request it belongs to, so spans can be
+    correlated with the log lines and the `X-Request-ID` response header.
+
+
+    Usage
+    -----
+    ```python
+    tracer_provider.add_span_processor(RequestIDSpanProcessor())
+    ```
+
+    """
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+
+        """
+
+        Sets the `request.id` attribute of a span that is starting.
+
+
+        Parameters
+        ----------
+        span : Span
+            The span that is starting.
+
+        parent_context : Context, optional
+            The parent context of the span. The default value is `None`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        request_id = request_id_var.get()
+        if request_id != "unknown":
+            span.set_attribute("request.id", request_id)
@@ -0,0 +1,95 @@
+import sys
+from typing import Any, Optional
+
+from opentelemetry import trace
+
+from ..config.settings import settings
+
+
+def setup_tracing(exporter: str = "none", file_path: str = "traces.jsonl", sample_ratio: float = 1.0) -> Optional[Any]:
+
+    """
+
+    Configure OpenTelemetry tracing of the analysis stages.
+
+    The application opens its spans through the OpenTelemetry API, which is a no-op until a tracer
+    provider is configured here. Spans are tagged with the request ID, and the model requests made
+    by pydantic-ai agents are traced as child spans (without the prompts and outputs).
+
+
+    Parameters
+    ----------
+    exporter : str, optional
+        Where finished spans are sent. The default value is `"none"`.
+            The options are:
+                `"none"`
+                    Tracing is disabled.
+                `"console"`
+                    One JSON object per span on stdout.
+                `"file"`
+                    One JSON object per span appended to `file_path`.
+                `"otlp"`
+                    The OTLP/HTTP endpoint set by the standard `OTEL_EXPORTER_OTLP_*` variables.
+                    Requires `opentelemetry-exporter-otlp-proto-http`.
+
+    file_path : str, optional
+        The file of the `file` exporter. The default value is `"traces.jsonl"`.
+
+    sample_ratio : float, optional
+        Share of the requests that are traced, from 0 to 1. The default value is `1.0`.
+
+
+    Returns
+    -------
+    tracer_provider : TracerProvider or None
+        The configured tracer provider, to be shut down on exit, or `None` if tracing is disabled.
+
+    """
+
+    if exporter not in {"none", "console", "file", "otlp"}:
+        raise ValueError(f"Invalid exporter: {exporter}. Must be one of: none, console, file, otlp")
+    if not isinstance(sample_ratio, (int, float)) or not 0 <= sample_ratio <= 1:
+        raise ValueError(f"sample_ratio must be a number between 0 and 1. Received: {sample_ratio} with type {type(sample_ratio)}")
+
+    if exporter == "none":
+        return None
+
+
+    # The SDK is only needed once tracing is enabled
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (BatchSpanProcessor,
+                                                ConsoleSpanExporter)
+    from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    from pydantic_ai.agent import Agent, InstrumentationSettings
+
+    from .request_id_span_processor import RequestIDSpanProcessor
+
+    # The provider can only be set once per process, e.g., if the lifespan runs again in tests
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        return trace.get_tracer_provider()
+
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import \
+            OTLPSpanExporter
+        span_exporter = OTLPSpanExporter()
+    else:
+        span_exporter = ConsoleSpanExporter(
+            out=sys.stdout if exporter == "console" else open(file_path, "a", buffering=1, encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+
+    tracer_provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.PROJECT_NAME, "service.version": settings.VERSION}),
+        sampler=ParentBasedTraceIdRatio(sample_ratio)
+    )
+    tracer_provider.add_span_processor(RequestIDSpanProcessor())
+    # Spans are exported from a background thread, off the event loop
+    tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(tracer_provider)
+
+    Agent.instrument_all(InstrumentationSettings(tracer_provider=tracer_provider, include_content=False, include_binary_content=False))
+
+
+    return tracer_provider
@@ -39,5 +39,18 @@ To aid in debugging, observability, and request correlation across services, the
 |----------------|-----------------------------------------------------------------------------|
 | `x-request-id` | A unique identifier assigned to each request. Useful for tracing logs and debugging distributed systems. |
 
+## LLM Usage Headers
+
+When `EXPOSE_LLM_USAGE_HEADERS` is enabled, successful analyses include the following headers:
+
+| Header                | Description                                                                  |
+|-----------------------|------------------------------------------------------------------------------|
+| `x-llm-input-tokens`  | Input tokens consumed across all model requests of the analysis.             |
+| `x-llm-output-tokens` | Output tokens generated across all model requests of the analysis.           |
+| `x-llm-requests`      | Number of requests made to the model provider.                               |
+| `x-llm-retries`       | Number of output retries caused by invalid structured output.                |
+| `x-llm-latency-ms`    | Total time spent waiting on the model provider, in milliseconds.             |
+| `x-llm-ttft-ms`       | Time until the first model response arrived, in milliseconds.                |
+
 """
 )
\ No newline at end of file
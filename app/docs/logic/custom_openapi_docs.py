@@ -73,6 +73,7 @@ def generate_custom_openapi_docs(app: FastAPI) -> Callable[[], dict]:
             # Extract rate limit from endpoint
             endpoint = route.endpoint
             raw_limit = getattr(endpoint, "__rate_limit__", None)
+            raw_ip_limit = getattr(endpoint, "__ip_rate_limit__", None)
 
             # Normalize limit string
             limit_parts = []
@@ -82,6 +83,9 @@ def generate_custom_openapi_docs(app: FastAPI) -> Callable[[], dict]:
             else:
                 limit_parts.append(", ".join(settings.RATE_LIMITS))
 
+            if raw_ip_limit:
+                limit_parts.append(", ".join(l.strip() for l in raw_ip_limit.split(";")) + " per client address")
+
             # Compose full description limit
             full_limit_description = " + ".join(limit_parts)
 
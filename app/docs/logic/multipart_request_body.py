@@ -0,0 +1,62 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def create_multipart_request_body(form_model: type[BaseModel], file_field: str = "file") -> dict[str, Any]:
+
+    """
+
+    Method to create the OpenAPI request body of a multipart form that is parsed by the endpoint
+    itself rather than declared with `File` and `Form` parameters.
+
+
+    Parameters
+    ----------
+    form_model : type
+        The Pydantic model of the form fields.
+
+    file_field : str, optional
+        The name of the form field holding the file. The default value is `"file"`.
+
+
+    Returns
+    -------
+    request_body : dict
+        The OpenAPI request body, with the model's definitions inlined.
+
+    """
+
+    if not isinstance(form_model, type) or not issubclass(form_model, BaseModel):
+        raise TypeError(f"form_model must be a Pydantic model class. Received: {form_model} with type {type(form_model)}")
+    if not isinstance(file_field, str):
+        raise TypeError(f"file_field must be a string. Received: {file_field} with type {type(file_field)}")
+
+
+    schema = form_model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    # The definitions are not part of the document's components, so references are replaced with their schemas
+    def inline(node: Any) -> Any:
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node:
+            return {**inline(definitions[node["$ref"].rsplit("/", 1)[-1]]), **{key: inline(value) for key, value in node.items() if key != "$ref"}}
+        return {key: inline(value) for key, value in node.items()}
+
+
+    schema = inline(schema)
+    schema["properties"] = {file_field: {"title": file_field.title(), "type": "string", "format": "binary"}, **schema["properties"]}
+    schema["required"] = [file_field, *schema.get("required", [])]
+
+
+    return {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": schema
+            }
+        }
+    }
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import BaseModel, PositiveInt
+
+from insight_extractor_ai_agent.schemas.taxonomy.insight_type import \
+    InsightType
+from insight_extractor_ai_agent.schemas.taxonomy.schema_profile import \
+    SchemaProfile
+
+from .routing_preference import RoutingPreference
+
+
+class AnalyzeDocumentForm(BaseModel):
+    model_name: str
+    incremental: bool = False
+    schema_profile: SchemaProfile = SchemaProfile.FULL
+    insight_types: Optional[list[InsightType]] = None
+    max_content_tokens: Optional[PositiveInt] = None
+    routing_preference: RoutingPreference = RoutingPreference.LATENCY
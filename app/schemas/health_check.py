@@ -0,0 +1,10 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class HealthCheck(BaseModel):
+    healthy: bool
+    value: Optional[float] = None
+    threshold: Optional[float] = None
+    detail: Optional[str] = None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from .health_check import HealthCheck
+
+
+class HealthReport(BaseModel):
+    healthy: bool
+    checks: dict[str, HealthCheck]
@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class ModelCapability(BaseModel):
+    context_window: Annotated[int, Field(gt=0)]
+    throughput_tokens_per_second: Annotated[float, Field(gt=0.0)]
+    relative_cost: Annotated[float, Field(ge=0.0)]
+    structured_output_reliability: Annotated[float, Field(gt=0.0, le=1.0)]
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class RoutingPreference(str, Enum):
+    LATENCY = "latency"
+    COST = "cost"
+    BALANCED = "balanced"
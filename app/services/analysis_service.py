@@ -1,11 +1,26 @@
+import io
 from logging import getLogger
-from typing import Awaitable, Callable, Tuple, Union
+from typing import Awaitable, Callable, Optional, Tuple, Union
 
-from fastapi import HTTPException, UploadFile
+from fastapi import HTTPException
+from opentelemetry import trace
+from starlette.concurrency import run_in_threadpool
 
 from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
+from insight_extractor_ai_agent.schemas.analysis_usage import AnalysisUsage
+from insight_extractor_ai_agent.schemas.taxonomy.insight_type import \
+    InsightType
+from insight_extractor_ai_agent.schemas.taxonomy.schema_profile import \
+    SchemaProfile
+from insight_extractor_ai_agent.utils.estimate_tokens import estimate_tokens
+
+from ..core.security.auth import hash_api_key
+from ..schemas.routing_preference import RoutingPreference
+from ..utils.content_index import ContentIndex
+from ..utils.model_registry import AUTO_MODEL_NAME
 
 logger = getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 class AnalysisService:
@@ -20,7 +35,7 @@ class AnalysisService:
     ------
     ```python
     service = AnalysisService(extract_insight, retrieve_content_from_file)
-    report = await service.analyze_document(file, api_key, model_name)
+    report = await service.analyze_document(file_name, file_content, api_key, model_name)
     ```
 
     """
@@ -28,7 +43,11 @@ class AnalysisService:
     def __init__(
         self,
         extract_insight: Callable[[str, str, str, str, str], Awaitable[AnalysisReport]],
-        retrieve_content_from_file: Callable[[Union[str, bytes], str], Tuple[str, str]],
+        retrieve_content_from_file: Callable[[Union[str, bytes, io.BytesIO], str], Tuple[str, str, ContentIndex]],
+        extract_insight_incremental: Optional[Callable[..., Awaitable[AnalysisReport]]] = None,
+        reduce_content: Optional[Callable[[str, int], str]] = None,
+        resolve_locations: Optional[Callable[[AnalysisReport, ContentIndex], AnalysisReport]] = None,
+        select_model: Optional[Callable[[int, RoutingPreference, Optional[str]], str]] = None,
     ) -> None:
         
         """
@@ -42,7 +61,23 @@ class AnalysisService:
             Dependency that performs AI-based insight extraction.
 
         retrieve_content_from_file : Callable
-            Dependency that parses file bytes into content and file_type.
+            Dependency that parses file bytes or an in-memory stream into content, file_type, and the structural index of the content.
+
+        extract_insight_incremental : Callable, optional
+            Dependency that performs incremental insight extraction on revised documents. The default value is `None`.
+            If `None`, incremental analysis is unavailable.
+
+        reduce_content : Callable, optional
+            Dependency that compresses content to a token budget. The default value is `None`.
+            If `None`, content reduction is unavailable.
+
+        resolve_locations : Callable, optional
+            Dependency that computes and verifies insight locations against the content index. The default value is `None`.
+            If `None`, the locations produced by the model are returned as is.
+
+        select_model : Callable, optional
+            Dependency that picks a model for the `auto` model name from the estimated tokens, the routing preference, and an optional provider. The default value is `None`.
+            If `None`, the `auto` model is unavailable.
 
 
         Returns
@@ -55,34 +90,82 @@ class AnalysisService:
             raise HTTPException(400, f"extract_insight must be a callable: Received {type(extract_insight)} with type {type(extract_insight)}")
         if not isinstance(retrieve_content_from_file, Callable):
             raise HTTPException(400, f"retrieve_content_from_file must be a callable: Received {type(retrieve_content_from_file)} with type {type(retrieve_content_from_file)}")
+        if extract_insight_incremental is not None and not isinstance(extract_insight_incremental, Callable):
+            raise HTTPException(400, f"extract_insight_incremental must be a callable: Received {type(extract_insight_incremental)} with type {type(extract_insight_incremental)}")
+        if reduce_content is not None and not isinstance(reduce_content, Callable):
+            raise HTTPException(400, f"reduce_content must be a callable: Received {type(reduce_content)} with type {type(reduce_content)}")
+        if resolve_locations is not None and not isinstance(resolve_locations, Callable):
+            raise HTTPException(400, f"resolve_locations must be a callable: Received {type(resolve_locations)} with type {type(resolve_locations)}")
+        if select_model is not None and not isinstance(select_model, Callable):
+            raise HTTPException(400, f"select_model must be a callable: Received {type(select_model)} with type {type(select_model)}")
 
   
         self.extract_insight = extract_insight
         self.retrieve_content_from_file = retrieve_content_from_file
-
-
-    async def analyze_document(self, file: UploadFile, api_key: str, model_name: str) -> AnalysisReport:
+        self.extract_insight_incremental = extract_insight_incremental
+        self.reduce_content = reduce_content
+        self.resolve_locations = resolve_locations
+        self.select_model = select_model
+
+
+    async def analyze_document(self, 
+                               file_name: str, 
+                               file_content: Union[bytes, io.BytesIO], 
+                               api_key: str, 
+                               model_name: str, 
+                               usage_callback: Optional[Callable[[AnalysisUsage], None]] = None,
+                               incremental: bool = False,
+                               schema_profile: SchemaProfile = SchemaProfile.FULL,
+                               insight_types: Optional[list[InsightType]] = None,
+                               max_content_tokens: Optional[int] = None,
+                               routing_preference: RoutingPreference = RoutingPreference.LATENCY) -> AnalysisReport:
 
         """
 
-        Main document analysis workflow.
+        Main document analysis workflow, traced with a span per step.
 
         Steps
         -----
         1. Parse the uploaded file to retrieve content and type.
-        2. Call the AI insight extraction dependency.
+        2. Optionally reduce the content to the token budget.
+        3. Pick a model if the `auto` model was requested.
+        4. Call the AI insight extraction dependency.
+        5. Optionally resolve the insight locations against the original content.
 
         
         Parameters
         ----------
-        file : UploadFile
-            The uploaded file to analyze.
+        file_name : str
+            The name of the uploaded file, used to determine its format.
+
+        file_content : bytes or io.BytesIO
+            The content of the uploaded file, or the buffer it was streamed into.
 
         api_key : str
             The API key to use for analysis.
 
         model_name : str
-            The AI model to use for analysis.
+            The AI model to use for analysis. `auto:<provider>` picks a registered model of the provider that fits the content (bare `auto` only with a single registered provider).
+
+        usage_callback : Callable, optional
+            Called with the LLM usage of the analysis. The default value is `None`.
+
+        incremental : bool, optional
+            Whether to reuse the cached insights of unchanged parts of a previously analysed revision. The default value is `False`.
+
+        schema_profile : SchemaProfile, optional
+            Output schema handed to the model. The default value is `SchemaProfile.FULL`.
+
+        insight_types : list, optional
+            Insight types to extract. The default value is `None`.
+            If `None`, all insight types are extracted.
+
+        max_content_tokens : int, optional
+            Token budget for the parsed content. Larger content is extractively reduced before the analysis. The default value is `None`.
+            If `None`, the content is analysed as is.
+
+        routing_preference : RoutingPreference, optional
+            What the `auto` model optimises. The default value is `RoutingPreference.LATENCY`.
 
 
         Returns
@@ -93,22 +176,71 @@ class AnalysisService:
 
         """
 
-        logger.info("Starting document analysis workflow.")
-
-        # Step 1: Parse file using injected dependency
-        file_content_bytes = await file.read()
-        content, file_type = self.retrieve_content_from_file(file_content_bytes, file.filename)
-        logger.info(f"File {file.filename} parsed successfully.")
-
-        # Step 2: Run AI insight extraction
-        result = await self.extract_insight(
-            api_key=api_key,
-            model_name=model_name,
-            content=content,
-            file_name=file.filename,
-            file_type=file_type,
-        )
-        logger.info("AI analysis completed successfully.")
+        with tracer.start_as_current_span("analyze document", attributes={"file.name": file_name, "gen_ai.request.model": model_name, "analysis.incremental": incremental}):
+            logger.info("Starting document analysis workflow.")
+
+            # Step 1: Parse file using injected dependency
+            with tracer.start_as_current_span("parse file"):
+                try:
+                    content, file_type, content_index = self.retrieve_content_from_file(file_content, file_name)
+                except ValueError as e:
+                    raise HTTPException(415, str(e))
+            logger.info("File %s parsed successfully.", file_name)
+
+            # Step 2: Reduce the content to the token budget, off the event loop as scoring is CPU-bound
+            if max_content_tokens is not None:
+                if self.reduce_content is None:
+                    raise HTTPException(400, "Content reduction is not available.")
+                original_length = len(content)
+                with tracer.start_as_current_span("reduce content", attributes={"content.length": original_length, "content.max_tokens": max_content_tokens}):
+                    content = await run_in_threadpool(self.reduce_content, content, max_content_tokens)
+                logger.info("Content reduced from %d to %d characters.", original_length, len(content))
+
+            # Step 3: Route the auto model to a registered model that fits the content
+            if model_name.split(":", 1)[0] == AUTO_MODEL_NAME:
+                if self.select_model is None:
+                    raise HTTPException(400, "Automatic model selection is not available.")
+                provider = model_name.split(":", 1)[1] if ":" in model_name else None
+                with tracer.start_as_current_span("select model", attributes={"routing.preference": routing_preference.value}) as span:
+                    try:
+                        model_name = self.select_model(estimate_tokens(content), routing_preference, provider)
+                    except ValueError as e:
+                        raise HTTPException(400, str(e))
+                    span.set_attribute("gen_ai.request.model", model_name)
+                logger.info("Model %s selected for the %s preference.", model_name, routing_preference.value)
+
+            # Step 4: Run AI insight extraction
+            if incremental:
+                if self.extract_insight_incremental is None:
+                    raise HTTPException(400, "Incremental analysis is not available.")
+                result = await self.extract_insight_incremental(
+                    api_key=api_key,
+                    model_name=model_name,
+                    content=content,
+                    file_name=file_name,
+                    file_type=file_type,
+                    cache_namespace=hash_api_key(api_key),
+                    usage_callback=usage_callback,
+                    schema_profile=schema_profile,
+                    insight_types=insight_types,
+                )
+            else:
+                result = await self.extract_insight(
+                    api_key=api_key,
+                    model_name=model_name,
+                    content=content,
+                    file_name=file_name,
+                    file_type=file_type,
+                    usage_callback=usage_callback,
+                    schema_profile=schema_profile,
+                    insight_types=insight_types,
+                )
+            logger.info("AI analysis completed successfully.")
+
+            # Step 5: Resolve locations against the original content; reduced content keeps its sentences verbatim, so snippets still match
+            if self.resolve_locations is not None:
+                with tracer.start_as_current_span("resolve locations"):
+                    result = await run_in_threadpool(self.resolve_locations, result, content_index)
 
 
         return result
\ No newline at end of file
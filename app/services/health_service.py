@@ -0,0 +1,186 @@
+import asyncio
+from logging import getLogger
+from typing import Callable, Optional
+
+from anyio.to_thread import current_default_thread_limiter
+from starlette.concurrency import run_in_threadpool
+
+from ..core.metrics.event_loop_monitor import EventLoopMonitor
+from ..core.metrics.in_flight_gauge import InFlightGauge
+from ..schemas.health_check import HealthCheck
+from ..schemas.health_report import HealthReport
+
+logger = getLogger(__name__)
+
+
+class HealthService:
+
+    """
+
+    Service responsible for the liveness and readiness checks of the worker.
+
+    Liveness only tells whether the event loop still runs. Readiness tells whether the worker should
+    receive more traffic: it fails when the event loop lags, when work queues up for the thread pool
+    used by `run_in_threadpool`, when too many LLM calls are in flight, or when Redis is unreachable.
+
+
+    Usage:
+    ------
+    ```python
+    service = HealthService(event_loop_monitor, llm_calls_in_flight)
+    report = await service.check_readiness()
+    ```
+
+    """
+
+    def __init__(
+        self,
+        event_loop_monitor: EventLoopMonitor,
+        llm_calls_in_flight: InFlightGauge,
+        check_redis: Optional[Callable[[], bool]] = None,
+        max_event_loop_lag_ms: float = 500.0,
+        max_executor_queue_depth: int = 16,
+        max_in_flight_llm_calls: Optional[int] = None,
+        redis_timeout: float = 1.0,
+    ) -> None:
+
+        """
+
+        Constructor for HealthService.
+
+
+        Parameters
+        ----------
+        event_loop_monitor : EventLoopMonitor
+            The monitor measuring the event-loop lag.
+
+        llm_calls_in_flight : InFlightGauge
+            The gauge of the running LLM calls.
+
+        check_redis : Callable, optional
+            Blocking function that returns whether Redis is reachable. The default value is `None`.
+            If `None`, Redis is not checked.
+
+        max_event_loop_lag_ms : float, optional
+            Highest event-loop lag, in milliseconds, of a ready worker. The default value is `500.0`.
+
+        max_executor_queue_depth : int, optional
+            Most calls waiting for a thread of a ready worker. The default value is `16`.
+
+        max_in_flight_llm_calls : int, optional
+            Most running LLM calls of a ready worker. The default value is `None`.
+            If `None`, the LLM calls are only reported.
+
+        redis_timeout : float, optional
+            Seconds after which Redis is considered unreachable. The default value is `1.0`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(event_loop_monitor, EventLoopMonitor):
+            raise TypeError(f"event_loop_monitor must be an EventLoopMonitor instance. Received: {event_loop_monitor} with type {type(event_loop_monitor)}")
+        if not isinstance(llm_calls_in_flight, InFlightGauge):
+            raise TypeError(f"llm_calls_in_flight must be an InFlightGauge instance. Received: {llm_calls_in_flight} with type {type(llm_calls_in_flight)}")
+        if check_redis is not None and not isinstance(check_redis, Callable):
+            raise TypeError(f"check_redis must be a callable. Received: {check_redis} with type {type(check_redis)}")
+
+
+        self.event_loop_monitor = event_loop_monitor
+        self.llm_calls_in_flight = llm_calls_in_flight
+        self.check_redis = check_redis
+        self.max_event_loop_lag_ms = max_event_loop_lag_ms
+        self.max_executor_queue_depth = max_executor_queue_depth
+        self.max_in_flight_llm_calls = max_in_flight_llm_calls
+        self.redis_timeout = redis_timeout
+
+
+    def check_liveness(self) -> HealthReport:
+
+        """
+
+        Checks that the event loop runs.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        report : HealthReport
+            The liveness report, healthy as long as the event loop is measured.
+
+        """
+
+        event_loop = HealthCheck(
+            healthy=self.event_loop_monitor.running,
+            value=round(self.event_loop_monitor.lag_ms, 2),
+            detail=None if self.event_loop_monitor.running else "The event loop monitor is not running.",
+        )
+
+
+        return HealthReport(healthy=event_loop.healthy, checks={"event_loop_lag_ms": event_loop})
+
+
+    async def check_readiness(self) -> HealthReport:
+
+        """
+
+        Checks whether the worker can take more traffic.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        report : HealthReport
+            The readiness report, healthy only if every check passes.
+
+        """
+
+        max_lag_ms = self.event_loop_monitor.max_lag_ms()
+        thread_limiter = current_default_thread_limiter().statistics()
+        llm_calls = self.llm_calls_in_flight.value
+
+        checks = {
+            "event_loop_lag_ms": HealthCheck(
+                healthy=self.event_loop_monitor.running and max_lag_ms <= self.max_event_loop_lag_ms,
+                value=round(max_lag_ms, 2),
+                threshold=self.max_event_loop_lag_ms,
+                detail=f"Highest lag within the last {self.event_loop_monitor.window:g} seconds.",
+            ),
+            "executor_queue_depth": HealthCheck(
+                healthy=thread_limiter.tasks_waiting <= self.max_executor_queue_depth,
+                value=thread_limiter.tasks_waiting,
+                threshold=self.max_executor_queue_depth,
+                detail=f"{thread_limiter.borrowed_tokens} of {thread_limiter.total_tokens:g} threads busy.",
+            ),
+            "in_flight_llm_calls": HealthCheck(
+                healthy=self.max_in_flight_llm_calls is None or llm_calls <= self.max_in_flight_llm_calls,
+                value=llm_calls,
+                threshold=self.max_in_flight_llm_calls,
+            ),
+        }
+
+        if self.check_redis is not None:
+            try:
+                reachable = await asyncio.wait_for(run_in_threadpool(self.check_redis), timeout=self.redis_timeout)
+                detail = None if reachable else "Redis did not answer the ping."
+            except asyncio.TimeoutError:
+                reachable, detail = False, f"Redis did not answer within {self.redis_timeout:g} seconds."
+            checks["redis"] = HealthCheck(healthy=reachable, detail=detail)
+
+        report = HealthReport(healthy=all(check.healthy for check in checks.values()), checks=checks)
+        if not report.healthy:
+            logger.warning("Worker not ready: %s.", ", ".join(name for name, check in checks.items() if not check.healthy))
+
+
+        return report
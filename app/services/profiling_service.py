@@ -0,0 +1,216 @@
+import asyncio
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from ..core.diagnostics.stack_sampler import StackSampler
+from ..utils.lru_cache import LRUCache
+
+logger = getLogger(__name__)
+
+
+class ProfilingService:
+
+    """
+
+    Service responsible for the on-demand profiles of the worker, taken with the `StackSampler`.
+
+    A worker profile samples every thread of the worker for a number of seconds, or until a number
+    of analyses completed. A request profile only samples the event loop while the task of a
+    single request runs, and is kept for later download under the ID of the request.
+
+
+    Usage:
+    ------
+    ```python
+    service = ProfilingService(interval=0.01)
+    collapsed_stacks = await service.profile_worker(seconds=30)
+
+    async with service.profile_request(request_id):
+        ...
+    collapsed_stacks = service.get_profile(request_id)
+    ```
+
+    """
+
+    def __init__(self, interval: float = 0.01, max_seconds: float = 300.0, max_stored_profiles: int = 32) -> None:
+
+        """
+
+        Constructor for ProfilingService.
+
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two samples. The default value is `0.01`.
+
+        max_seconds : float, optional
+            Longest worker profile, in seconds, including those waiting for analyses. The default value is `300.0`.
+
+        max_stored_profiles : int, optional
+            Number of request profiles kept for download. The default value is `32`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError(f"interval must be a positive number. Received: {interval} with type {type(interval)}")
+        if not isinstance(max_seconds, (int, float)) or max_seconds <= 0:
+            raise ValueError(f"max_seconds must be a positive number. Received: {max_seconds} with type {type(max_seconds)}")
+
+
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.profiles = LRUCache(max_entries=max_stored_profiles)
+        self.worker_sampler: Optional[StackSampler] = None
+        self.remaining_analyses: Optional[int] = None
+        self.analyses_completed = asyncio.Event()
+
+
+    async def profile_worker(self, seconds: Optional[float] = None, analyses: Optional[int] = None) -> str:
+
+        """
+
+        Profiles every thread of the worker.
+
+
+        Parameters
+        ----------
+        seconds : float, optional
+            How long to profile. The default value is `None`.
+            If `None`, the profile runs until `analyses` analyses completed, or for `max_seconds`.
+
+        analyses : int, optional
+            Number of analyses after which the profile stops. The default value is `None`.
+            If both are given, the profile stops at whichever comes first.
+
+
+        Returns
+        -------
+        collapsed_stacks : str
+            The sampled stacks in the collapsed format.
+
+        """
+
+        if seconds is None and analyses is None:
+            raise HTTPException(400, "Either seconds or analyses must be given.")
+        if seconds is not None and not 0 < seconds <= self.max_seconds:
+            raise HTTPException(400, f"seconds must be between 0 and {self.max_seconds:g}.")
+        if analyses is not None and analyses < 1:
+            raise HTTPException(400, "analyses must be a positive integer.")
+        if self.worker_sampler is not None:
+            raise HTTPException(409, "A profile of this worker is already running.")
+
+
+        self.worker_sampler = sampler = StackSampler(interval=self.interval)
+        self.remaining_analyses = analyses
+        self.analyses_completed.clear()
+        logger.info("Profiling the worker for %s.", f"{seconds:g} seconds" if seconds is not None else f"{analyses} analyses")
+
+        sampler.start()
+        try:
+            await asyncio.wait_for(self.analyses_completed.wait(), timeout=seconds if seconds is not None else self.max_seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Joining the sampling thread takes up to one interval, so it is kept off the event loop
+            await run_in_threadpool(sampler.stop)
+            self.worker_sampler = None
+            self.remaining_analyses = None
+
+        logger.info("Worker profile finished with %d samples.", sampler.samples)
+
+
+        return sampler.render_collapsed()
+
+
+    def analysis_completed(self) -> None:
+
+        """
+
+        Counts a completed analysis towards the running worker profile, if any.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.remaining_analyses is None:
+            return
+
+
+        self.remaining_analyses -= 1
+        if self.remaining_analyses <= 0:
+            self.analyses_completed.set()
+
+
+    @asynccontextmanager
+    async def profile_request(self, profile_id: str) -> AsyncIterator[None]:
+
+        """
+
+        Profiles the current task for the duration of the context, and stores the profile under `profile_id`.
+
+
+        Parameters
+        ----------
+        profile_id : str
+            The ID the profile is stored under, e.g., the request ID.
+
+
+        Returns
+        -------
+        context : AsyncIterator
+            The profiling context.
+
+        """
+
+        sampler = StackSampler(interval=self.interval, task=asyncio.current_task())
+        sampler.start()
+        try:
+            yield
+        finally:
+            await run_in_threadpool(sampler.stop)
+            self.profiles[profile_id] = sampler.render_collapsed()
+            logger.info("Request profile %s stored with %d samples.", profile_id, sampler.samples)
+
+
+    def get_profile(self, profile_id: str) -> str:
+
+        """
+
+        Returns a stored request profile.
+
+
+        Parameters
+        ----------
+        profile_id : str
+            The ID of the profile.
+
+
+        Returns
+        -------
+        collapsed_stacks : str
+            The sampled stacks in the collapsed format.
+
+        """
+
+        try:
+            return self.profiles[profile_id]
+        except KeyError:
+            raise HTTPException(404, f"No profile {profile_id} is stored on this worker.")
@@ -1,10 +1,10 @@
 
-from typing import Literal, get_args
+from typing import Literal, Optional, get_args
 
 from pydantic_ai.models import KnownModelName
 
 
-def fetch_model_list() -> dict[str, list[dict[str, str]]]:
+def fetch_model_list(include_stub_model: bool = False, auto_model_providers: Optional[list[str]] = None) -> dict[str, list[dict[str, str]]]:
 
     """
 
@@ -15,7 +15,12 @@ def fetch_model_list() -> dict[str, list[dict[str, str]]]:
     
     Parameters
     ----------
-    None
+    include_stub_model : bool, optional
+        Whether to list the offline `local:stub` model under the "Local" provider. The default value is `False`.
+
+    auto_model_providers : list, optional
+        Providers to list an `auto:<provider>` model for, which routes each document to a registered model of that provider, under the "Auto" provider. The default value is `None`.
+        If `None` or empty, no `auto` model is listed.
 
     
     Returns
@@ -30,6 +35,12 @@ def fetch_model_list() -> dict[str, list[dict[str, str]]]:
 
     """
 
+    if not isinstance(include_stub_model, bool):
+        raise TypeError(f"include_stub_model must be a boolean. Received: {include_stub_model} with type {type(include_stub_model)}")
+    if auto_model_providers is not None and (not isinstance(auto_model_providers, list) or not all(isinstance(provider, str) for provider in auto_model_providers)):
+        raise TypeError(f"auto_model_providers must be a list of strings. Received: {auto_model_providers} with type {type(auto_model_providers)}")
+
+
     inner_literal = next(
         v for k, v in vars(KnownModelName).items() 
         if isinstance(v, type(Literal['a']))
@@ -38,6 +49,7 @@ def fetch_model_list() -> dict[str, list[dict[str, str]]]:
     
 
     structured_models: dict[str, list[dict[str, str]]] = {}
+    seen_models: set[tuple[str, str]] = set()
 
     for model_string in sorted(model_list):
         try:
@@ -54,19 +66,21 @@ def fetch_model_list() -> dict[str, list[dict[str, str]]]:
                 structured_models[provider_display] = []
 
             # Check for uniqueness before appending the model
-            is_unique = True
-            for existing_model in structured_models[provider_display]:
-                if existing_model["name"] == model_name:
-                    is_unique = False
-                    break
-            
-            if is_unique:
+            if (provider_display, model_name) not in seen_models:
+                seen_models.add((provider_display, model_name))
                 structured_models[provider_display].append({
                     "value": f"{provider}:{model_name}",
                     "name": model_name
                 })
         except ValueError:
             continue
+
+    if include_stub_model:
+        structured_models["Local"] = [{"value": "local:stub", "name": "stub"}]
+
+    if auto_model_providers:
+        # One entry per provider, as the API key of a request only works with the models of its provider
+        structured_models["Auto"] = [{"value": f"auto:{provider}", "name": provider} for provider in auto_model_providers]
             
 
     # Sort providers alphabetically
@@ -0,0 +1,15 @@
+from typing import NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+
+    """
+
+    Statistics of a cache, with the fields of the `cache_info()` of `functools.cache`.
+
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
@@ -0,0 +1,198 @@
+import gzip
+from typing import Iterable, Optional
+
+import brotli
+
+# Encodings in order of preference when the client accepts several with the same weight
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+_COMPRESSIBLE_MEDIA_TYPES = frozenset({
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+})
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+
+    """
+
+    Checks whether a media type benefits from compression (text, JSON, JavaScript, XML, SVG).
+
+
+    Parameters
+    ----------
+    content_type : str or None
+        The Content-Type header value.
+
+
+    Returns
+    -------
+    compressible : bool
+        Whether the media type is compressible.
+
+    """
+
+    if not content_type:
+        return False
+
+
+    media_type = content_type.split(";", 1)[0].strip().lower()
+
+
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in _COMPRESSIBLE_MEDIA_TYPES
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+
+    """
+
+    Picks the content encoding for a response from the client's Accept-Encoding header.
+
+
+    Parameters
+    ----------
+    accept_encoding : str or None
+        The Accept-Encoding header value.
+
+    available : Iterable[str], optional
+        The encodings the response is available in, in order of preference. The default value is `SUPPORTED_ENCODINGS`.
+
+
+    Returns
+    -------
+    encoding : str or None
+        The encoding with the highest weight, or None if the response should not be encoded.
+
+    """
+
+    if not accept_encoding:
+        return None
+
+
+    weights: dict[str, float] = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, _, parameters = entry.strip().partition(";")
+        weight = 1.0
+        parameter_name, _, parameter_value = parameters.strip().partition("=")
+        if parameter_name.strip() == "q":
+            try:
+                weight = float(parameter_value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    best_encoding, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best_encoding, best_weight = encoding, weight
+
+
+    return best_encoding
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+
+    """
+
+    Compresses a body with the given content encoding.
+
+
+    Parameters
+    ----------
+    body : bytes
+        The body to compress.
+
+    encoding : str
+        The content encoding, `"br"` or `"gzip"`.
+
+    gzip_level : int, optional
+        The gzip compression level, from 1 to 9. The default value is `6`.
+
+    brotli_quality : int, optional
+        The Brotli quality, from 0 to 11. The default value is `4`.
+
+
+    Returns
+    -------
+    compressed_body : bytes
+        The compressed body.
+
+    """
+
+    if not isinstance(body, bytes):
+        raise TypeError(f"body must be bytes. Received: {body} with type {type(body)}")
+
+
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == "gzip":
+        # A fixed mtime keeps the output, and therefore the ETags of precompressed files, deterministic
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+    raise ValueError(f"Invalid encoding: {encoding}. Must be one of: {', '.join(SUPPORTED_ENCODINGS)}")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+
+    """
+
+    Derives the ETag of an encoded representation from the ETag of the identity one.
+
+    A compressed body is a different representation, so a strong ETag gets the encoding as a
+    suffix (e.g., `"3f2b-br"`) and stays strong; a weak ETag is kept as it is.
+
+
+    Parameters
+    ----------
+    etag : str
+        The ETag of the identity representation.
+
+    encoding : str
+        The content encoding of the body.
+
+
+    Returns
+    -------
+    etag : str
+        The ETag of the encoded representation.
+
+    """
+
+    if not etag.startswith('"'):
+        return etag
+
+
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def identity_etag(etag: str) -> str:
+
+    """
+
+    Removes the encoding suffix added by `encoded_etag`, if any.
+
+
+    Parameters
+    ----------
+    etag : str
+        An ETag, e.g., from an If-None-Match header.
+
+
+    Returns
+    -------
+    etag : str
+        The ETag of the identity representation.
+
+    """
+
+    for encoding in SUPPORTED_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return f'{etag[:-len(suffix)]}"'
+
+
+    return etag
@@ -0,0 +1,230 @@
+from bisect import bisect_right
+from functools import cached_property
+import re
+from typing import Literal, Optional
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+
+class ContentIndex:
+
+    """
+
+    Compact structural index of parsed content, used to turn character offsets into
+    human-readable locations and to find snippets in the content.
+
+    Section boundaries (pages, sheets) are recorded by the file parser while it builds the
+    text. Line boundaries and the whitespace-normalised search text are derived lazily from
+    the content on first use, and are all stored as NumPy offset arrays.
+
+
+    Usage
+    -----
+    ```python
+    content, file_type, content_index = FileParser().get_indexed_content_from_file(file_bytes, "report.pdf")
+    span = content_index.find("revenue grew by 12%")
+    if span:
+        content_index.locate(*span)  # e.g., "Page 3, Line 14"
+    ```
+
+    """
+
+    def __init__(self,
+                 content: str,
+                 location_style: Literal["line", "paragraph", "page", "sheet"] = "line",
+                 sections: Optional[list[tuple[int, str]]] = None) -> None:
+
+        """
+
+        Constructor for the Content Index.
+
+
+        Parameters
+        ----------
+        content : str
+            The parsed content.
+
+        location_style : str, optional
+            How locations are described. The default value is `"line"`.
+                The options are:
+                    `"line"`
+                        "Line 12" or "Lines 12-15".
+                    `"paragraph"`
+                        "Paragraph 4", for formats with one paragraph per line.
+                    `"page"`
+                        "Page 3, Line 14", relative to the page.
+                    `"sheet"`
+                        "Sheet 'Q3', Row 7", relative to the data rows of the sheet.
+
+        sections : list, optional
+            Start offsets and labels of the sections (e.g., `(0, "Page 1")`), in increasing offset order. The default value is `None`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(content, str):
+            raise TypeError(f"content must be a string. Received: {content} with type {type(content)}")
+        if location_style not in {"line", "paragraph", "page", "sheet"}:
+            raise ValueError(f"Invalid location_style: {location_style}. Must be one of: line, paragraph, page, sheet")
+
+
+        self.content = content
+        self.location_style = location_style
+        self.section_starts = np.array([offset for offset, _ in sections or []], dtype=np.int64)
+        self.section_labels = [label for _, label in sections or []]
+
+
+    @cached_property
+    def line_starts(self) -> np.ndarray:
+
+        """
+
+        Start offset of every line of the content.
+
+        """
+
+        # UTF-32 gives one code unit per character, so positions in the array are character offsets
+        code_points = np.frombuffer(self.content.encode("utf-32-le"), dtype=np.uint32)
+        return np.concatenate(([0], np.flatnonzero(code_points == ord("\n")) + 1))
+
+
+    @cached_property
+    def _search_index(self) -> tuple[str, np.ndarray, np.ndarray]:
+
+        """
+
+        Lower-cased, whitespace-collapsed search text, with the start offsets of each word in
+        the search text and in the original content.
+
+        """
+
+        matches = list(_TOKEN_PATTERN.finditer(self.content))
+        words = [match.group().lower() for match in matches]
+        original_starts = np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches))
+        search_starts = np.zeros(len(words), dtype=np.int64)
+        if words:
+            search_starts[1:] = np.cumsum([len(word) + 1 for word in words[:-1]])
+        return " ".join(words), search_starts, original_starts
+
+
+    def _to_original_offset(self, search_offset: int) -> int:
+
+        """
+
+        Maps an offset in the search text back to the content.
+
+
+        Parameters
+        ----------
+        search_offset : int
+            Offset in the search text.
+
+
+        Returns
+        -------
+        offset : int
+            The corresponding offset in the content.
+
+        """
+
+        _, search_starts, original_starts = self._search_index
+        word = bisect_right(search_starts, search_offset) - 1
+        return int(original_starts[word] + (search_offset - search_starts[word]))
+
+
+    def find(self, snippet: str, min_anchor_chars: int = 60) -> Optional[tuple[int, int]]:
+
+        """
+
+        Finds a snippet in the content, ignoring case and whitespace differences.
+
+        If the whole snippet is not found (e.g., it was paraphrased in the middle), its first and
+        then its last `min_anchor_chars` characters are tried on their own.
+
+
+        Parameters
+        ----------
+        snippet : str
+            The snippet to find.
+
+        min_anchor_chars : int, optional
+            Length of the prefix and suffix anchors used as a fallback. The default value is `60`.
+
+
+        Returns
+        -------
+        span : tuple or None
+            The start and end offsets of the match in the content, or None if it was not found.
+
+        """
+
+        if not isinstance(snippet, str):
+            raise TypeError(f"snippet must be a string. Received: {snippet} with type {type(snippet)}")
+
+
+        search_text = self._search_index[0]
+        needle = " ".join(snippet.lower().split())
+        if not needle:
+            return None
+
+        candidates = [needle]
+        if len(needle) > min_anchor_chars:
+            candidates += [needle[:min_anchor_chars], needle[-min_anchor_chars:]]
+
+        for candidate in candidates:
+            position = search_text.find(candidate)
+            if position != -1:
+                return self._to_original_offset(position), self._to_original_offset(position + len(candidate) - 1) + 1
+
+
+        return None
+
+
+    def locate(self, start: int, end: int) -> str:
+
+        """
+
+        Describes the span between two offsets as a human-readable location.
+
+
+        Parameters
+        ----------
+        start : int
+            Start offset of the span.
+
+        end : int
+            End offset of the span (exclusive).
+
+
+        Returns
+        -------
+        location : str
+            The location, e.g., "Lines 12-15", "Page 3, Line 14", or "Sheet 'Q3', Row 7".
+
+        """
+
+        first_line = int(np.searchsorted(self.line_starts, start, side="right")) - 1
+        last_line = int(np.searchsorted(self.line_starts, max(start, end - 1), side="right")) - 1
+
+        section = int(np.searchsorted(self.section_starts, start, side="right")) - 1
+        if self.location_style in {"page", "sheet"} and section >= 0:
+            # Line 0 of a section is the parser's section marker
+            section_line = first_line - (int(np.searchsorted(self.line_starts, self.section_starts[section], side="right")) - 1)
+            label = self.section_labels[section]
+            if self.location_style == "page":
+                return f"{label}, Line {section_line}"
+            # Markdown tables start with a header line and a separator line
+            return f"{label}, Row {section_line - 2}" if section_line > 2 else f"{label}, Header"
+
+        unit = "Paragraph" if self.location_style == "paragraph" else "Line"
+        if first_line == last_line:
+            return f"{unit} {first_line + 1}"
+
+
+        return f"{unit}s {first_line + 1}-{last_line + 1}"
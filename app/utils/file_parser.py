@@ -1,12 +1,19 @@
+import codecs
 import io
 import os
-from typing import Union
+import time
+from typing import Callable, Optional, Union
 
 from bs4 import BeautifulSoup
 from docx import Document
 import fitz
+from opentelemetry import trace
 import pandas as pd
 
+from .content_index import ContentIndex
+
+tracer = trace.get_tracer(__name__)
+
 
 class FileParser:
 
@@ -18,11 +25,11 @@ class FileParser:
     
     Usage
     -----
-    You must call the get_content_from_file method from the class instance.
+    You must call the get_content_from_file or get_indexed_content_from_file method from the class instance.
 
     """
 
-    def __init__(self) -> None:
+    def __init__(self, parse_callback: Optional[Callable[[str, int, float], None]] = None) -> None:
 
         """
 
@@ -31,7 +38,8 @@ class FileParser:
         
         Parameters
         ----------
-        None.
+        parse_callback : Callable, optional
+            Called with the extension, the size in bytes, and the parse time in seconds of every parsed file. The default value is `None`.
 
         
         Returns
@@ -40,6 +48,11 @@ class FileParser:
 
         """
 
+        if parse_callback is not None and not isinstance(parse_callback, Callable):
+            raise TypeError(f"parse_callback must be a callable. Received: {parse_callback} with type {type(parse_callback)}")
+
+
+        self.parse_callback = parse_callback
         self.parsers = {
             ".txt": ("Text", self._extract_text_from_txt),
             ".md": ("Markdown", self._extract_text_from_txt),
@@ -54,8 +67,23 @@ class FileParser:
             ".xml": ("XML", self._extract_text_from_html)
         }
 
+        # How locations are described in the content index. Extensions not listed use line numbers.
+        self.location_styles = {
+            ".pdf": "page",
+            ".docx": "paragraph",
+            ".xlsx": "sheet",
+        }
+
+        # Leading bytes of the binary formats, and how far into the file they may start. Other formats must be UTF-8 text.
+        ## PDF readers accept a header within the first 1024 bytes; DOCX and XLSX are ZIP archives
+        self.signatures = {
+            ".pdf": (b"%PDF-", 1024),
+            ".docx": (b"PK\x03\x04", 0),
+            ".xlsx": (b"PK\x03\x04", 0),
+        }
+
 
-    def _extract_text_from_txt(self, stream: io.BytesIO) -> str:
+    def _extract_text_from_txt(self, stream: io.BytesIO, sections: list[tuple[int, str]]) -> str:
 
         """
 
@@ -67,6 +95,9 @@ class FileParser:
         stream : io.BytesIO
             An in-memory binary stream of the file content.
 
+        sections : list
+            Receives the section boundaries. Unused, as plain text has no sections.
+
             
         Returns
         -------
@@ -78,7 +109,7 @@ class FileParser:
         return stream.read().decode("utf-8")
     
 
-    def _extract_text_from_pdf(self, stream: io.BytesIO) -> str:
+    def _extract_text_from_pdf(self, stream: io.BytesIO, sections: list[tuple[int, str]]) -> str:
 
         """
 
@@ -90,6 +121,9 @@ class FileParser:
         stream : io.BytesIO
             An in-memory binary stream of the PDF content.
 
+        sections : list
+            Receives the start offset and label of every page.
+
             
         Returns
         -------
@@ -101,6 +135,7 @@ class FileParser:
         text = ""
         with fitz.open(stream=stream, filetype="pdf") as doc:
             for page_num, page in enumerate(doc, start=1):
+                sections.append((len(text), f"Page {page_num}"))
                 text += f"--- Page {page_num} ---\n"
                 text += page.get_text() + "\n\n"
 
@@ -108,7 +143,7 @@ class FileParser:
         return text
 
 
-    def _extract_text_from_docx(self, stream: io.BytesIO) -> str:
+    def _extract_text_from_docx(self, stream: io.BytesIO, sections: list[tuple[int, str]]) -> str:
 
         """
 
@@ -120,6 +155,9 @@ class FileParser:
         stream : io.BytesIO
             An in-memory binary stream of the DOCX content.
 
+        sections : list
+            Receives the section boundaries. Unused, as paragraphs are located by line.
+
             
         Returns
         -------
@@ -130,7 +168,7 @@ class FileParser:
         return "\n".join([p.text for p in Document(stream).paragraphs])
     
 
-    def _extract_text_from_xlsx(self, stream: io.BytesIO) -> str:
+    def _extract_text_from_xlsx(self, stream: io.BytesIO, sections: list[tuple[int, str]]) -> str:
 
         """
 
@@ -142,6 +180,9 @@ class FileParser:
         stream : io.BytesIO
             An in-memory binary stream of the XLSX content.
 
+        sections : list
+            Receives the start offset and label of every sheet.
+
             
         Returns
         -------
@@ -155,6 +196,7 @@ class FileParser:
         for sheet_name in xls.sheet_names:
             df = pd.read_excel(xls, sheet_name=sheet_name).fillna("")
             if not df.empty:
+                sections.append((len(full_text), f"Sheet '{sheet_name}'"))
                 full_text += f"--- Sheet: {sheet_name} ---\n"
                 full_text += df.to_markdown(index=False)
                 full_text += "\n\n"
@@ -163,7 +205,7 @@ class FileParser:
         return full_text
 
 
-    def _extract_text_from_html(self, stream: io.BytesIO) -> str:
+    def _extract_text_from_html(self, stream: io.BytesIO, sections: list[tuple[int, str]]) -> str:
 
         """
 
@@ -175,6 +217,9 @@ class FileParser:
         stream : io.BytesIO
             An in-memory binary stream of the HTML content.
 
+        sections : list
+            Receives the section boundaries. Unused, as HTML is located by line.
+
             
         Returns
         -------
@@ -191,23 +236,73 @@ class FileParser:
         return soup.get_text(separator='\n', strip=True)
 
 
-    def get_content_from_file(self, file_source: Union[str, bytes], filename: str) -> tuple[str, str]:
+    def check_file_signature(self, filename: str, head: bytes) -> None:
+
+        """
+
+        Checks that the first bytes of a file match the format its extension claims, so mislabelled
+        uploads can be rejected before they are read in full.
+
+        
+        Parameters
+        ----------
+        filename : str
+            The original name of the file, used to determine the extension.
+
+        head : bytes
+            The first bytes of the file (e.g., the first few KB of an upload), or the whole file if it is shorter.
+
+            
+        Returns
+        -------
+        None.
+
+        """
+
+        _, extension = os.path.splitext(filename.lower())
+
+        if extension not in self.parsers:
+            raise ValueError(f"Unsupported file format: {extension}. Supported formats are: {', '.join(self.parsers.keys())}.")
+
+
+        if extension in self.signatures:
+            signature, max_offset = self.signatures[extension]
+            if head.find(signature, 0, max_offset + len(signature)) == -1:
+                raise ValueError(f"The content of {filename} is not a valid {self.parsers[extension][0]} file.")
+            return
+
+        # The head may end inside a multi-byte character, so it is decoded incrementally
+        if b"\x00" in head:
+            raise ValueError(f"The content of {filename} is not UTF-8 text.")
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        except UnicodeDecodeError:
+            raise ValueError(f"The content of {filename} is not UTF-8 text.")
+
+
+    def get_content_from_file(self, 
+                              file_source: Union[str, bytes, io.BytesIO], 
+                              filename: str, 
+                              sections: Optional[list[tuple[int, str]]] = None) -> tuple[str, str]:
 
         """
 
         Dispatcher method to select the correct parser based on file extension.
-        Accepts either a file path (str) or file content (bytes).
+        Accepts either a file path (str), file content (bytes), or an in-memory stream of the file content (io.BytesIO).
         Returns a tuple of (content, file_type).
 
         
         Parameters
         ----------
-        file_source : str or bytes
-            Path to the file or the file content as bytes.
+        file_source : str, bytes, or io.BytesIO
+            Path to the file, the file content as bytes, or a stream of the file content, which is read from the start without a copy.
 
         filename : str
             The original name of the file, used to determine the extension.
 
+        sections : list, optional
+            Receives the (start offset, label) pairs of the pages or sheets found while parsing. The default value is `None`.
+
             
         Returns
         -------
@@ -231,8 +326,52 @@ class FileParser:
                 stream = io.BytesIO(f.read())
         elif isinstance(file_source, bytes):
             stream = io.BytesIO(file_source)
+        elif isinstance(file_source, io.BytesIO):
+            stream = file_source
+            stream.seek(0)
         else:
-            raise TypeError(f"Unsupported file_source type: {type(file_source)}. Must be str or bytes.")
+            raise TypeError(f"Unsupported file_source type: {type(file_source)}. Must be str, bytes, or io.BytesIO.")
+
+
+        size = stream.getbuffer().nbytes
+        with tracer.start_as_current_span(f"parse {extension}", attributes={"file.extension": extension, "file.type": file_type, "file.size": size}) as span:
+            start_time = time.perf_counter()
+            content = parser_func(stream, sections if sections is not None else [])
+            if self.parse_callback is not None:
+                self.parse_callback(extension, size, time.perf_counter() - start_time)
+            span.set_attribute("content.length", len(content))
+
+
+        return content, file_type
+
+    def get_indexed_content_from_file(self, file_source: Union[str, bytes, io.BytesIO], filename: str) -> tuple[str, str, ContentIndex]:
+
+        """
+
+        Same as get_content_from_file, but also returns the structural index of the content.
+        Returns a tuple of (content, file_type, content_index).
+
+        
+        Parameters
+        ----------
+        file_source : str, bytes, or io.BytesIO
+            Path to the file, the file content as bytes, or a stream of the file content.
+
+        filename : str
+            The original name of the file, used to determine the extension.
+
+            
+        Returns
+        -------
+        result : tuple
+            A tuple containing the extracted content, the file type, and the content index.
+
+        """
+
+        sections: list[tuple[int, str]] = []
+        content, file_type = self.get_content_from_file(file_source, filename, sections)
+
+        _, extension = os.path.splitext(filename.lower())
 
 
-        return parser_func(stream), file_type
\ No newline at end of file
+        return content, file_type, ContentIndex(content, self.location_styles.get(extension, "line"), sections)
\ No newline at end of file
@@ -0,0 +1,156 @@
+from logging import getLogger
+import re
+
+import numpy as np
+
+from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
+from insight_extractor_ai_agent.schemas.location_reference import \
+    LocationReference
+
+from .content_index import ContentIndex
+
+logger = getLogger(__name__)
+
+_PAGE_REFERENCE_PATTERN = re.compile(r"\bPage\s+(\d+)", re.IGNORECASE)
+_LINE_REFERENCE_PATTERN = re.compile(r"\b(?:Lines?|Paragraphs?)\s+(\d+)(?:\s*-\s*(\d+))?", re.IGNORECASE)
+
+
+def _location_exists(location: str, content_index: ContentIndex) -> bool:
+
+    """
+
+    Checks that the pages or lines a location refers to exist in the content.
+    Locations that cannot be checked (e.g., "Review #5") are assumed to exist.
+
+
+    Parameters
+    ----------
+    location : str
+        The location produced by the model.
+
+    content_index : ContentIndex
+        The index of the analysed content.
+
+
+    Returns
+    -------
+    exists : bool
+        Whether the location can refer to the content.
+
+    """
+
+    if content_index.location_style == "page":
+        return all(1 <= int(page) <= len(content_index.section_labels) for page in _PAGE_REFERENCE_PATTERN.findall(location))
+
+    if content_index.location_style in {"line", "paragraph"}:
+        line_count = len(content_index.line_starts)
+        return all(
+            1 <= int(number) <= line_count
+            for numbers in _LINE_REFERENCE_PATTERN.findall(location)
+            for number in numbers if number
+        )
+
+
+    return True
+
+
+def _location_covers(location: str, content_index: ContentIndex, start: int, end: int) -> bool:
+
+    """
+
+    Checks that the pages or lines a location refers to contain a span of the content.
+    Locations that cannot be checked (e.g., "Review #5") are assumed to contain it.
+
+
+    Parameters
+    ----------
+    location : str
+        The location produced by the model.
+
+    content_index : ContentIndex
+        The index of the analysed content.
+
+    start, end : int
+        The start and end offsets of the span (the end is exclusive).
+
+
+    Returns
+    -------
+    covers : bool
+        Whether the location can refer to the span.
+
+    """
+
+    if content_index.location_style == "page":
+        pages = {int(page) for page in _PAGE_REFERENCE_PATTERN.findall(location)}
+        return not pages or bool(pages & {int(page) for page in _PAGE_REFERENCE_PATTERN.findall(content_index.locate(start, end))})
+
+    if content_index.location_style in {"line", "paragraph"}:
+        ranges = [(int(first), int(last or first)) for first, last in _LINE_REFERENCE_PATTERN.findall(location)]
+        first_line = int(np.searchsorted(content_index.line_starts, start, side="right"))
+        last_line = int(np.searchsorted(content_index.line_starts, max(start, end - 1), side="right"))
+        return not ranges or any(first <= last_line and first_line <= last for first, last in ranges)
+
+
+    return True
+
+
+def resolve_locations(report: AnalysisReport, content_index: ContentIndex) -> AnalysisReport:
+
+    """
+
+    Computes and verifies insight locations locally, without another model call.
+
+    The representative snippet of each insight is looked up in the content index; when found,
+    its exact location is put first in the insight's locations, and the locations produced by
+    the model that do not contain it (e.g., lines counted within a chunk of the document) are
+    dropped. Otherwise, the locations that point outside the document (e.g., a page that does
+    not exist) are dropped, as long as at least one location remains.
+
+    The report is not changed: the insights are copied with their new locations, so reports
+    shared with a cache or with other requests stay as they were.
+
+
+    Parameters
+    ----------
+    report : AnalysisReport
+        The report produced by the model.
+
+    content_index : ContentIndex
+        The index of the analysed content.
+
+
+    Returns
+    -------
+    report : AnalysisReport
+        The report with resolved locations.
+
+    """
+
+    if not isinstance(report, AnalysisReport):
+        raise TypeError(f"report must be an AnalysisReport instance. Received: {report} with type {type(report)}")
+    if not isinstance(content_index, ContentIndex):
+        raise TypeError(f"content_index must be a ContentIndex instance. Received: {content_index} with type {type(content_index)}")
+
+
+    insights = []
+    resolved_count = 0
+    for insight in report.insights:
+        span = content_index.find(insight.representative_snippet) if insight.representative_snippet else None
+
+        if span is not None:
+            resolved_location = content_index.locate(*span)
+            locations = [LocationReference(location=resolved_location)] + [
+                location for location in insight.locations
+                if location.location != resolved_location and _location_covers(location.location, content_index, *span)
+            ]
+            resolved_count += 1
+        else:
+            locations = [location for location in insight.locations if _location_exists(location.location, content_index)]
+
+        insights.append(insight.model_copy(update={"locations": locations or insight.locations}))
+
+    logger.info("Resolved the locations of %d of %d insights locally.", resolved_count, len(report.insights))
+
+
+    return report.model_copy(update={"insights": insights})
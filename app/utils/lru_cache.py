@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Hashable
+
+from .cache_info import CacheInfo
+
+
+class LRUCache(MutableMapping):
+
+    """
+
+    Bounded in-process mapping that evicts the least recently used entry when full.
+
+    Reads through `[]` or `get` and writes both count as a use. Reads are counted as hits or
+    misses, reported by `cache_info` like those of `functools.cache`.
+
+
+    Usage
+    -----
+    ```python
+    cache = LRUCache(max_entries=1000)
+    cache["key"] = value
+    value = cache.get("key")
+    ```
+
+    """
+
+    def __init__(self, max_entries: int) -> None:
+
+        """
+
+        Constructor for the LRU Cache.
+
+
+        Parameters
+        ----------
+        max_entries : int
+            Maximum number of entries kept in the cache.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError(f"max_entries must be a positive integer. Received: {max_entries} with type {type(max_entries)}")
+
+
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._entries[key]
+
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._entries)
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def cache_info(self) -> CacheInfo:
+
+        """
+
+        Returns the hits, misses, maximum size, and current size of the cache.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        cache_info : CacheInfo
+            The statistics of the cache.
+
+        """
+
+        return CacheInfo(self.hits, self.misses, self.max_entries, len(self._entries))
@@ -0,0 +1,195 @@
+import json
+from logging import getLogger
+from typing import Iterable, Optional
+
+from ..schemas.model_capability import ModelCapability
+from ..schemas.routing_preference import RoutingPreference
+
+logger = getLogger(__name__)
+
+# Model name that asks the service to pick a model of a provider (e.g., "auto:openai"); bare, only when the registry has a single provider
+AUTO_MODEL_NAME = "auto"
+
+
+class ModelRegistry:
+
+    """
+
+    Capabilities of the known models, used to route `auto` requests.
+
+    Each `provider:model` entry describes the context window, typical output throughput,
+    relative cost per token, and the share of runs that produce valid structured output
+    without a retry.
+
+
+    Usage
+    -----
+    ```python
+    registry = ModelRegistry.from_file("model_capabilities.json", available_models=["openai:gpt-4o"])
+    model_name = registry.select(estimated_tokens=12000, preference=RoutingPreference.LATENCY)
+    ```
+
+    """
+
+    def __init__(self, capabilities: dict[str, ModelCapability]) -> None:
+
+        """
+
+        Constructor for the Model Registry.
+
+
+        Parameters
+        ----------
+        capabilities : dict
+            Capabilities keyed by "provider:model" name.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(capabilities, dict) or not all(isinstance(capability, ModelCapability) for capability in capabilities.values()):
+            raise TypeError(f"capabilities must be a dictionary of ModelCapability. Received: {capabilities} with type {type(capabilities)}")
+
+
+        self.capabilities = capabilities
+
+
+    @property
+    def providers(self) -> list[str]:
+
+        """
+
+        Providers of the registered models, in alphabetical order.
+
+        """
+
+        return sorted({model_name.split(":", 1)[0] for model_name in self.capabilities})
+
+
+    @classmethod
+    def from_file(cls, path: str, available_models: Optional[Iterable[str]] = None) -> "ModelRegistry":
+
+        """
+
+        Loads the registry from a JSON file mapping "provider:model" names to capabilities.
+
+
+        Parameters
+        ----------
+        path : str
+            Path of the JSON file.
+
+        available_models : Iterable[str], optional
+            Models this server can run. Entries for other models are skipped. The default value is `None`.
+            If `None`, every entry is kept.
+
+
+        Returns
+        -------
+        registry : ModelRegistry
+            The loaded registry.
+
+        """
+
+        if not isinstance(path, str):
+            raise TypeError(f"path must be a string. Received: {path} with type {type(path)}")
+
+
+        with open(path, encoding="utf-8") as file:
+            entries = json.load(file)
+
+        if available_models is not None:
+            available_models = set(available_models)
+            skipped_models = sorted(set(entries) - available_models)
+            if skipped_models:
+                logger.info("Skipping capabilities of unavailable models: %s", ", ".join(skipped_models))
+            entries = {model_name: entry for model_name, entry in entries.items() if model_name in available_models}
+
+
+        return cls({model_name: ModelCapability(**entry) for model_name, entry in entries.items()})
+
+
+    def select(self,
+               estimated_tokens: int,
+               preference: RoutingPreference = RoutingPreference.LATENCY,
+               provider: Optional[str] = None,
+               output_token_reserve: int = 8192,
+               min_reliability: float = 0.0) -> str:
+
+        """
+
+        Picks the model that best matches the preference among the models whose context
+        window fits the document.
+
+        Expected latency and cost are divided by the structured-output reliability, since
+        an unreliable model pays for its output retries.
+
+
+        Parameters
+        ----------
+        estimated_tokens : int
+            Estimated tokens of the content to analyse.
+
+        preference : RoutingPreference, optional
+            What to optimise. The default value is `RoutingPreference.LATENCY`.
+                The options are:
+                    `RoutingPreference.LATENCY`
+                        The fastest model, with cost as the tie-breaker.
+                    `RoutingPreference.COST`
+                        The cheapest model, with latency as the tie-breaker.
+                    `RoutingPreference.BALANCED`
+                        The lowest product of latency and cost.
+
+        provider : str, optional
+            Restrict the choice to a provider (e.g., "openai"), the one of the API key. The default value is `None`.
+            If `None`, the registered models must all be of a single provider, as a key only works with its own.
+
+        output_token_reserve : int, optional
+            Context window kept free for the system prompt and the generated report. The default value is `8192`.
+
+        min_reliability : float, optional
+            Models less reliable than this are never picked. The default value is `0.0`.
+
+
+        Returns
+        -------
+        model_name : str
+            The selected "provider:model" name.
+
+        """
+
+        if not isinstance(estimated_tokens, int) or estimated_tokens < 0:
+            raise ValueError(f"estimated_tokens must be a non-negative integer. Received: {estimated_tokens} with type {type(estimated_tokens)}")
+        if not isinstance(preference, RoutingPreference):
+            raise TypeError(f"preference must be a RoutingPreference. Received: {preference} with type {type(preference)}")
+        if provider is not None and not isinstance(provider, str):
+            raise TypeError(f"provider must be a string. Received: {provider} with type {type(provider)}")
+        if provider is None and len(self.providers) > 1:
+            raise ValueError(f"The registered models are of several providers; name the one of the API key with auto:<provider>, one of: {', '.join(self.providers)}.")
+
+
+        candidates = [
+            (model_name, capability) for model_name, capability in self.capabilities.items()
+            if (provider is None or model_name.split(":", 1)[0] == provider)
+            and capability.context_window >= estimated_tokens + output_token_reserve
+            and capability.structured_output_reliability >= min_reliability
+        ]
+        if not candidates:
+            raise ValueError(f"No registered model{f' of provider {provider}' if provider else ''} fits a document of about {estimated_tokens} tokens.")
+
+
+        def rank(candidate: tuple[str, ModelCapability]) -> tuple[float, float]:
+            _, capability = candidate
+            latency = 1.0 / (capability.throughput_tokens_per_second * capability.structured_output_reliability)
+            cost = capability.relative_cost / capability.structured_output_reliability
+            if preference == RoutingPreference.LATENCY:
+                return latency, cost
+            if preference == RoutingPreference.COST:
+                return cost, latency
+            return latency * cost, latency
+
+
+        return min(candidates, key=rank)[0]
@@ -0,0 +1,110 @@
+from hashlib import sha256
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .content_encoding import identity_etag
+
+
+class PrecomputedJSON:
+
+    """
+
+    JSON body serialised once, with its strong ETag, for responses whose content does not
+    change for the lifetime of the process. The ETags the compression middleware derives for
+    the compressed bodies (e.g., `"3f2b-br"`) match it too.
+
+
+    Usage
+    -----
+    ```python
+    payload = PrecomputedJSON.from_model(ModelList(providers=fetch_model_list()))
+    if payload.matches(request.headers.get("if-none-match")):
+        ...  # 304 Not Modified
+    ```
+
+    """
+
+    def __init__(self, body: bytes) -> None:
+
+        """
+
+        Constructor for the Precomputed JSON.
+
+
+        Parameters
+        ----------
+        body : bytes
+            The serialised JSON body.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(body, bytes):
+            raise TypeError(f"body must be bytes. Received: {body} with type {type(body)}")
+
+
+        self.body = body
+        self.etag = f'"{sha256(body).hexdigest()[:32]}"'
+
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "PrecomputedJSON":
+
+        """
+
+        Serialises a Pydantic model.
+
+
+        Parameters
+        ----------
+        model : BaseModel
+            The model to serialise.
+
+
+        Returns
+        -------
+        payload : PrecomputedJSON
+            The serialised model.
+
+        """
+
+        if not isinstance(model, BaseModel):
+            raise TypeError(f"model must be a BaseModel instance. Received: {model} with type {type(model)}")
+
+
+        return cls(model.model_dump_json().encode())
+
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+
+        """
+
+        Checks an `If-None-Match` request header against the ETag.
+
+
+        Parameters
+        ----------
+        if_none_match : str or None
+            The value of the `If-None-Match` header, if any.
+
+
+        Returns
+        -------
+        matches : bool
+            Whether the client's cached copy is current.
+
+        """
+
+        if not if_none_match:
+            return False
+
+        # If-None-Match uses the weak comparison, so "W/" prefixes are ignored
+        candidates = {identity_etag(candidate.strip().removeprefix("W/")) for candidate in if_none_match.split(",")}
+
+
+        return "*" in candidates or self.etag in candidates
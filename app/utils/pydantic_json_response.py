@@ -0,0 +1,52 @@
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+
+    """
+
+    JSON response serialised to bytes in a single pass by pydantic-core.
+
+    Pydantic models are dumped with their own serializer, so returning an already validated model
+    (e.g., an `AnalysisReport`) skips the re-validation against the `response_model` and the
+    `jsonable_encoder` round trip FastAPI applies to returned values. Other content, such as error
+    bodies, is serialised by pydantic-core as well; values it cannot serialise are rendered with `str`.
+
+
+    Usage
+    -----
+    ```python
+    return PydanticJSONResponse(report, headers=response.headers)
+    ```
+
+    """
+
+    def render(self, content: Any) -> bytes:
+
+        """
+
+        Serialises the content to JSON bytes.
+
+
+        Parameters
+        ----------
+        content : Any
+            A Pydantic model or any JSON-compatible value.
+
+
+        Returns
+        -------
+        body : bytes
+            The JSON body.
+
+        """
+
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+
+
+        return to_json(content, fallback=str)
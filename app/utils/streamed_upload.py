@@ -0,0 +1,42 @@
+import io
+from typing import Optional
+
+
+class StreamedUpload:
+
+    """
+
+    Multipart form parsed while streaming: the uploaded file, written into the in-memory buffer
+    the file parser reads from, and the values of the other form fields.
+
+
+    Usage
+    -----
+    ```python
+    upload = await StreamingUploadParser().parse(request)
+    content, file_type = FileParser().get_content_from_file(upload.file, upload.filename)
+    ```
+
+    """
+
+    def __init__(self) -> None:
+
+        """
+
+        Constructor for the Streamed Upload.
+
+
+        Parameters
+        ----------
+        None.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.filename: Optional[str] = None
+        self.file = io.BytesIO()
+        self.fields: dict[str, list[str]] = {}
@@ -0,0 +1,248 @@
+from logging import getLogger
+import os
+from typing import Callable, Iterable, Optional
+
+from fastapi import HTTPException, Request
+from opentelemetry import trace
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from .streamed_upload import StreamedUpload
+
+logger = getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class StreamingUploadParser:
+
+    """
+
+    Multipart form parser that validates an upload while it is being received.
+
+    Unlike `File(...)`, which spools the whole body before the endpoint runs, the request body is
+    fed to the multipart parser chunk by chunk and the file is written straight into the buffer the
+    file parser reads from. Requests are rejected as early as possible:
+
+    * `413` when the Content-Length already exceeds the limits, before any byte of the body is read.
+    * `415` when the file extension is not supported, as soon as the part headers arrive.
+    * `415` when the first `sniff_size` bytes do not match the format the extension claims.
+    * `413` as soon as the file or a field grows past its limit while streaming.
+
+
+    Usage
+    -----
+    ```python
+    upload_parser = StreamingUploadParser(allowed_extensions=[".pdf"], check_signature=FileParser().check_file_signature)
+    upload = await upload_parser.parse(request)
+    ```
+
+    """
+
+    def __init__(self,
+                 file_field: str = "file",
+                 allowed_extensions: Optional[Iterable[str]] = None,
+                 check_signature: Optional[Callable[[str, bytes], None]] = None,
+                 max_file_size: int = 20971520,
+                 sniff_size: int = 4096,
+                 max_field_size: int = 16384,
+                 max_fields: int = 16) -> None:
+
+        """
+
+        Constructor for the Streaming Upload Parser.
+
+
+        Parameters
+        ----------
+        file_field : str, optional
+            The name of the form field holding the file. The default value is `"file"`.
+
+        allowed_extensions : Iterable, optional
+            The accepted file extensions, in lower case with a leading dot (e.g., `.pdf`). The default value is `None`.
+            If `None`, any extension is accepted.
+
+        check_signature : Callable, optional
+            Called with the filename and the first `sniff_size` bytes of the file; raises a ValueError if they do not match. The default value is `None`.
+            If `None`, the content is not checked.
+
+        max_file_size : int, optional
+            The maximum size of the file in bytes. The default value is `20971520` (20 MiB).
+
+        sniff_size : int, optional
+            The number of leading bytes handed to `check_signature`. The default value is `4096`.
+
+        max_field_size : int, optional
+            The maximum size of the value of any other field in bytes. The default value is `16384`.
+
+        max_fields : int, optional
+            The maximum number of other fields. The default value is `16`.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(file_field, str):
+            raise TypeError(f"file_field must be a string. Received: {file_field} with type {type(file_field)}")
+        if check_signature is not None and not isinstance(check_signature, Callable):
+            raise TypeError(f"check_signature must be a callable. Received: {check_signature} with type {type(check_signature)}")
+        for name, value in [("max_file_size", max_file_size), ("sniff_size", sniff_size), ("max_field_size", max_field_size), ("max_fields", max_fields)]:
+            if not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer. Received: {value} with type {type(value)}")
+
+
+        self.file_field = file_field
+        self.allowed_extensions = tuple(allowed_extensions) if allowed_extensions is not None else None
+        self.check_signature = check_signature
+        self.max_file_size = max_file_size
+        self.sniff_size = sniff_size
+        self.max_field_size = max_field_size
+        self.max_fields = max_fields
+        # Allows 1024 bytes per part for the boundary and the part headers
+        self.max_request_size = max_file_size + 1024 + max_fields * (max_field_size + 1024)
+
+
+    async def parse(self, request: Request) -> StreamedUpload:
+
+        """
+
+        Parses the multipart body of the request while it streams in.
+
+
+        Parameters
+        ----------
+        request : Request
+            The incoming request, whose body has not been read yet.
+
+
+        Returns
+        -------
+        upload : StreamedUpload
+            The uploaded file and the values of the other fields. `filename` is `None` if no file was sent.
+
+        """
+
+        content_type, options = parse_options_header(request.headers.get("content-type", ""))
+        boundary = options.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(415, "The request body must be multipart/form-data.")
+
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_request_size:
+            raise HTTPException(413, f"The upload exceeds the maximum file size of {self.max_file_size} bytes.")
+
+
+        upload = StreamedUpload()
+        header_field, header_value, field_value = bytearray(), bytearray(), bytearray()
+        part_headers: dict[bytes, bytes] = {}
+        part_name: Optional[str] = None
+        is_file_part, signature_checked, finished = False, False, False
+
+        def check_file_signature() -> None:
+            nonlocal signature_checked
+            signature_checked = True
+            if self.check_signature is None:
+                return
+            with upload.file.getbuffer() as buffer:
+                head = bytes(buffer[:self.sniff_size])
+            try:
+                self.check_signature(upload.filename, head)
+            except ValueError as e:
+                raise HTTPException(415, str(e))
+
+        def on_part_begin() -> None:
+            nonlocal part_name, is_file_part
+            part_headers.clear()
+            field_value.clear()
+            part_name, is_file_part = None, False
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            header_field.extend(memoryview(data)[start:end])
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            header_value.extend(memoryview(data)[start:end])
+
+        def on_header_end() -> None:
+            part_headers[bytes(header_field).lower()] = bytes(header_value)
+            header_field.clear()
+            header_value.clear()
+
+        def on_headers_finished() -> None:
+            nonlocal part_name, is_file_part
+            _, disposition = parse_options_header(part_headers.get(b"content-disposition", b""))
+            part_name = disposition.get(b"name", b"").decode("utf-8", "replace")
+            filename = disposition.get(b"filename")
+
+            if filename is None:
+                if sum(len(values) for values in upload.fields.values()) >= self.max_fields:
+                    raise HTTPException(413, f"The form has more than {self.max_fields} fields.")
+                return
+
+            if part_name != self.file_field or upload.filename is not None:
+                raise HTTPException(400, f"Only one file may be uploaded, in the {self.file_field} field.")
+            upload.filename = filename.decode("utf-8", "replace")
+            is_file_part = True
+
+            # Reject unsupported formats before any byte of the file is received
+            _, extension = os.path.splitext(upload.filename.lower())
+            if self.allowed_extensions is not None and extension not in self.allowed_extensions:
+                raise HTTPException(415, f"Unsupported file format: {extension}. Supported formats are: {', '.join(self.allowed_extensions)}.")
+
+        def on_part_data(data: bytes, start: int, end: int) -> None:
+            if not is_file_part:
+                if len(field_value) + end - start > self.max_field_size:
+                    raise HTTPException(413, f"The {part_name} field exceeds the maximum size of {self.max_field_size} bytes.")
+                field_value.extend(memoryview(data)[start:end])
+                return
+
+            if upload.file.tell() + end - start > self.max_file_size:
+                raise HTTPException(413, f"The upload exceeds the maximum file size of {self.max_file_size} bytes.")
+            upload.file.write(memoryview(data)[start:end])
+            if not signature_checked and upload.file.tell() >= self.sniff_size:
+                check_file_signature()
+
+        def on_part_end() -> None:
+            if is_file_part:
+                # Files shorter than the sniff size are checked once complete
+                if not signature_checked:
+                    check_file_signature()
+                return
+
+            try:
+                upload.fields.setdefault(part_name, []).append(field_value.decode("utf-8"))
+            except UnicodeDecodeError:
+                raise HTTPException(400, f"The {part_name} field is not UTF-8 text.")
+
+        def on_end() -> None:
+            nonlocal finished
+            finished = True
+
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+            "on_end": on_end,
+        })
+        with tracer.start_as_current_span("receive upload") as span:
+            try:
+                async for chunk in request.stream():
+                    parser.write(chunk)
+                parser.finalize()
+            except MultipartParseError as e:
+                raise HTTPException(400, f"Malformed multipart body: {e}")
+            span.set_attribute("file.size", upload.file.tell())
+
+        if not finished:
+            raise HTTPException(400, "Malformed multipart body: the closing boundary is missing.")
+
+        logger.info("Upload %s received (%d bytes).", upload.filename, upload.file.tell())
+
+
+        return upload
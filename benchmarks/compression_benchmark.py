@@ -0,0 +1,85 @@
+"""
+
+Bytes-on-wire and latency benchmark of response compression.
+
+Serialises analysis reports of typical sizes and reports, for each content encoding and level,
+the compressed size and the time it takes to compress, followed by the savings of the static
+files precompressed at startup.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.compression_benchmark --insights 10 100 500
+```
+
+"""
+
+import argparse
+import os
+import time
+
+from app.utils.content_encoding import compress
+from app.utils.precompressed_static_files import PrecompressedStaticFiles
+from insight_extractor_ai_agent.models.stub_model import build_stub_report
+from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
+
+SETTINGS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 1), ("br", 4), ("br", 11)]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_report_body(insights: int) -> bytes:
+
+    """
+
+    Builds the JSON body of an analysis report with the given number of insights.
+
+    """
+
+    content = "\n".join(f"Line {line}: revenue in region {line % 17} grew by {line % 9}% quarter over quarter." for line in range(insights * 20))
+
+
+    return AnalysisReport(**build_stub_report(content, insights_per_report=insights)).model_dump_json().encode()
+
+
+def measure(body: bytes, encoding: str, level: int, repeats: int) -> tuple[int, float]:
+
+    """
+
+    Compresses the body repeatedly and returns the compressed size and the mean time in milliseconds.
+
+    """
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        compressed_body = compress(body, encoding, gzip_level=level, brotli_quality=level)
+
+
+    return len(compressed_body), (time.perf_counter() - start) / repeats * 1000
+
+
+def main(insight_counts: list[int], repeats: int) -> None:
+    print(f"{'insights':>8} {'encoding':>8} {'level':>5} {'bytes':>10} {'ratio':>6} {'ms':>8}")
+    for insights in insight_counts:
+        body = build_report_body(insights)
+        print(f"{insights:>8} {'identity':>8} {'-':>5} {len(body):>10,} {1:>6.2f} {0:>8.3f}")
+        for encoding, level in SETTINGS:
+            size, milliseconds = measure(body, encoding, level, repeats)
+            print(f"{insights:>8} {encoding:>8} {level:>5} {size:>10,} {size / len(body):>6.2f} {milliseconds:>8.3f}")
+
+    print()
+    for directory, html in [("app/static", False), ("app/templates", True)]:
+        static_files = PrecompressedStaticFiles(directory=os.path.join(ROOT, directory), html=html)
+        original_size = sum(size for (_, size), _ in static_files.variants.values())
+        for encoding in ["gzip", "br"]:
+            compressed_size = sum(len(encodings[encoding][0]) if encoding in encodings else size for (_, size), encodings in static_files.variants.values())
+            print(f"{directory}: {len(static_files.variants)} files, {original_size:,} bytes -> {compressed_size:,} bytes with {encoding} (precompressed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--insights", type=int, nargs="+", default=[10, 100, 500], help="Insights per report.")
+    parser.add_argument("--repeats", type=int, default=20, help="Compressions per measurement.")
+    args = parser.parse_args()
+
+    main(args.insights, args.repeats)
@@ -0,0 +1,189 @@
+"""
+
+Micro-benchmark of the logging pipeline.
+
+Logs access records from many concurrent tasks on an event loop, as `AccessLogMiddleware` does
+under load, through the former direct `StreamHandler` with eagerly formatted f-string messages
+and through the queued pipeline of `setup_logging` (text and JSON) with lazy arguments. Reports
+the records per second seen by the event loop, the slowest single call (the longest the loop
+was held by logging), and the time until the records are all written.
+
+The records are written to `--sink` (by default, `os.devnull`). With a fast sink, the queued
+pipeline costs the event loop more than the direct writes, as the listener thread competes for
+the GIL; it pays off once writes block, e.g., on a full stdout pipe to a slow log collector,
+which `--write-latency-ms` simulates.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.logging_benchmark --records 100000 --write-latency-ms 0.05
+```
+
+"""
+
+import argparse
+import asyncio
+from contextlib import redirect_stdout
+import logging
+import os
+import sys
+import time
+from typing import Callable, TextIO
+
+from app.core.logging.log_context import request_id_var
+from app.core.logging.logging_config import setup_logging
+from app.core.logging.logging_formatter import SafeRequestIDFormatter
+from app.core.logging.request_id_filter import RequestIDFilter
+
+ACCESS_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - [request-id=%(request_id)s] - %(message)s"
+CLIENT = ("203.0.113.7", 51234)
+SCOPE = {"method": "POST", "http_version": "1.1"}
+
+
+class SlowStream:
+
+    """
+
+    Stream whose writes block for a fixed time, as those to a full pipe do.
+
+    """
+
+    def __init__(self, stream: TextIO, latency: float) -> None:
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def log_eagerly(logger: logging.Logger, request: int, process_time: float) -> None:
+
+    """
+
+    Logs an access record as `AccessLogMiddleware` did before, with an f-string message.
+
+    """
+
+    logger.info(
+        f"{CLIENT[0]}:{CLIENT[1]} - "
+        f"'{SCOPE["method"]} /api/v1/analyze-document?request={request} HTTP/{SCOPE["http_version"]}' "
+        f"{200}",
+        extra={"process_time_ms": f"{process_time:.2f}"}
+    )
+
+
+def log_lazily(logger: logging.Logger, request: int, process_time: float) -> None:
+
+    """
+
+    Logs an access record as `AccessLogMiddleware` does, with the arguments formatted by the handler.
+
+    """
+
+    logger.info(
+        "%s:%s - '%s %s HTTP/%s' %d",
+        CLIENT[0],
+        CLIENT[1],
+        SCOPE["method"],
+        f"/api/v1/analyze-document?request={request}",
+        SCOPE["http_version"],
+        200,
+        extra={"process_time_ms": round(process_time, 2)}
+    )
+
+
+async def measure(log: Callable[[logging.Logger, int, float], None], records: int, concurrency: int) -> tuple[float, float]:
+
+    """
+
+    Logs the records from concurrent tasks, and returns the records per second and the slowest call in milliseconds.
+
+    """
+
+    logger = logging.getLogger("IEAIA.access")
+    per_task = records // concurrency
+    slowest = 0.0
+
+    async def handle_requests(task: int) -> None:
+        nonlocal slowest
+        for request in range(per_task):
+            request_id_var.set(f"{task}-{request}")
+            start = time.perf_counter()
+            log(logger, request, 12.34)
+            slowest = max(slowest, time.perf_counter() - start)
+            # Yields to the other tasks, as a request awaiting its response would
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handle_requests(task) for task in range(concurrency)))
+
+
+    return per_task * concurrency / (time.perf_counter() - start), slowest * 1000
+
+
+def configure_direct(stream) -> None:
+
+    """
+
+    Configures the access logger with the former direct `StreamHandler`.
+
+    """
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(SafeRequestIDFormatter(ACCESS_FORMAT))
+    logger = logging.getLogger("IEAIA.access")
+    logger.handlers = [handler]
+    logger.filters = [RequestIDFilter()]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def main(records: int, concurrency: int, sink: str, write_latency_ms: float) -> None:
+    with open(sink, "w", encoding="utf-8") as file:
+        stream = SlowStream(file, write_latency_ms / 1000) if write_latency_ms > 0 else file
+        with redirect_stdout(stream):
+            run_pipelines(records, concurrency, stream)
+
+
+def run_pipelines(records: int, concurrency: int, stream: TextIO) -> None:
+
+    """
+
+    Runs the records through each pipeline, writing to the stream, and prints the results.
+
+    """
+
+    for name, configure, log in [
+        ("direct", lambda: configure_direct(stream), log_eagerly),
+        ("queued text", lambda: setup_logging(handler_log_level="INFO", log_format="text"), log_lazily),
+        ("queued json", lambda: setup_logging(handler_log_level="INFO", log_format="json"), log_lazily),
+    ]:
+        configure()
+        start = time.perf_counter()
+        records_per_second, slowest_ms = asyncio.run(measure(log, records, concurrency))
+        # Closing a queue handler waits for its queued records to be written
+        for handler in logging.getLogger("IEAIA.access").handlers:
+            handler.flush()
+            handler.close()
+        written_seconds = time.perf_counter() - start
+        print(
+            f"{name:>12}: {records_per_second:>10,.0f} records/sec on the event loop, "
+            f"slowest call {slowest_ms:6.2f} ms, all written after {written_seconds:.2f} s",
+            file=sys.__stdout__
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000, help="Access records logged per pipeline.")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent tasks logging the records.")
+    parser.add_argument("--sink", default=os.devnull, help="The file the records are written to.")
+    parser.add_argument("--write-latency-ms", type=float, default=0.0, help="Time each write to the sink blocks for.")
+    args = parser.parse_args()
+
+    main(args.records, args.concurrency, args.sink, args.write_latency_ms)
@@ -0,0 +1,130 @@
+"""
+
+Micro-benchmark of the in-process rate limit storage under a scan of unique client addresses.
+
+Checks one request from each of `--addresses` synthetic client addresses against the default
+limits, as SlowAPI does for each request (a hit per limit, then the stats of the reported limit
+for the headers), through the former unbounded storage (a single dictionary and lock, never
+pruned) and through `MemoryTokenBucketStorage` with `--max-keys`. Reports the checks per second,
+the buckets kept, and the memory they hold, measured object by object and, for the bounded
+storage, as it estimates itself for the metrics.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.rate_limit_memory_benchmark --addresses 1000000 --max-keys 100000
+```
+
+"""
+
+import argparse
+from ipaddress import IPv4Address
+import sys
+import threading
+import time
+
+from limits import parse
+
+from app.core.rate_limit.memory_token_bucket_storage import \
+    MemoryTokenBucketStorage
+from app.core.rate_limit.token_bucket_rate_limiter import \
+    TokenBucketRateLimiter
+
+LIMITS = [parse(limit) for limit in ["50/minute", "300/hour", "1000/day"]]
+
+
+class UnboundedTokenBucketStorage(MemoryTokenBucketStorage):
+
+    """
+
+    The former in-process storage: every bucket in a single dictionary under a single lock, until the process exits.
+
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, refill_rate: float, cost: float) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self.lock:
+            tokens = self._refill_bucket(key, capacity, refill_rate, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.buckets[key] = (tokens, now)
+        return allowed, tokens
+
+    def peek(self, key: str, capacity: float, refill_rate: float) -> float:
+        with self.lock:
+            return self._refill_bucket(key, capacity, refill_rate, time.monotonic())
+
+    def _refill_bucket(self, key: str, capacity: float, refill_rate: float, now: float) -> float:
+        if key not in self.buckets:
+            return capacity
+        tokens, updated_at = self.buckets[key]
+        return min(capacity, tokens + (now - updated_at) * refill_rate)
+
+
+def measure(storage: MemoryTokenBucketStorage, addresses: int) -> float:
+
+    """
+
+    Checks a request of each address, and returns the checks per second.
+
+    """
+
+    rate_limiter = TokenBucketRateLimiter(storage)
+    first = int(IPv4Address("10.0.0.0"))
+
+    start = time.perf_counter()
+    for address in range(first, first + addresses):
+        key = f"ip:{IPv4Address(address)}"
+        for item in LIMITS:
+            rate_limiter.hit(item, key, "benchmark")
+        rate_limiter.get_window_stats(LIMITS[0], key, "benchmark")
+
+
+    return addresses / (time.perf_counter() - start)
+
+
+def measure_memory(buckets: list[dict]) -> float:
+
+    """
+
+    Returns the megabytes held by dictionaries of buckets: their tables, keys, and values, with the numbers in them.
+
+    """
+
+    held = 0
+    for table in buckets:
+        held += sys.getsizeof(table)
+        for key, value in table.items():
+            held += sys.getsizeof(key) + sys.getsizeof(value) + sum(sys.getsizeof(number) for number in value)
+
+
+    return held / 2**20
+
+
+def main(addresses: int, max_keys: int) -> None:
+    for name, storage in [
+        ("unbounded", UnboundedTokenBucketStorage()),
+        ("bounded", MemoryTokenBucketStorage(max_keys=max_keys)),
+    ]:
+        checks_per_second = measure(storage, addresses)
+        if isinstance(storage, UnboundedTokenBucketStorage):
+            kept, held_mb, estimate = len(storage.buckets), measure_memory([storage.buckets]), ""
+        else:
+            kept, held_mb, estimate = storage.cache_info().currsize, measure_memory(storage.shards), f" (estimated {storage.memory_usage() / 2**20:,.1f} MB)"
+        print(f"{name:>9}: {checks_per_second:>9,.0f} checks/sec, {kept:>9,} buckets kept, {held_mb:>7,.1f} MB held{estimate}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=1000000, help="Unique client addresses, one request each.")
+    parser.add_argument("--max-keys", type=int, default=100000, help="Buckets kept by the bounded storage.")
+    args = parser.parse_args()
+
+    main(args.addresses, args.max_keys)
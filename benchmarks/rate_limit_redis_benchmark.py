@@ -0,0 +1,179 @@
+"""
+
+Micro-benchmark of the Redis rate limit backends.
+
+Checks requests against the default limits, as SlowAPI does for each request (a hit per limit,
+then the stats of the reported limit for the headers), through the former fixed windows of
+`limits` and through `RedisTokenBucketStorage`, with and without batches. Reports the checks per
+second and the Redis round trips per check. Then several workers, each with its own storage,
+hammer a single bucket, and the requests admitted are compared with what the limit allows, to
+show the overshoot of the batches.
+
+By default, Redis is replaced by an in-process stand-in (`fakeredis`, with `lupa` for the Lua
+scripts), and `--latency-ms` simulates the network round trip; set `--redis-url` to use a real
+server.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.rate_limit_redis_benchmark --requests 5000 --latency-ms 0.2
+```
+
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Optional
+
+from limits import RateLimitItem, parse
+from limits.storage import RedisStorage
+from limits.strategies import FixedWindowRateLimiter
+from redis import BlockingConnectionPool, Redis
+
+from app.core.rate_limit.redis_token_bucket_storage import \
+    RedisTokenBucketStorage
+from app.core.rate_limit.token_bucket_rate_limiter import \
+    TokenBucketRateLimiter
+
+LIMITS = [parse(limit) for limit in ["50/minute", "300/hour", "1000/day"]]
+
+
+class RoundTripCounter:
+
+    """
+
+    Counts the connections taken from the pool of a client, one per command or pipeline, and delays each by the simulated latency.
+
+    """
+
+    def __init__(self, client: Redis, latency: float) -> None:
+        self.round_trips = 0
+        get_connection = client.connection_pool.get_connection
+
+        def _get_connection(*args, **kwargs):
+            self.round_trips += 1
+            if latency:
+                time.sleep(latency)
+            return get_connection(*args, **kwargs)
+
+        client.connection_pool.get_connection = _get_connection
+
+
+def make_client(redis_url: Optional[str], server) -> Redis:
+
+    """
+
+    Returns a client of the Redis server, or of the shared stand-in.
+
+    """
+
+    if redis_url is not None:
+        return Redis(connection_pool=BlockingConnectionPool.from_url(redis_url, max_connections=16))
+
+
+    import fakeredis
+    return fakeredis.FakeRedis(server=server)
+
+
+async def measure(rate_limiter, requests: int, keys: int) -> float:
+
+    """
+
+    Checks the requests of `keys` clients against the limits, and returns the checks per second.
+
+    """
+
+    start = time.perf_counter()
+    for request in range(requests):
+        key = f"key:{request % keys}"
+        for item in LIMITS:
+            rate_limiter.hit(item, key, "benchmark")
+        rate_limiter.get_window_stats(LIMITS[0], key, "benchmark")
+        # Yields to the batches, as a request awaiting its response would
+        await asyncio.sleep(0)
+
+
+    return requests / (time.perf_counter() - start)
+
+
+async def measure_overshoot(make_storage: Callable[[], RedisTokenBucketStorage], item: RateLimitItem, workers: int, duration: float) -> tuple[int, float]:
+
+    """
+
+    Has each worker check a single bucket as fast as it can, and returns the requests admitted and those the limit allows.
+
+    """
+
+    storages = [make_storage() for _ in range(workers)]
+    for storage in storages:
+        storage.start()
+    rate_limiters = [TokenBucketRateLimiter(storage) for storage in storages]
+
+    admitted = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for rate_limiter in rate_limiters:
+            admitted += rate_limiter.hit(item, "hot", "benchmark")
+        await asyncio.sleep(0.0002)
+    elapsed = time.perf_counter() - start
+
+    for storage in storages:
+        await storage.stop()
+
+
+    return admitted, item.amount + item.amount / item.get_expiry() * elapsed
+
+
+def main(requests: int, keys: int, latency_ms: float, batch_interval_ms: float, workers: int, duration: float, redis_url: Optional[str]) -> None:
+    server = None
+    if redis_url is None:
+        import fakeredis
+        server = fakeredis.FakeServer()
+
+    def client_with_counter() -> tuple[Redis, RoundTripCounter]:
+        client = make_client(redis_url, server)
+        return client, RoundTripCounter(client, latency_ms / 1000)
+
+    client, counter = client_with_counter()
+    client.flushdb()
+    for name, make_rate_limiter in [
+        ("fixed windows", lambda: FixedWindowRateLimiter(RedisStorage("redis://", connection_pool=client.connection_pool))),
+        ("token bucket", lambda: TokenBucketRateLimiter(RedisTokenBucketStorage(client))),
+        ("token bucket, batched", lambda: TokenBucketRateLimiter(RedisTokenBucketStorage(client, batch_interval=batch_interval_ms / 1000))),
+    ]:
+        rate_limiter = make_rate_limiter()
+
+        async def run() -> float:
+            if isinstance(rate_limiter, TokenBucketRateLimiter):
+                rate_limiter.storage.start()
+            checks_per_second = await measure(rate_limiter, requests, keys)
+            if isinstance(rate_limiter, TokenBucketRateLimiter):
+                await rate_limiter.storage.stop()
+            return checks_per_second
+
+        counter.round_trips = 0
+        checks_per_second = asyncio.run(run())
+        print(f"{name:>22}: {checks_per_second:>9,.0f} checks/sec, {counter.round_trips / requests:5.2f} Redis round trips per check")
+        client.flushdb()
+
+    item = parse("100/second")
+    for name, interval in [("token bucket", 0.0), ("token bucket, batched", batch_interval_ms / 1000)]:
+        admitted, allowed = asyncio.run(measure_overshoot(lambda: RedisTokenBucketStorage(client_with_counter()[0], batch_interval=interval), item, workers, duration))
+        print(f"{name:>22}: {workers} workers admitted {admitted} requests in {duration:g} s of {item} ({allowed:.0f} allowed, {admitted / allowed - 1:+.1%})")
+        client.flushdb()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests checked per backend.")
+    parser.add_argument("--keys", type=int, default=10, help="Clients the requests are spread over.")
+    parser.add_argument("--latency-ms", type=float, default=0.2, help="Simulated network round trip to Redis.")
+    parser.add_argument("--batch-interval-ms", type=float, default=5.0, help="Interval between two batches of the batched storage.")
+    parser.add_argument("--workers", type=int, default=4, help="Workers sharing the bucket of the overshoot run.")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds of the overshoot run.")
+    parser.add_argument("--redis-url", default=None, help="A Redis server to use instead of the in-process stand-in.")
+    args = parser.parse_args()
+
+    main(args.requests, args.keys, args.latency_ms, args.batch_interval_ms, args.workers, args.duration, args.redis_url)
@@ -0,0 +1,104 @@
+"""
+
+Benchmark of the serialisation of analysis report responses.
+
+Compares FastAPI's handling of a returned `AnalysisReport` (validation against the response
+model, `jsonable_encoder`-style serialisation, and `json.dumps` in `JSONResponse`) with the
+single-pass `PydanticJSONResponse`, checks that both produce the same JSON, and reports the mean
+time per response.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.report_serialization_benchmark --insights 10 100 1000
+```
+
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.utils.pydantic_json_response import PydanticJSONResponse
+from insight_extractor_ai_agent.models.stub_model import build_stub_report
+from insight_extractor_ai_agent.schemas.analysis_report import AnalysisReport
+
+
+def build_report(insights: int) -> AnalysisReport:
+
+    """
+
+    Builds an analysis report with the given number of insights.
+
+    """
+
+    content = "\n".join(f"Line {line}: revenue in region {line % 17} grew by {line % 9}% quarter over quarter." for line in range(insights * 20))
+
+
+    return AnalysisReport(**build_stub_report(content, insights_per_report=insights))
+
+
+async def fastapi_body(field, report: AnalysisReport) -> bytes:
+
+    """
+
+    Renders the report the way FastAPI does for a returned model with a `response_model`.
+
+    """
+
+    content = await serialize_response(field=field, response_content=report, is_coroutine=True)
+
+
+    return JSONResponse(content).body
+
+
+async def measure(render, repeats: int) -> float:
+
+    """
+
+    Renders the response repeatedly and returns the mean time in milliseconds.
+
+    """
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await render()
+
+
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+async def main(insight_counts: list[int], repeats: int) -> None:
+    field = create_model_field(name="Response_analyze_document", type_=AnalysisReport, mode="serialization")
+
+    print(f"{'insights':>8} {'bytes':>10} {'fastapi ms':>11} {'fast ms':>8} {'speedup':>8}")
+    for insights in insight_counts:
+        report = build_report(insights)
+
+        async def render_fastapi() -> bytes:
+            return await fastapi_body(field, report)
+
+        async def render_fast() -> bytes:
+            return PydanticJSONResponse(report).body
+
+        fastapi_bytes, fast_bytes = await render_fastapi(), await render_fast()
+        if json.loads(fastapi_bytes) != json.loads(fast_bytes):
+            raise RuntimeError(f"The serialisations of the {insights}-insight report differ.")
+
+        fastapi_ms, fast_ms = await measure(render_fastapi, repeats), await measure(render_fast, repeats)
+        print(f"{insights:>8} {len(fast_bytes):>10,} {fastapi_ms:>11.3f} {fast_ms:>8.3f} {fastapi_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--insights", type=int, nargs="+", default=[10, 100, 1000], help="Insights per report.")
+    parser.add_argument("--repeats", type=int, default=50, help="Renders per measurement.")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.insights, args.repeats))
@@ -0,0 +1,156 @@
+"""
+
+Micro-benchmark of the security header middlewares.
+
+Drives a minimal ASGI application directly (no server or sockets) through the stack of
+one-header middlewares and through the consolidated `SecurityHeadersMiddleware`, checks that
+both produce the same headers, and reports requests per second.
+
+
+Usage
+-----
+```bash
+python -m benchmarks.security_headers_benchmark --requests 100000
+```
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.middlewares import (
+    ContentSecurityPolicyMiddleware,
+    CrossOriginResourcePolicyMiddleware,
+    NoCacheMiddleware,
+    OriginAgentClusterMiddleware,
+    PermissionsPolicyMiddleware,
+    ReferrerPolicyMiddleware,
+    SecurityHeadersMiddleware,
+    StrictTransportSecurityMiddleware,
+    XContentTypeOptionsMiddleware,
+    XDNSPrefetchControlMiddleware,
+    XDownloadOptionsMiddleware,
+    XFrameOptionsMiddleware,
+    XXSSProtectionMiddleware,
+)
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/v1/analyze-document", "headers": []}
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json"), (b"content-length", b"2")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def build_stacked_app() -> ASGIApp:
+
+    """
+
+    Builds the middleware stack `main.py` used before the consolidation, in the same order.
+
+    """
+
+    app = endpoint
+    for middleware, kwargs in reversed([
+        (StrictTransportSecurityMiddleware, {}),
+        (XContentTypeOptionsMiddleware, {}),
+        (ContentSecurityPolicyMiddleware, {}),
+        (PermissionsPolicyMiddleware, {}),
+        (CrossOriginResourcePolicyMiddleware, {}),
+        (ReferrerPolicyMiddleware, {}),
+        (XFrameOptionsMiddleware, {}),
+        (XXSSProtectionMiddleware, {"policy": "1; mode=block"}),
+        (XDownloadOptionsMiddleware, {}),
+        (OriginAgentClusterMiddleware, {}),
+        (NoCacheMiddleware, {}),
+        (XDNSPrefetchControlMiddleware, {}),
+    ]):
+        app = middleware(app, **kwargs)
+
+
+    return app
+
+
+def build_consolidated_app() -> ASGIApp:
+
+    """
+
+    Builds the consolidated middleware with the same configuration.
+
+    """
+
+    return SecurityHeadersMiddleware(
+        endpoint,
+        cross_origin_opener_policy=None,
+        cross_origin_embedder_policy=None,
+        x_xss_protection="1; mode=block",
+    )
+
+
+async def collect_headers(app: ASGIApp) -> dict[bytes, bytes]:
+
+    """
+
+    Runs one request through the application and returns its response headers.
+
+    """
+
+    headers: dict[bytes, bytes] = {}
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            headers.update(message["headers"])
+
+    await app(dict(SCOPE), receive, send)
+
+
+    return headers
+
+
+async def measure(app: ASGIApp, requests: int) -> float:
+
+    """
+
+    Runs the requests through the application and returns the requests per second.
+
+    """
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+
+
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, rounds: int) -> None:
+    stacked_app, consolidated_app = build_stacked_app(), build_consolidated_app()
+
+    stacked_headers, consolidated_headers = await collect_headers(stacked_app), await collect_headers(consolidated_app)
+    if stacked_headers != consolidated_headers:
+        raise RuntimeError(f"The stacks produce different headers: {stacked_headers} != {consolidated_headers}")
+
+    for name, app in [("stacked", stacked_app), ("consolidated", consolidated_app)]:
+        best = max([await measure(app, requests) for _ in range(rounds)])
+        print(f"{name:>12}: {best:>10,.0f} requests/sec (best of {rounds} rounds of {requests:,} requests)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000, help="Requests per round.")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per stack; the best round is reported.")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.rounds))
@@ -0,0 +1,77 @@
+from typing import Optional
+
+from pydantic_ai.models import Model
+
+from ..models.stub_model import STUB_MODEL_NAME, build_stub_model
+from ..models.stub_model_config import StubModelConfig
+from ..utils.class_importing_helper import import_class
+
+# Provider prefix reserved for models that run inside the process
+LOCAL_PROVIDER = "local"
+
+
+def build_model(model_name: str, api_key: str, stub_model_config: Optional[StubModelConfig] = None) -> Model:
+
+    """
+
+    Builds the pydantic-ai model for a "provider:model" string.
+
+    Remote providers are resolved dynamically from the pydantic-ai package. The reserved
+    `local` provider resolves to in-process models, which are only available when their
+    configuration is supplied.
+
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the language model in "provider:model" format.
+
+    api_key : str
+        API key to authenticate with the LLM provider. Ignored for local models.
+
+    stub_model_config : StubModelConfig, optional
+        Configuration of the `local:stub` model. The default value is `None`.
+        If `None`, local models are disabled.
+
+
+    Returns
+    -------
+    model : Model
+        The model instance to hand to the agent.
+
+    """
+
+    if not isinstance(model_name, str):
+        raise TypeError(f"model_name must be a string. Received: {model_name} with type: {type(model_name)}")
+    if not isinstance(api_key, str):
+        raise TypeError(f"api_key must be a string. Received: {api_key} with type: {type(api_key)}")
+    if stub_model_config is not None and not isinstance(stub_model_config, StubModelConfig):
+        raise TypeError(f"stub_model_config must be a StubModelConfig instance. Received: {stub_model_config} with type: {type(stub_model_config)}")
+
+
+    provider_key, model_key = model_name.split(":", 1)
+
+    if provider_key == LOCAL_PROVIDER:
+        if stub_model_config is None:
+            raise ValueError("Local models are disabled on this server.")
+        if model_key != STUB_MODEL_NAME:
+            raise ValueError(f"Unsupported local model: {model_key}. Supported local models are: {STUB_MODEL_NAME}.")
+        return build_stub_model(stub_model_config)
+
+
+    class_prefix = provider_key.capitalize()
+
+    provider_class = import_class(
+        f"pydantic_ai.providers.{provider_key}",
+        f"{class_prefix}Provider"
+    )
+    model_class = import_class(
+        f"pydantic_ai.models.{provider_key}",
+        f"{class_prefix}Model"
+    )
+
+
+    return model_class(
+        model_name=model_key,
+        provider=provider_class(api_key=api_key)
+    )
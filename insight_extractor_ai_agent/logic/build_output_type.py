@@ -0,0 +1,95 @@
+from functools import cache
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field, create_model
+
+from ..schemas.analysis_report import AnalysisReport
+from ..schemas.code_insight import CodeInsight
+from ..schemas.compact.compact_analysis_report import CompactAnalysisReport
+from ..schemas.compact.compact_code_insight import CompactCodeInsight
+from ..schemas.compact.compact_quantitative_insight import \
+    CompactQuantitativeInsight
+from ..schemas.compact.compact_sentiment_insight import CompactSentimentInsight
+from ..schemas.compact.compact_table_insight import CompactTableInsight
+from ..schemas.compact.compact_thematic_insight import CompactThematicInsight
+from ..schemas.quantitative_insight import QuantitativeInsight
+from ..schemas.sentiment_insight import SentimentInsight
+from ..schemas.table_insight import TableInsight
+from ..schemas.taxonomy.insight_type import InsightType
+from ..schemas.taxonomy.schema_profile import SchemaProfile
+from ..schemas.thematic_insight import ThematicInsight
+
+INSIGHT_CLASSES: dict[SchemaProfile, dict[InsightType, type[BaseModel]]] = {
+    SchemaProfile.FULL: {
+        InsightType.QUANTITATIVE_METRIC: QuantitativeInsight,
+        InsightType.KEY_THEME: ThematicInsight,
+        InsightType.SENTIMENT_ANALYSIS: SentimentInsight,
+        InsightType.TABLE_ANALYSIS: TableInsight,
+        InsightType.CODE_ANALYSIS: CodeInsight,
+    },
+    SchemaProfile.COMPACT: {
+        InsightType.QUANTITATIVE_METRIC: CompactQuantitativeInsight,
+        InsightType.KEY_THEME: CompactThematicInsight,
+        InsightType.SENTIMENT_ANALYSIS: CompactSentimentInsight,
+        InsightType.TABLE_ANALYSIS: CompactTableInsight,
+        InsightType.CODE_ANALYSIS: CompactCodeInsight,
+    },
+}
+
+REPORT_CLASSES: dict[SchemaProfile, type[BaseModel]] = {
+    SchemaProfile.FULL: AnalysisReport,
+    SchemaProfile.COMPACT: CompactAnalysisReport,
+}
+
+
+@cache
+def build_output_type(schema_profile: SchemaProfile = SchemaProfile.FULL,
+                      insight_types: Optional[frozenset[InsightType]] = None) -> type[BaseModel]:
+
+    """
+
+    Builds the output type the agent is asked to produce.
+
+    The compact profile drops the fields that dominate the generated tokens (snippets,
+    recommendations, sentiment explanations, and location lists). Restricting the insight
+    types narrows the union of the `insights` list, so the schema handed to the model only
+    describes the requested types. Output types are cached per combination.
+
+
+    Parameters
+    ----------
+    schema_profile : SchemaProfile, optional
+        The schema profile. The default value is `SchemaProfile.FULL`.
+
+    insight_types : frozenset, optional
+        The insight types to allow. The default value is `None`.
+        If `None`, all insight types are allowed.
+
+
+    Returns
+    -------
+    output_type : type
+        The report model for the profile, restricted to the requested insight types.
+
+    """
+
+    if not isinstance(schema_profile, SchemaProfile):
+        raise TypeError(f"schema_profile must be a SchemaProfile. Received: {schema_profile} with type: {type(schema_profile)}")
+    if insight_types is not None and (not isinstance(insight_types, frozenset) or not insight_types or not all(isinstance(insight_type, InsightType) for insight_type in insight_types)):
+        raise TypeError(f"insight_types must be a non-empty frozenset of InsightType. Received: {insight_types} with type: {type(insight_types)}")
+
+
+    report_class = REPORT_CLASSES[schema_profile]
+    if insight_types is None or len(insight_types) == len(InsightType):
+        return report_class
+
+
+    # Keep the declaration order of the taxonomy so that the schema is stable across requests
+    insight_classes = tuple(insight_class for insight_type, insight_class in INSIGHT_CLASSES[schema_profile].items() if insight_type in insight_types)
+
+
+    return create_model(
+        report_class.__name__,
+        __base__=report_class,
+        insights=(list[Union[insight_classes]], Field(..., min_length=1)),
+    )
@@ -0,0 +1,103 @@
+import hashlib
+import zlib
+
+
+def chunk_content(content: str, min_chars: int = 4000, avg_chars: int = 16000, max_chars: int = 64000) -> list[str]:
+
+    """
+
+    Splits content into content-defined chunks along line boundaries.
+
+    Whether a chunk ends after a line depends only on the line itself (its CRC-32) and on
+    the size of the current chunk, so an edit only changes the chunk it falls into; the
+    boundaries of the other chunks stay put and their fingerprints remain stable across
+    revisions. A line becomes a boundary with a probability proportional to its length,
+    which makes the expected chunk size independent of how long the lines are.
+    Lines longer than `max_chars` are split into fixed-size pieces.
+
+
+    Parameters
+    ----------
+    content : str
+        The content to split.
+
+    min_chars : int, optional
+        Minimum size of a chunk, except for the last one. The default value is `4000`.
+
+    avg_chars : int, optional
+        Target average size of a chunk. The default value is `16000`.
+
+    max_chars : int, optional
+        Maximum size of a chunk. The default value is `64000`.
+
+
+    Returns
+    -------
+    chunks : list
+        The chunks. Joining them gives back the original content.
+
+    """
+
+    if not isinstance(content, str):
+        raise TypeError(f"content must be a string. Received: {content} with type: {type(content)}")
+    if not all(isinstance(size, int) for size in (min_chars, avg_chars, max_chars)) or not 0 < min_chars < avg_chars < max_chars:
+        raise ValueError(f"Chunk sizes must be integers with 0 < min_chars < avg_chars < max_chars. Received: {min_chars}, {avg_chars}, {max_chars}")
+
+
+    spread = avg_chars - min_chars
+
+    chunks = []
+    current_lines: list[str] = []
+    current_size = 0
+
+    def _flush() -> None:
+        nonlocal current_lines, current_size
+        if current_lines:
+            chunks.append("".join(current_lines))
+        current_lines, current_size = [], 0
+
+    for line in content.splitlines(keepends=True):
+        for start in range(0, len(line), max_chars):
+            piece = line[start:start + max_chars]
+
+            if current_size + len(piece) > max_chars:
+                _flush()
+
+            current_lines.append(piece)
+            current_size += len(piece)
+
+            # Boundary with probability len(piece) / spread, decided by the piece's own hash
+            if current_size >= min_chars and zlib.crc32(piece.encode("utf-8")) * spread < len(piece) * 0x100000000:
+                _flush()
+
+    _flush()
+
+
+    return chunks
+
+
+def fingerprint_chunk(chunk: str) -> str:
+
+    """
+
+    Returns the fingerprint of a chunk.
+
+
+    Parameters
+    ----------
+    chunk : str
+        The chunk to fingerprint.
+
+
+    Returns
+    -------
+    fingerprint : str
+        The hex SHA-256 digest of the chunk.
+
+    """
+
+    if not isinstance(chunk, str):
+        raise TypeError(f"chunk must be a string. Received: {chunk} with type: {type(chunk)}")
+
+
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
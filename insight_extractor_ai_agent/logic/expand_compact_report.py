@@ -0,0 +1,71 @@
+from ..schemas.analysis_report import AnalysisReport
+from ..schemas.compact.compact_analysis_report import CompactAnalysisReport
+from ..schemas.compact.compact_sentiment_insight import CompactSentimentInsight
+from ..schemas.location_reference import LocationReference
+from ..schemas.sentiment_result import SentimentResult
+from ..schemas.taxonomy.schema_profile import SchemaProfile
+from .build_output_type import INSIGHT_CLASSES
+
+# Placeholder for the required sentiment explanation, which the compact profile does not generate
+COMPACT_SENTIMENT_EXPLANATION = "Not generated in compact mode."
+
+
+def expand_compact_report(compact_report: CompactAnalysisReport, file_name: str, file_type: str, model_name: str) -> AnalysisReport:
+
+    """
+
+    Expands a compact report into a valid `AnalysisReport`.
+
+    The single `location` of each insight becomes a one-item `locations` list, and the fields
+    left out by the compact profile are left empty (or set to a placeholder when the full schema
+    requires them).
+
+
+    Parameters
+    ----------
+    compact_report : CompactAnalysisReport
+        The compact report produced by the agent.
+
+    file_name : str
+        Name of the analysed file.
+
+    file_type : str
+        Type of the analysed file.
+
+    model_name : str
+        Name of the model that produced the report.
+
+
+    Returns
+    -------
+    report : AnalysisReport
+        The expanded report.
+
+    """
+
+    if not isinstance(compact_report, CompactAnalysisReport):
+        raise TypeError(f"compact_report must be a CompactAnalysisReport instance. Received: {compact_report} with type: {type(compact_report)}")
+
+
+    full_classes = INSIGHT_CLASSES[SchemaProfile.FULL]
+
+    insights = []
+    for compact_insight in compact_report.insights:
+        fields = dict(compact_insight)
+        fields["locations"] = [LocationReference(location=fields.pop("location"))]
+        if isinstance(compact_insight, CompactSentimentInsight):
+            fields["sentiment"] = SentimentResult(
+                label=compact_insight.sentiment.label,
+                score=compact_insight.sentiment.score,
+                explanation=COMPACT_SENTIMENT_EXPLANATION
+            )
+        insights.append(full_classes[compact_insight.insight_type](**fields))
+
+
+    return AnalysisReport(
+        file_name=file_name,
+        file_type_detected=file_type,
+        model_used=model_name,
+        executive_summary=compact_report.executive_summary,
+        insights=insights,
+    )
@@ -1,16 +1,42 @@
-from pydantic_ai import Agent
+import time
+from typing import Callable, Optional
 
+from opentelemetry import trace
+from pydantic_ai import Agent, capture_run_messages
+from pydantic_ai.messages import ModelRequest, ModelResponse, RetryPromptPart
+
+from ..models.stub_model_config import StubModelConfig
+from ..models.timed_model import TimedModel
 from ..prompts.system.insight_extractor_agent_system_prompt import \
     INSIGHT_EXTRACTOR_SYSTEM_PROMPT
+from ..prompts.system.output_constraints_prompts import (
+    COMPACT_OUTPUT_PROMPT, INSIGHT_TYPES_FILTER_PROMPT)
 from ..schemas.analysis_report import AnalysisReport
-from ..utils.class_importing_helper import import_class
-
-
-async def extract_insight(model_name: str, api_key: str, content: str, file_name: str, file_type: str) -> AnalysisReport:
+from ..schemas.analysis_usage import AnalysisUsage
+from ..schemas.taxonomy.insight_type import InsightType
+from ..schemas.taxonomy.schema_profile import SchemaProfile
+from .build_model import build_model
+from .build_output_type import build_output_type
+from .expand_compact_report import expand_compact_report
+
+tracer = trace.get_tracer(__name__)
+
+
+@tracer.start_as_current_span("extract insight")
+async def extract_insight(model_name: str, 
+                          api_key: str, 
+                          content: str, 
+                          file_name: str, 
+                          file_type: str, 
+                          stub_model_config: Optional[StubModelConfig] = None,
+                          usage_callback: Optional[Callable[[AnalysisUsage], None]] = None,
+                          schema_profile: SchemaProfile = SchemaProfile.FULL,
+                          insight_types: Optional[list[InsightType]] = None) -> AnalysisReport:
     
     """
 
-    Initializes a dynamic AI agent and runs a content analysis.
+    Initializes a dynamic AI agent and runs a content analysis, traced with spans for the agent
+    construction and the run, with the token usage and retries of the run as attributes.
 
     This function infers the provider and model from the model_name string
     (e.g., "openai:gpt-4o"), sets up the LLM, executes the analysis,
@@ -57,6 +83,26 @@ async def extract_insight(model_name: str, api_key: str, content: str, file_name
                 XML
                     `.xml`
 
+    stub_model_config : StubModelConfig, optional
+        Configuration of the offline `local:stub` model. The default value is `None`.
+        If `None`, local models are disabled.
+
+    usage_callback : Callable, optional
+        Called with the token usage and latency of the analysis once it ends, also when it fails. The default value is `None`.
+
+    schema_profile : SchemaProfile, optional
+        Output schema handed to the model. The default value is `SchemaProfile.FULL`.
+            The options are:
+                `SchemaProfile.FULL`
+                    The complete `AnalysisReport` schema.
+                `SchemaProfile.COMPACT`
+                    A reduced schema without snippets, recommendations, sentiment explanations, and location lists.
+                    The result is expanded back into an `AnalysisReport`.
+
+    insight_types : list, optional
+        Insight types to extract. The default value is `None`.
+        If `None`, all insight types are extracted.
+
         
     Returns
     -------
@@ -75,36 +121,77 @@ async def extract_insight(model_name: str, api_key: str, content: str, file_name
         raise TypeError(f"file_name must be a string. Received: {file_name} with type: {type(file_name)}")
     if not isinstance(file_type, str):
         raise TypeError(f"file_type must be a string. Received: {file_type} with type: {type(file_type)}")
+    if usage_callback is not None and not callable(usage_callback):
+        raise TypeError(f"usage_callback must be a callable. Received: {usage_callback} with type: {type(usage_callback)}")
+    if not isinstance(schema_profile, SchemaProfile):
+        raise TypeError(f"schema_profile must be a SchemaProfile. Received: {schema_profile} with type: {type(schema_profile)}")
+    if insight_types is not None and (not isinstance(insight_types, list) or not insight_types or not all(isinstance(insight_type, InsightType) for insight_type in insight_types)):
+        raise TypeError(f"insight_types must be a non-empty list of InsightType. Received: {insight_types} with type: {type(insight_types)}")
+
+
+    system_prompts = [INSIGHT_EXTRACTOR_SYSTEM_PROMPT]
+    if schema_profile == SchemaProfile.COMPACT:
+        system_prompts.append(COMPACT_OUTPUT_PROMPT)
+    if insight_types is not None:
+        system_prompts.append(INSIGHT_TYPES_FILTER_PROMPT.format(insight_types=", ".join(insight_type.value for insight_type in insight_types)))
+
+
+    with tracer.start_as_current_span("build agent"):
+        model = TimedModel(build_model(model_name, api_key, stub_model_config))
+
+        analysis_agent = Agent(
+            model=model,
+            output_type=build_output_type(schema_profile, frozenset(insight_types) if insight_types is not None else None),
+            system_prompt=system_prompts,
+            output_retries=3
+        )
+
+
+    start_time = time.perf_counter()
+    failed = True
+    # The messages are captured so that the usage of a failed run (e.g., out of output retries, or a provider error) is still reported
+    with capture_run_messages() as messages:
+        try:
+            with tracer.start_as_current_span("run agent"):
+                response = await analysis_agent.run(content)
+            failed = False
+        finally:
+            end_time = time.perf_counter()
+            responses = [message for message in messages if isinstance(message, ModelResponse)]
+            input_tokens = sum(message.usage.input_tokens for message in responses)
+            output_tokens = sum(message.usage.output_tokens for message in responses)
+            retries = sum(
+                isinstance(part, RetryPromptPart)
+                for message in messages if isinstance(message, ModelRequest)
+                for part in message.parts
+            )
+            trace.get_current_span().set_attributes({
+                "gen_ai.request.model": model_name,
+                "gen_ai.usage.input_tokens": input_tokens,
+                "gen_ai.usage.output_tokens": output_tokens,
+                "llm.requests": len(model.request_latencies),
+                "llm.retries": retries,
+                "llm.provider_latency_ms": sum(model.request_latencies) * 1000,
+                "llm.failed": failed,
+            })
+
+            if usage_callback is not None:
+                usage_callback(AnalysisUsage(
+                    model_name=model_name,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    requests=len(model.request_latencies),
+                    retries=retries,
+                    provider_latency_ms=sum(model.request_latencies) * 1000,
+                    time_to_first_token_ms=(model.first_response_at - start_time) * 1000 if model.first_response_at is not None else None,
+                    total_latency_ms=(end_time - start_time) * 1000,
+                    failed=failed,
+                ))
+    report = response.output
 
 
-    provider_key, model_key = model_name.split(":", 1)
-    class_prefix = provider_key.capitalize()
-
-    provider_class = import_class(
-        f"pydantic_ai.providers.{provider_key}",
-        f"{class_prefix}Provider"
-    )
-    model_class = import_class(
-        f"pydantic_ai.models.{provider_key}",
-        f"{class_prefix}Model"
-    )
-
-
-    model = model_class(
-        model_name=model_key,
-        provider=provider_class(api_key=api_key)
-    )
-
-    analysis_agent = Agent(
-        model=model,
-        output_type=AnalysisReport,
-        system_prompt=INSIGHT_EXTRACTOR_SYSTEM_PROMPT,
-        output_retries=3
-    )
-
-
-    response = await analysis_agent.run(content)
-    report = response.output
+    if schema_profile == SchemaProfile.COMPACT:
+        return expand_compact_report(report, file_name, file_type, model_name)
 
 
     # Enrich the report with metadata
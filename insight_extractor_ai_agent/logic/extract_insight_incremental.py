@@ -0,0 +1,176 @@
+import asyncio
+from collections.abc import MutableMapping
+from logging import getLogger
+from typing import Awaitable, Callable, Optional
+
+from ..schemas.analysis_report import AnalysisReport
+from ..schemas.analysis_usage import AnalysisUsage
+from ..schemas.taxonomy.insight_type import InsightType
+from ..schemas.taxonomy.schema_profile import SchemaProfile
+from .chunk_content import chunk_content, fingerprint_chunk
+from .extract_insight import extract_insight
+
+logger = getLogger(__name__)
+
+
+async def extract_insight_incremental(model_name: str,
+                                      api_key: str,
+                                      content: str,
+                                      file_name: str,
+                                      file_type: str,
+                                      chunk_cache: MutableMapping[str, AnalysisReport],
+                                      cache_namespace: str = "",
+                                      min_chunk_chars: int = 4000,
+                                      avg_chunk_chars: int = 16000,
+                                      max_chunk_chars: int = 64000,
+                                      max_concurrency: int = 4,
+                                      usage_callback: Optional[Callable[[AnalysisUsage], None]] = None,
+                                      schema_profile: SchemaProfile = SchemaProfile.FULL,
+                                      insight_types: Optional[list[InsightType]] = None,
+                                      extract: Callable[..., Awaitable[AnalysisReport]] = extract_insight,
+                                      **extract_kwargs) -> AnalysisReport:
+
+    """
+
+    Runs an incremental analysis that only sends new or edited parts of a document to the model.
+
+    The content is split into content-defined chunks (see `chunk_content`) and every chunk is
+    fingerprinted. Chunks whose fingerprint is already in `chunk_cache`, typically because a
+    previous revision of the document was analysed, reuse the cached per-chunk report; only
+    the remaining chunks are analysed. The per-chunk reports are then merged, in document
+    order, into a single `AnalysisReport`. The per-chunk reports are copied into and out of the
+    cache, so the merged report may be changed freely.
+
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the language model in "provider:model" format.
+
+    api_key : str
+        API key to authenticate with the LLM provider.
+
+    content : str
+        The textual content to analyze.
+
+    file_name : str
+        Name of the file being analyzed.
+
+    file_type : str
+        Type of the file. See `extract_insight` for the options.
+
+    chunk_cache : MutableMapping
+        Cache of per-chunk reports, shared across analyses.
+
+    cache_namespace : str, optional
+        Prefix of the cache keys, used to keep the cached insights of different callers apart. The default value is `""`.
+
+    min_chunk_chars : int, optional
+        Minimum chunk size. The default value is `4000`.
+
+    avg_chunk_chars : int, optional
+        Target average chunk size. The default value is `16000`.
+
+    max_chunk_chars : int, optional
+        Maximum chunk size. The default value is `64000`.
+
+    max_concurrency : int, optional
+        Maximum number of chunks analysed at the same time. The default value is `4`.
+
+    usage_callback : Callable, optional
+        Called once with the usage summed over all analysed chunks, also when one fails. The default value is `None`.
+
+    schema_profile : SchemaProfile, optional
+        Output schema handed to the model. The default value is `SchemaProfile.FULL`.
+
+    insight_types : list, optional
+        Insight types to extract. The default value is `None`.
+        If `None`, all insight types are extracted.
+
+    extract : Callable, optional
+        The per-chunk extraction function. The default value is `extract_insight`.
+
+    **extract_kwargs
+        Additional keyword arguments forwarded to `extract`.
+
+
+    Returns
+    -------
+    report : AnalysisReport
+        The merged analysis report.
+
+    """
+
+    if not isinstance(content, str):
+        raise TypeError(f"content must be a string. Received: {content} with type: {type(content)}")
+    if not isinstance(chunk_cache, MutableMapping):
+        raise TypeError(f"chunk_cache must be a mutable mapping. Received: {chunk_cache} with type: {type(chunk_cache)}")
+    if not isinstance(cache_namespace, str):
+        raise TypeError(f"cache_namespace must be a string. Received: {cache_namespace} with type: {type(cache_namespace)}")
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be a positive integer. Received: {max_concurrency} with type: {type(max_concurrency)}")
+
+
+    chunks = chunk_content(content, min_chunk_chars, avg_chunk_chars, max_chunk_chars)
+    # Reports produced with a different schema profile or insight type selection are not interchangeable
+    output_variant = f"{SchemaProfile(schema_profile).value}:{','.join(sorted(insight_type.value for insight_type in insight_types or []))}"
+    cache_keys = [f"{cache_namespace}:{model_name}:{output_variant}:{fingerprint_chunk(chunk)}" for chunk in chunks]
+
+    # Take the cached reports up front so that evictions by concurrent analyses cannot drop them midway
+    chunk_reports: dict[str, AnalysisReport] = {}
+    pending: dict[str, str] = {}
+    for key, chunk in zip(cache_keys, chunks):
+        if key in chunk_reports or key in pending:
+            continue
+        cached_report = chunk_cache.get(key)
+        if cached_report is not None:
+            # Copied, so that changes to the merged report (e.g., resolved locations) never reach the cache
+            chunk_reports[key] = cached_report.model_copy(deep=True)
+        else:
+            pending[key] = chunk
+
+    logger.info("Incremental analysis: %d of %d chunks reused from cache.", len(chunks) - len(pending), len(chunks))
+
+    usages: list[AnalysisUsage] = []
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _analyze_chunk(key: str, chunk: str) -> None:
+        async with semaphore:
+            chunk_reports[key] = await extract(
+                model_name=model_name,
+                api_key=api_key,
+                content=chunk,
+                file_name=file_name,
+                file_type=file_type,
+                usage_callback=usages.append,
+                schema_profile=schema_profile,
+                insight_types=insight_types,
+                **extract_kwargs
+            )
+            chunk_cache[key] = chunk_reports[key].model_copy(deep=True)
+
+    try:
+        await asyncio.gather(*(_analyze_chunk(key, chunk) for key, chunk in pending.items()))
+    finally:
+        # Reported when a chunk fails too, with the usage of the chunks analysed so far
+        if usage_callback is not None and usages:
+            usage_callback(AnalysisUsage(
+                model_name=model_name,
+                input_tokens=sum(usage.input_tokens for usage in usages),
+                output_tokens=sum(usage.output_tokens for usage in usages),
+                requests=sum(usage.requests for usage in usages),
+                retries=sum(usage.retries for usage in usages),
+                provider_latency_ms=sum(usage.provider_latency_ms for usage in usages),
+                time_to_first_token_ms=min((usage.time_to_first_token_ms for usage in usages if usage.time_to_first_token_ms is not None), default=None),
+                total_latency_ms=max(usage.total_latency_ms for usage in usages),
+                failed=any(usage.failed for usage in usages),
+            ))
+
+
+    return AnalysisReport(
+        file_name=file_name,
+        file_type_detected=file_type,
+        model_used=model_name,
+        executive_summary=" ".join(chunk_reports[key].executive_summary for key in dict.fromkeys(cache_keys)),
+        insights=[insight for key in dict.fromkeys(cache_keys) for insight in chunk_reports[key].insights],
+    )
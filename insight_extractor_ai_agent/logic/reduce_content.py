@@ -0,0 +1,277 @@
+import re
+from typing import Literal
+
+import numpy as np
+
+from ..utils.estimate_tokens import estimate_tokens
+
+# Section markers emitted by the file parser, e.g., "--- Page 3 ---" or "--- Sheet: Q3 ---"
+_MARKER_PATTERN = re.compile(r"^--- (?:Page \d+|Sheet: .*) ---$")
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def _tfidf_entries(texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+
+    """
+
+    Builds the L2-normalised TF-IDF matrix of the texts in sparse coordinate form.
+
+
+    Parameters
+    ----------
+    texts : list
+        The texts to vectorise.
+
+
+    Returns
+    -------
+    entries : tuple
+        The row indices, column indices, and weights of the non-zero entries, and the vocabulary size.
+
+    """
+
+    vocabulary: dict[str, int] = {}
+    term_ids = [[vocabulary.setdefault(term, len(vocabulary)) for term in _TERM_PATTERN.findall(text.lower())] for text in texts]
+    vocabulary_size = max(len(vocabulary), 1)
+
+    lengths = np.fromiter((len(ids) for ids in term_ids), dtype=np.int64, count=len(texts))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    columns = np.fromiter((term_id for ids in term_ids for term_id in ids), dtype=np.int64, count=int(lengths.sum()))
+
+    # Collapse repeated terms of a text into a single entry with its count
+    keys, counts = np.unique(rows * vocabulary_size + columns, return_counts=True)
+    rows, columns = keys // vocabulary_size, keys % vocabulary_size
+
+    document_frequency = np.bincount(columns, minlength=vocabulary_size)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    weights = counts / lengths[rows] * idf[columns]
+
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(texts)))
+    weights = weights / norms[rows]
+
+
+    return rows, columns, weights, vocabulary_size
+
+
+def _score_centroid(rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, vocabulary_size: int, count: int) -> np.ndarray:
+
+    """
+
+    Scores each text by the cosine similarity of its TF-IDF vector to the document centroid.
+
+
+    Parameters
+    ----------
+    rows, columns, weights : np.ndarray
+        The sparse TF-IDF entries.
+
+    vocabulary_size : int
+        The number of columns.
+
+    count : int
+        The number of texts.
+
+
+    Returns
+    -------
+    scores : np.ndarray
+        One score per text.
+
+    """
+
+    centroid = np.bincount(columns, weights=weights, minlength=vocabulary_size)
+    centroid_norm = np.linalg.norm(centroid)
+    if centroid_norm == 0:
+        return np.zeros(count)
+
+
+    return np.bincount(rows, weights=weights * centroid[columns] / centroid_norm, minlength=count)
+
+
+def _score_textrank(rows: np.ndarray,
+                    columns: np.ndarray,
+                    weights: np.ndarray,
+                    vocabulary_size: int,
+                    count: int,
+                    damping: float = 0.85,
+                    max_iterations: int = 100,
+                    tolerance: float = 1e-6,
+                    max_pairs_per_chunk: int = 1000000) -> np.ndarray:
+
+    """
+
+    Scores each text with TextRank over the cosine-similarity graph of the texts.
+
+
+    Parameters
+    ----------
+    rows, columns, weights : np.ndarray
+        The sparse TF-IDF entries.
+
+    vocabulary_size : int
+        The number of columns.
+
+    count : int
+        The number of texts.
+
+    damping : float, optional
+        The PageRank damping factor. The default value is `0.85`.
+
+    max_iterations : int, optional
+        Maximum number of power iterations. The default value is `100`.
+
+    tolerance : float, optional
+        L1 convergence threshold of the power iteration. The default value is `1e-6`.
+
+    max_pairs_per_chunk : int, optional
+        The most pairs of entries sharing a term whose products are added up at once. The default value is `1000000`.
+
+
+    Returns
+    -------
+    scores : np.ndarray
+        One score per text.
+
+    """
+
+    # The dot products of the texts only add up over the terms they share: pair each entry with
+    # every entry of its term, in chunks of pairs, so that no texts-by-terms matrix is built
+    order = np.argsort(columns, kind="stable")
+    rows, columns, weights = rows[order], columns[order], weights[order]
+    term_sizes = np.bincount(columns, minlength=vocabulary_size)
+    term_starts = np.cumsum(term_sizes) - term_sizes
+    pair_counts = term_sizes[columns]
+    pair_ends = np.cumsum(pair_counts)
+
+    similarity = np.zeros((count, count), dtype=np.float32)
+    first = 0
+    while first < len(rows):
+        last = max(int(np.searchsorted(pair_ends, pair_ends[first] - pair_counts[first] + max_pairs_per_chunk, side="right")), first + 1)
+        chunk_counts = pair_counts[first:last]
+        left = np.repeat(np.arange(first, last), chunk_counts)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        right = term_starts[columns[left]] + offsets
+        np.add.at(similarity, (rows[left], rows[right]), weights[left] * weights[right])
+        first = last
+    np.fill_diagonal(similarity, 0.0)
+
+    # Texts without any similar text jump uniformly to every other text
+    out_weights = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weights, out=np.full_like(similarity, 1.0 / count), where=out_weights > 0)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(max_iterations):
+        updated = (1 - damping) / count + damping * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+
+
+    return scores
+
+
+def reduce_content(content: str,
+                   target_tokens: int,
+                   method: Literal["textrank", "tfidf"] = "textrank",
+                   max_textrank_sentences: int = 2000) -> str:
+
+    """
+
+    Compresses content to a token budget by keeping its most representative sentences.
+
+    This is a local, extractive reduction: the content is split into sentences, the sentences
+    are scored (TF-IDF similarity to the document centroid, or TextRank over the sentence
+    similarity graph), and the best ones are kept, in their original order, until the budget
+    is used up. The page and sheet markers produced by the file parser are always kept so that
+    the model can still reference locations. Content that already fits is returned unchanged.
+
+
+    Parameters
+    ----------
+    content : str
+        The parsed content.
+
+    target_tokens : int
+        The token budget of the reduced content.
+
+    method : str, optional
+        The sentence scoring method. The default value is `"textrank"`.
+            The options are:
+                `"textrank"`
+                    PageRank over the cosine-similarity graph of the sentences.
+                `"tfidf"`
+                    Cosine similarity of each sentence to the TF-IDF centroid of the document.
+
+    max_textrank_sentences : int, optional
+        Above this many sentences, TextRank (quadratic in memory) falls back to TF-IDF scoring. The default value is `2000`.
+
+
+    Returns
+    -------
+    reduced_content : str
+        The reduced content.
+
+    """
+
+    if not isinstance(content, str):
+        raise TypeError(f"content must be a string. Received: {content} with type: {type(content)}")
+    if not isinstance(target_tokens, int) or target_tokens < 1:
+        raise ValueError(f"target_tokens must be a positive integer. Received: {target_tokens} with type: {type(target_tokens)}")
+    if method not in {"textrank", "tfidf"}:
+        raise ValueError(f"Invalid method: {method}. Must be one of: textrank, tfidf")
+
+
+    if estimate_tokens(content) <= target_tokens:
+        return content
+
+
+    lines = content.splitlines()
+    marker_lines = set()
+    unit_lines: list[int] = []
+    unit_texts: list[str] = []
+    for line_index, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if _MARKER_PATTERN.match(stripped):
+            marker_lines.add(line_index)
+            continue
+        for sentence in _SENTENCE_BOUNDARY_PATTERN.split(stripped):
+            unit_lines.append(line_index)
+            unit_texts.append(sentence)
+
+    if not unit_texts:
+        return content
+
+
+    rows, columns, weights, vocabulary_size = _tfidf_entries(unit_texts)
+    if method == "textrank" and len(unit_texts) <= max_textrank_sentences:
+        scores = _score_textrank(rows, columns, weights, vocabulary_size, len(unit_texts))
+    else:
+        scores = _score_centroid(rows, columns, weights, vocabulary_size, len(unit_texts))
+
+    # Keep the best-scoring sentences that fit in what is left of the budget once the markers are kept
+    budget = target_tokens - sum(estimate_tokens(lines[line_index]) + 1 for line_index in marker_lines)
+    costs = np.fromiter((estimate_tokens(text) + 1 for text in unit_texts), dtype=np.int64, count=len(unit_texts))
+    ranking = np.argsort(-scores, kind="stable")
+    selected = np.zeros(len(unit_texts), dtype=bool)
+    # A sentence too long for what is left is skipped, and the shorter ones after it may still fit
+    for index in ranking:
+        if costs[index] <= budget:
+            selected[index] = True
+            budget -= costs[index]
+
+
+    kept_sentences: dict[int, list[str]] = {}
+    for line_index, text, keep in zip(unit_lines, unit_texts, selected):
+        if keep:
+            kept_sentences.setdefault(line_index, []).append(text)
+
+
+    return "\n".join(
+        lines[line_index].strip() if line_index in marker_lines else " ".join(kept_sentences[line_index])
+        for line_index in range(len(lines))
+        if line_index in marker_lines or line_index in kept_sentences
+    )
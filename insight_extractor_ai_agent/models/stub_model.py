@@ -0,0 +1,342 @@
+import asyncio
+from collections import Counter
+from functools import cache
+import hashlib
+import math
+import random
+import re
+from typing import Any, Optional
+
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import (ModelMessage, ModelRequest, ModelResponse,
+                                  ToolCallPart, UserPromptPart)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+from ..schemas.analysis_report import AnalysisReport
+from ..schemas.code_insight import CodeInsight
+from ..schemas.location_reference import LocationReference
+from ..schemas.quantitative_insight import QuantitativeInsight
+from ..schemas.sentiment_insight import SentimentInsight
+from ..schemas.sentiment_result import SentimentResult
+from ..schemas.table_insight import TableInsight
+from ..schemas.taxonomy.insight_type import InsightType
+from ..schemas.taxonomy.schema_profile import SchemaProfile
+from ..schemas.taxonomy.sentiment_label import SentimentLabel
+from ..schemas.taxonomy.severity_level import SeverityLevel
+from ..schemas.thematic_insight import ThematicInsight
+from ..utils.estimate_tokens import estimate_tokens
+from .stub_model_config import StubModelConfig
+
+STUB_MODEL_NAME = "stub"
+
+# Insight class names as they appear in the definitions of the output JSON schema
+_INSIGHT_CLASS_NAMES = {
+    InsightType.QUANTITATIVE_METRIC: QuantitativeInsight.__name__,
+    InsightType.KEY_THEME: ThematicInsight.__name__,
+    InsightType.SENTIMENT_ANALYSIS: SentimentInsight.__name__,
+    InsightType.TABLE_ANALYSIS: TableInsight.__name__,
+    InsightType.CODE_ANALYSIS: CodeInsight.__name__,
+}
+
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+_WORD_PATTERN = re.compile(r"[A-Za-z]{4,}")
+
+
+def _sample_latency_seconds(config: StubModelConfig, rng: random.Random) -> float:
+
+    """
+
+    Samples a response latency from the configured distribution.
+
+
+    Parameters
+    ----------
+    config : StubModelConfig
+        The stub model configuration.
+
+    rng : random.Random
+        The random generator driving the sampling.
+
+
+    Returns
+    -------
+    latency : float
+        The sampled latency in seconds.
+
+    """
+
+    mean, stddev = config.latency_mean_ms, config.latency_stddev_ms
+
+    if mean == 0 or stddev == 0 or config.latency_distribution == "constant":
+        latency_ms = mean
+    elif config.latency_distribution == "normal":
+        latency_ms = max(0.0, rng.gauss(mean, stddev))
+    else:
+        # Parameterise the lognormal so that its mean and standard deviation match the configured ones
+        sigma_squared = math.log(1 + (stddev / mean) ** 2)
+        latency_ms = rng.lognormvariate(math.log(mean) - sigma_squared / 2, math.sqrt(sigma_squared))
+
+
+    return latency_ms / 1000
+
+
+def _extract_user_prompt(messages: list[ModelMessage]) -> str:
+
+    """
+
+    Returns the first textual user prompt of the conversation, i.e., the analysed content.
+
+
+    Parameters
+    ----------
+    messages : list
+        The message history passed to the model.
+
+
+    Returns
+    -------
+    prompt : str
+        The user prompt, or an empty string if none is present.
+
+    """
+
+    for message in messages:
+        if not isinstance(message, ModelRequest):
+            continue
+        for part in message.parts:
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                return part.content
+
+
+    return ""
+
+
+def _read_output_schema(schema: dict[str, Any]) -> tuple[SchemaProfile, Optional[list[InsightType]]]:
+
+    """
+
+    Infers the schema profile and the allowed insight types from the JSON schema of the output tool.
+
+
+    Parameters
+    ----------
+    schema : dict
+        The JSON schema the agent hands to the model.
+
+
+    Returns
+    -------
+    output_schema : tuple
+        The schema profile and the allowed insight types.
+
+    """
+
+    definitions = schema.get("$defs", {})
+    schema_profile = SchemaProfile.COMPACT if any(name.startswith("Compact") for name in definitions) else SchemaProfile.FULL
+    insight_types = [
+        insight_type for insight_type, insight_class in _INSIGHT_CLASS_NAMES.items()
+        if insight_class in definitions or f"Compact{insight_class}" in definitions
+    ]
+
+
+    return schema_profile, insight_types or None
+
+
+def _compact_report(report: dict[str, Any]) -> dict[str, Any]:
+
+    """
+
+    Converts a full report payload into the compact profile.
+
+
+    Parameters
+    ----------
+    report : dict
+        The full report payload.
+
+
+    Returns
+    -------
+    compact_report : dict
+        The compact report payload.
+
+    """
+
+    insights = []
+    for insight in report["insights"]:
+        compact_insight = {
+            key: value for key, value in insight.items()
+            if key not in {"locations", "representative_snippet", "actionable_recommendation"}
+        }
+        compact_insight["location"] = insight["locations"][0]["location"]
+        if "sentiment" in insight:
+            compact_insight["sentiment"] = {key: value for key, value in insight["sentiment"].items() if key != "explanation"}
+        insights.append(compact_insight)
+
+
+    return {"executive_summary": report["executive_summary"], "insights": insights}
+
+
+def build_stub_report(content: str,
+                      insights_per_report: int = 5,
+                      schema_profile: SchemaProfile = SchemaProfile.FULL,
+                      insight_types: Optional[list[InsightType]] = None) -> dict[str, Any]:
+
+    """
+
+    Builds a schema-valid report payload derived deterministically from the content.
+
+    The same content always produces the same report, which keeps benchmarks and cache
+    experiments reproducible.
+
+
+    Parameters
+    ----------
+    content : str
+        The analysed content.
+
+    insights_per_report : int, optional
+        Number of insights to generate. The default value is `5`.
+
+    schema_profile : SchemaProfile, optional
+        The schema profile of the payload. The default value is `SchemaProfile.FULL`.
+
+    insight_types : list, optional
+        The insight types to generate. The default value is `None`.
+        If `None`, all insight types are generated.
+
+
+    Returns
+    -------
+    report : dict
+        The JSON-compatible report payload.
+
+    """
+
+    if not isinstance(content, str):
+        raise TypeError(f"content must be a string. Received: {content} with type: {type(content)}")
+    if not isinstance(insights_per_report, int) or insights_per_report < 1:
+        raise ValueError(f"insights_per_report must be a positive integer. Received: {insights_per_report} with type: {type(insights_per_report)}")
+
+
+    rng = random.Random(hashlib.sha256(content.encode("utf-8")).digest())
+
+    lines = [(number, line.strip()) for number, line in enumerate(content.splitlines(), start=1) if len(line.strip()) >= 10]
+    if not lines:
+        lines = [(1, "The document does not contain enough text to quote.")]
+
+    numbers = _NUMBER_PATTERN.findall(content)
+    keywords = [word for word, _ in Counter(word.lower() for word in _WORD_PATTERN.findall(content)).most_common(5)] or ["document"]
+
+    insight_builders = {
+        InsightType.QUANTITATIVE_METRIC: lambda common: QuantitativeInsight(
+            **common,
+            metric_name="Numeric values found",
+            value=len(numbers),
+            unit="values"
+        ),
+        InsightType.KEY_THEME: lambda common: ThematicInsight(**common, keywords=keywords, mentions=max(1, content.lower().count(keywords[0]))),
+        InsightType.SENTIMENT_ANALYSIS: lambda common: SentimentInsight(
+            **common,
+            sentiment=SentimentResult(
+                label=SentimentLabel.NEUTRAL,
+                score=0.0,
+                explanation="Synthetic sentiment produced by the offline stub model."
+            )
+        ),
+        InsightType.TABLE_ANALYSIS: lambda common: TableInsight(**common, summary="Synthetic table summary produced by the offline stub model."),
+        InsightType.CODE_ANALYSIS: lambda common: CodeInsight(**common, language="Unknown", summary="Synthetic code summary produced by the offline stub model."),
+    }
+    selected_builders = [builder for insight_type, builder in insight_builders.items() if insight_types is None or insight_type in insight_types]
+
+    insights = []
+    for index in range(insights_per_report):
+        line_number, line = rng.choice(lines)
+        common = {
+            "title": f"Stub insight #{index + 1}",
+            "description": f"Synthetic insight generated from line {line_number} of the document.",
+            "severity": rng.choice(list(SeverityLevel)),
+            "confidence_score": round(rng.random(), 2),
+            "locations": [LocationReference(location=f"Line {line_number}")],
+            "representative_snippet": line[:200],
+            "actionable_recommendation": "Replace the stub model with a real provider for meaningful results.",
+        }
+        insights.append(selected_builders[index % len(selected_builders)](common))
+
+
+    report = AnalysisReport(
+        file_name="unknown",
+        file_type_detected="unknown",
+        model_used=f"local:{STUB_MODEL_NAME}",
+        executive_summary=f"Offline stub analysis of a document with {len(content)} characters.",
+        insights=insights,
+    ).model_dump(mode="json")
+
+
+    return _compact_report(report) if schema_profile == SchemaProfile.COMPACT else report
+
+
+@cache
+def build_stub_model(config: StubModelConfig) -> FunctionModel:
+
+    """
+
+    Builds the offline stub model for the given configuration.
+
+    Models are cached per configuration so that the latency and failure sampling follow a single
+    reproducible sequence (when `seed` is set) across all analyses handled by the process.
+
+
+    Parameters
+    ----------
+    config : StubModelConfig
+        The stub model configuration.
+
+
+    Returns
+    -------
+    model : FunctionModel
+        A pydantic-ai model that can be passed to an `Agent`.
+
+    """
+
+    if not isinstance(config, StubModelConfig):
+        raise TypeError(f"config must be a StubModelConfig instance. Received: {config} with type: {type(config)}")
+
+
+    rng = random.Random(config.seed)
+
+    async def _respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(_sample_latency_seconds(config, rng))
+
+        if rng.random() < config.failure_rate:
+            raise ModelHTTPError(
+                status_code=503,
+                model_name=STUB_MODEL_NAME,
+                body={"error": "Simulated provider failure."}
+            )
+
+        content = _extract_user_prompt(messages)
+        usage = RequestUsage(
+            input_tokens=config.input_tokens if config.input_tokens is not None else estimate_tokens(content),
+            output_tokens=config.output_tokens,
+        )
+
+        # An empty insight list fails validation and makes the agent issue an output retry
+        if rng.random() < config.retry_rate:
+            args = {"insights": []}
+        else:
+            output_tool = info.output_tools[0]
+            schema_profile, insight_types = _read_output_schema(output_tool.parameters_json_schema)
+            args = build_stub_report(content, config.insights_per_report, schema_profile, insight_types)
+
+
+        return ModelResponse(
+            parts=[ToolCallPart(tool_name=info.output_tools[0].name, args=args)],
+            usage=usage,
+            model_name=STUB_MODEL_NAME,
+        )
+
+
+    return FunctionModel(_respond, model_name=STUB_MODEL_NAME)
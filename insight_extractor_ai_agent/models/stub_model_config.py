@@ -0,0 +1,37 @@
+from typing import Annotated, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StubModelConfig(BaseModel):
+
+    """
+
+    Behaviour of the offline `local:stub` model.
+
+    The stub never leaves the process. It sleeps for a sampled latency, reports synthetic
+    token usage, and returns a schema-valid `AnalysisReport` derived deterministically from the
+    analysed content. Failure and retry rates make it possible to exercise the error and
+    output-retry paths of the service under load.
+
+
+    Usage
+    -----
+    ```python
+    config = StubModelConfig(latency_mean_ms=1200, failure_rate=0.01, seed=42)
+    model = build_stub_model(config)
+    ```
+
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    latency_distribution: Literal["constant", "normal", "lognormal"] = "lognormal"
+    latency_mean_ms: Annotated[float, Field(ge=0.0)] = 1500.0
+    latency_stddev_ms: Annotated[float, Field(ge=0.0)] = 500.0
+    input_tokens: Optional[Annotated[int, Field(ge=0)]] = None
+    output_tokens: Annotated[int, Field(ge=0)] = 1200
+    failure_rate: Annotated[float, Field(ge=0.0, le=1.0)] = 0.0
+    retry_rate: Annotated[float, Field(ge=0.0, le=1.0)] = 0.0
+    insights_per_report: Annotated[int, Field(ge=1)] = 5
+    seed: Optional[int] = None
@@ -0,0 +1,92 @@
+import time
+from typing import Any, Optional
+
+from pydantic_ai.messages import ModelResponse
+from pydantic_ai.models import Model
+from pydantic_ai.models.wrapper import WrapperModel
+
+
+class TimedModel(WrapperModel):
+
+    """
+
+    Model wrapper that measures the wall-clock latency of every provider request, including failed ones.
+
+    Analyses are not streamed, so the whole response arrives at once and the moment the first
+    response arrives is used as the time to first token.
+
+
+    Usage
+    -----
+    ```python
+    model = TimedModel(build_model(model_name, api_key))
+    agent = Agent(model=model, output_type=AnalysisReport)
+    await agent.run(content)
+    print(model.request_latencies, model.first_response_at)
+    ```
+
+    """
+
+    def __init__(self, wrapped: Model) -> None:
+
+        """
+
+        Constructor for the Timed Model.
+
+
+        Parameters
+        ----------
+        wrapped : Model
+            The model whose requests are timed.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if not isinstance(wrapped, Model):
+            raise TypeError(f"wrapped must be a Model instance. Received: {wrapped} with type: {type(wrapped)}")
+
+
+        super().__init__(wrapped)
+
+        self.request_latencies: list[float] = []
+        self.first_response_at: Optional[float] = None
+
+
+    async def request(self, *args: Any, **kwargs: Any) -> ModelResponse:
+
+        """
+
+        Forwards the request to the wrapped model and records its latency.
+
+
+        Parameters
+        ----------
+        *args : Any
+            Positional arguments of `Model.request`.
+
+        **kwargs : Any
+            Keyword arguments of `Model.request`.
+
+
+        Returns
+        -------
+        response : ModelResponse
+            The response of the wrapped model.
+
+        """
+
+        start_time = time.perf_counter()
+        try:
+            response = await self.wrapped.request(*args, **kwargs)
+        finally:
+            # Failed requests are timed as well, as the provider was waited for
+            self.request_latencies.append(time.perf_counter() - start_time)
+        if self.first_response_at is None:
+            self.first_response_at = time.perf_counter()
+
+
+        return response
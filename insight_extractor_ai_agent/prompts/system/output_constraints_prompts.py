@@ -0,0 +1,10 @@
+COMPACT_OUTPUT_PROMPT = """
+**Compact Output Mode:** This run uses a reduced output schema to keep the response short.
+- Instead of a `locations` list, give each insight a single `location` string pointing to its strongest evidence.
+- Do not produce representative snippets, actionable recommendations, or sentiment explanations; they are not part of the schema.
+- Keep titles and descriptions brief.
+"""
+
+INSIGHT_TYPES_FILTER_PROMPT = """
+**Requested Insight Types:** Only produce insights of the following types: {insight_types}. Ignore findings that do not fit these types.
+"""
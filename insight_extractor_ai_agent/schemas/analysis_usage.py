@@ -0,0 +1,15 @@
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AnalysisUsage(BaseModel):
+    model_name: str
+    input_tokens: Annotated[int, Field(ge=0)] = 0
+    output_tokens: Annotated[int, Field(ge=0)] = 0
+    requests: Annotated[int, Field(ge=0)] = 0
+    retries: Annotated[int, Field(ge=0)] = 0
+    provider_latency_ms: Annotated[float, Field(ge=0.0)] = 0.0
+    time_to_first_token_ms: Optional[Annotated[float, Field(ge=0.0)]] = None
+    total_latency_ms: Annotated[float, Field(ge=0.0)] = 0.0
+    failed: bool = False
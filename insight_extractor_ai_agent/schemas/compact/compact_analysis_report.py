@@ -0,0 +1,14 @@
+from typing import Annotated, Union
+
+from pydantic import BaseModel, Field, StringConstraints
+
+from .compact_code_insight import CompactCodeInsight
+from .compact_quantitative_insight import CompactQuantitativeInsight
+from .compact_sentiment_insight import CompactSentimentInsight
+from .compact_table_insight import CompactTableInsight
+from .compact_thematic_insight import CompactThematicInsight
+
+
+class CompactAnalysisReport(BaseModel):
+    executive_summary: Annotated[str, StringConstraints(min_length=20)]
+    insights: list[Union[CompactQuantitativeInsight, CompactThematicInsight, CompactSentimentInsight, CompactTableInsight, CompactCodeInsight]] = Field(..., min_length=1)
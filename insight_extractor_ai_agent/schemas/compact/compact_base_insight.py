@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field, StringConstraints
+
+from ..taxonomy.insight_type import InsightType
+from ..taxonomy.severity_level import SeverityLevel
+
+
+class CompactBaseInsight(BaseModel):
+    title: Annotated[str, StringConstraints(min_length=5, max_length=150)]
+    description: Annotated[str, StringConstraints(min_length=10)]
+    insight_type: InsightType
+    severity: SeverityLevel
+    confidence_score: Annotated[float, Field(ge=0.0, le=1.0)]
+    location: Annotated[str, StringConstraints(min_length=3)]
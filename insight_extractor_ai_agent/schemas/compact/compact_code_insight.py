@@ -0,0 +1,13 @@
+from typing import Annotated, Literal, Optional
+
+from pydantic import StringConstraints
+
+from ..taxonomy.insight_type import InsightType
+from .compact_base_insight import CompactBaseInsight
+
+
+class CompactCodeInsight(CompactBaseInsight):
+    insight_type: Literal[InsightType.CODE_ANALYSIS] = InsightType.CODE_ANALYSIS
+    language: Annotated[str, StringConstraints(min_length=1)]
+    summary: Annotated[str, StringConstraints(min_length=20)]
+    potential_issues: Optional[list[str]] = None
@@ -0,0 +1,13 @@
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import StringConstraints
+
+from ..taxonomy.insight_type import InsightType
+from .compact_base_insight import CompactBaseInsight
+
+
+class CompactQuantitativeInsight(CompactBaseInsight):
+    insight_type: Literal[InsightType.QUANTITATIVE_METRIC] = InsightType.QUANTITATIVE_METRIC
+    metric_name: Annotated[str, StringConstraints(min_length=3)]
+    value: Union[float, int]
+    unit: Optional[str] = None
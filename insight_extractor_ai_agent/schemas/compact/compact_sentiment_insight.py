@@ -0,0 +1,10 @@
+from typing import Literal
+
+from ..taxonomy.insight_type import InsightType
+from .compact_base_insight import CompactBaseInsight
+from .compact_sentiment_result import CompactSentimentResult
+
+
+class CompactSentimentInsight(CompactBaseInsight):
+    insight_type: Literal[InsightType.SENTIMENT_ANALYSIS] = InsightType.SENTIMENT_ANALYSIS
+    sentiment: CompactSentimentResult
@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from ..taxonomy.sentiment_label import SentimentLabel
+
+
+class CompactSentimentResult(BaseModel):
+    label: SentimentLabel
+    score: Annotated[float, Field(ge=-1.0, le=1.0)]
@@ -0,0 +1,12 @@
+from typing import Annotated, Literal, Optional
+
+from pydantic import StringConstraints
+
+from ..taxonomy.insight_type import InsightType
+from .compact_base_insight import CompactBaseInsight
+
+
+class CompactTableInsight(CompactBaseInsight):
+    insight_type: Literal[InsightType.TABLE_ANALYSIS] = InsightType.TABLE_ANALYSIS
+    summary: Annotated[str, StringConstraints(min_length=20)]
+    table_headers: Optional[list[str]] = None
@@ -0,0 +1,12 @@
+from typing import Literal
+
+from pydantic import Field, PositiveInt
+
+from ..taxonomy.insight_type import InsightType
+from .compact_base_insight import CompactBaseInsight
+
+
+class CompactThematicInsight(CompactBaseInsight):
+    insight_type: Literal[InsightType.KEY_THEME] = InsightType.KEY_THEME
+    keywords: list[str] = Field(..., min_length=1)
+    mentions: PositiveInt
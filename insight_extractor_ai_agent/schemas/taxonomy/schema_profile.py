@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SchemaProfile(str, Enum):
+    FULL = "full"
+    COMPACT = "compact"
@@ -1,6 +1,9 @@
 import importlib
+from logging import getLogger
 from typing import Optional, Type
 
+logger = getLogger(__name__)
+
 
 def import_class(module_path: str, class_name: str) -> Optional[Type]:
 
@@ -33,9 +36,9 @@ def import_class(module_path: str, class_name: str) -> Optional[Type]:
     cls = getattr(importlib.import_module(module_path), class_name, None)
 
     if cls:
-        print(f"Successfully imported class: {cls}")
+        logger.debug("Successfully imported class: %s", cls)
     else:
-        print(f"Error: Class `{class_name}` not found in `{module_path}`.")
+        logger.error("Class `%s` not found in `%s`.", class_name, module_path)
 
     
     return cls
\ No newline at end of file
@@ -0,0 +1,31 @@
+import math
+
+# Average number of characters per token for English text with common LLM tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+
+    """
+
+    Estimates the number of tokens of a text without running a tokenizer.
+
+    
+    Parameters
+    ----------
+    text : str
+        The text to estimate.
+
+        
+    Returns
+    -------
+    tokens : int
+        The estimated token count.
+
+    """
+
+    if not isinstance(text, str):
+        raise TypeError(f"text must be a string. Received: {text} with type: {type(text)}")
+
+
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
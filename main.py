@@ -2,6 +2,7 @@ from app.core.config.setup import setup
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.logging.logging_config import setup_logging
+from app.core.tracing.tracing_config import setup_tracing
 from app.core.config.settings import settings
 from app.core.exception_handlers import (
     validation_exception_handler, 
@@ -16,27 +17,25 @@ from slowapi.middleware import SlowAPIASGIMiddleware
 from app.core.middlewares import (
     AccessLogMiddleware, 
     RequestIDMiddleware, 
-    StrictTransportSecurityMiddleware,
-    XContentTypeOptionsMiddleware, 
-    ContentSecurityPolicyMiddleware,
-    PermissionsPolicyMiddleware,
-    CrossOriginOpenerPolicyMiddleware,
-    CrossOriginResourcePolicyMiddleware,
-    CrossOriginEmbedderPolicyMiddleware,
-    ReferrerPolicyMiddleware,
-    XDownloadOptionsMiddleware,
-    XFrameOptionsMiddleware,
-    XXSSProtectionMiddleware,
-    OriginAgentClusterMiddleware,
-    NoCacheMiddleware,
-    XDNSPrefetchControlMiddleware
+    SecurityHeadersMiddleware,
+    StaticFastLaneMiddleware,
+    CompressionMiddleware,
+    MetricsMiddleware
 )
 from app.docs.logic.custom_openapi_docs import generate_custom_openapi_docs
 from app.api.v1.routers.v1_router import v1_router
+from app.api.health.routers.health_router import health_router
+from app.api.metrics.routers.metrics_router import metrics_router
+from app.api.admin.routers.admin_router import admin_router
 from fastapi import Request
 from fastapi.responses import JSONResponse
 import os
 from fastapi.staticfiles import StaticFiles
+from starlette.routing import Mount
+from app.schemas.model_list import ModelList
+from app.utils.available_models_list import fetch_model_list
+from app.utils.precomputed_json import PrecomputedJSON
+from app.utils.precompressed_static_files import PrecompressedStaticFiles
 
 
 # Startup Events
@@ -46,16 +45,58 @@ async def lifespan(app: FastAPI):
     # Configure Logging
     setup_logging(handler_log_level=settings.HANDLER_LOG_LEVEL, 
                   root_log_level=settings.ROOT_LOG_LEVEL, 
-                  uvicorn_log_level=settings.UVICORN_LOG_LEVEL)
+                  uvicorn_log_level=settings.UVICORN_LOG_LEVEL, 
+                  log_format=settings.LOG_FORMAT)
+
+
+    # Tracing Setup
+    tracer_provider = setup_tracing(exporter=settings.TRACING_EXPORTER, 
+                                    file_path=settings.TRACING_FILE_PATH, 
+                                    sample_ratio=settings.TRACING_SAMPLE_RATIO)
 
 
     # SlowApi Setup
     app.state.limiter = setup.limiter
+    if settings.USE_REDIS:
+        setup.rate_limit_storage.start()
+
+
+    # Model List Setup
+    ## Serialised once, as the known models only change with the installed pydantic-ai version
+    app.state.model_list_payload = PrecomputedJSON.from_model(
+        ModelList(providers=fetch_model_list(
+            include_stub_model=settings.ENABLE_STUB_MODEL,
+            auto_model_providers=setup.model_registry.providers
+        ))
+    )
+
+
+    # Health Metrics Setup
+    setup.event_loop_monitor.start()
+
+
+    # Metrics Setup
+    setup.metrics_exporter.start()
+
+
+    # Blocking Call Detector Setup
+    if setup.blocking_call_detector is not None:
+        setup.blocking_call_detector.start()
 
 
     yield
 
 
+    if settings.USE_REDIS:
+        await setup.rate_limit_storage.stop()
+    if setup.blocking_call_detector is not None:
+        await setup.blocking_call_detector.stop()
+    await setup.metrics_exporter.stop()
+    await setup.event_loop_monitor.stop()
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
@@ -78,9 +119,30 @@ app.add_exception_handler(Exception, general_exception_handler)
 
 
 # Configure Middlewares
+## Response Compression
+### Innermost, so that the other middlewares only add headers to the compressed response
+if settings.RESPONSE_COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.RESPONSE_COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+    )
+
+## Metrics
+### Times the requests up to the end of the (compressed) response
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=setup.metrics)
+
 ## Custom Access Logging
 ### Must come before the Request ID Middleware
-app.add_middleware(AccessLogMiddleware)
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_threshold_ms=settings.ACCESS_LOG_SLOW_THRESHOLD_MS,
+    target_rps=settings.ACCESS_LOG_TARGET_RPS,
+    summary_interval=settings.ACCESS_LOG_SUMMARY_INTERVAL
+)
 
 ## Request ID
 app.add_middleware(RequestIDMiddleware)
@@ -98,15 +160,13 @@ app.add_middleware(
 app.add_middleware(SlowAPIASGIMiddleware)
 
 ## Other Security Middlewares
-app.add_middleware(StrictTransportSecurityMiddleware)
-app.add_middleware(XContentTypeOptionsMiddleware)
+### All security headers are built once and added in a single pass
 ### For demonstration purposes, security settings have been relaxed to make publishing and viewing the auto-generated documentation easier.
 ### In a real enterprise project, you should enforce stricter policies—avoid practices like "unsafe-inline" and instead use safer alternatives such as nonce.
 ### Additionally, the frontend here uses a development build of Tailwind. 
 ### In an enterprise environment, this should be properly optimized and prepared for production.
-app.add_middleware(
-    ContentSecurityPolicyMiddleware,
-    policy=(
+security_headers_config = dict(
+    content_security_policy=(
         "default-src 'self'; "
         
         # Scripts
@@ -137,19 +197,16 @@ app.add_middleware(
         # Misc
         "object-src 'none'; "
         "frame-ancestors 'none';"
-    )
+    ),
+    cross_origin_opener_policy=None,
+    cross_origin_embedder_policy=None,
+    x_xss_protection="1; mode=block",
+)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    **security_headers_config,
+    no_cache_exempt_paths=[f"{settings.API_V1_PREFIX}/get-available-models"]
 )
-app.add_middleware(PermissionsPolicyMiddleware)
-# app.add_middleware(CrossOriginOpenerPolicyMiddleware)
-# app.add_middleware(CrossOriginEmbedderPolicyMiddleware)
-app.add_middleware(CrossOriginResourcePolicyMiddleware)
-app.add_middleware(ReferrerPolicyMiddleware)
-app.add_middleware(XFrameOptionsMiddleware)
-app.add_middleware(XXSSProtectionMiddleware, policy="1; mode=block")
-app.add_middleware(XDownloadOptionsMiddleware)
-app.add_middleware(OriginAgentClusterMiddleware)
-app.add_middleware(NoCacheMiddleware)
-app.add_middleware(XDNSPrefetchControlMiddleware)
 
 
 # Configure docs
@@ -161,14 +218,57 @@ app.openapi = generate_custom_openapi_docs(app)
 app.include_router(v1_router, prefix=settings.API_V1_PREFIX)
 
 
+## Health Checks
+### Registered before the static mounts, which match every other path
+app.include_router(health_router, prefix="/health")
+
+@app.get("/health")
+@setup.limiter.exempt
+async def health(request: Request):
+    return JSONResponse(status_code=200, content={"message": "Insight Extractor AI Agent is UP and RUNNING!"})
+
+
+## Metrics
+### Prometheus scrape endpoint, also registered before the static mounts
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
+
+## Admin
+### Profiling endpoints, disabled unless ADMIN_TOKEN is set
+app.include_router(admin_router, prefix="/admin")
+
+
+## Static files are compressed once here, and served in the encoding each client accepts
+static_files_class = PrecompressedStaticFiles if settings.STATIC_PRECOMPRESSION else StaticFiles
+
 static_dir = os.path.join(os.path.dirname(__file__), "app/static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+static_files = static_files_class(directory=static_dir)
+app.mount("/static", static_files, name="static")
 
 templates_dir = os.path.join(os.path.dirname(__file__), "app/templates")
-app.mount("/", StaticFiles(directory=templates_dir, html=True), name="templates")
+template_files = static_files_class(directory=templates_dir, html=True)
+app.mount("/", template_files, name="templates")
 
 
-## Health Check
-@app.get("/health")
-async def health(request: Request):
-    return JSONResponse(status_code=200, content={"message": "Insight Extractor AI Agent is UP and RUNNING!"})
\ No newline at end of file
+# Static Fast Lane
+## Must be added last so that static requests skip rate limiting, access logging, and request IDs
+## Security headers are still set, as the HTML page relies on its Content-Security-Policy
+if settings.STATIC_FAST_LANE:
+    ### Assets are cached for a long time, and the page is revalidated with its ETag on every load
+    app.add_middleware(
+        StaticFastLaneMiddleware,
+        static_app=SecurityHeadersMiddleware(Mount("/static", app=static_files), **security_headers_config, no_cache=False),
+        path_prefixes=["/static/"],
+        cache_control=f"public, max-age={settings.STATIC_CACHE_MAX_AGE}"
+    )
+    app.add_middleware(
+        StaticFastLaneMiddleware,
+        static_app=SecurityHeadersMiddleware(template_files, **security_headers_config, no_cache=False),
+        paths=["/"] + [
+            "/" + os.path.relpath(os.path.join(directory, file_name), templates_dir).replace(os.sep, "/")
+            for directory, _, file_names in os.walk(templates_dir)
+            for file_name in file_names
+        ],
+        cache_control="no-cache"
+    )
@@ -0,0 +1,59 @@
+"""
+
+Production entry point: preloads the application and serves it with `SERVER_WORKERS` forked workers.
+
+
+Usage
+-----
+```bash
+python server.py --workers 4
+```
+
+"""
+
+import argparse
+import glob
+from logging import getLogger
+import os
+
+from app.core.config.settings import settings
+from app.core.logging.logging_config import setup_logging
+from app.core.server.prefork_server import PreforkServer
+
+logger = getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="The interface to bind.")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="The port to bind.")
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="The number of worker processes.")
+    args = parser.parse_args()
+
+    setup_logging(handler_log_level=settings.HANDLER_LOG_LEVEL, 
+                  root_log_level=settings.ROOT_LOG_LEVEL, 
+                  uvicorn_log_level=settings.UVICORN_LOG_LEVEL, 
+                  log_format=settings.LOG_FORMAT)
+
+    # Preload the application, and the heavy libraries it imports, before the workers are forked
+    from main import app
+
+    # Each worker has its own memory, so only the Redis storage enforces the rate limits across workers
+    if args.workers > 1 and not settings.USE_REDIS:
+        logger.warning("Rate limits are counted per worker, so clients get up to %d times the configured limits. Set USE_REDIS and REDIS_URL to share them.", args.workers)
+    if args.workers > 1 and settings.METRICS_ENABLED and settings.METRICS_MULTIPROCESS_DIR is None:
+        logger.warning("Each scrape of /metrics only reports the worker that serves it. Set METRICS_MULTIPROCESS_DIR to report all the workers.")
+
+    # The metrics of a previous run would be added to those of this one
+    if settings.METRICS_MULTIPROCESS_DIR is not None:
+        for path in glob.glob(os.path.join(settings.METRICS_MULTIPROCESS_DIR, "*.json")):
+            os.remove(path)
+
+    PreforkServer(
+        app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        graceful_shutdown_timeout=settings.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+        log_config=None,
+    ).run()